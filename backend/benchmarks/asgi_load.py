@@ -0,0 +1,217 @@
+"""
+Нагрузочный тест горячих GET-эндпоинтов и расчета сырья: WSGI (gunicorn,
+gthread) против ASGI (uvicorn) с обычными и асинхронными представлениями.
+
+    python backend/benchmarks/asgi_load.py [--seconds 10] [--concurrency 64]
+
+Нужны gunicorn и uvicorn (pip install gunicorn uvicorn); отсутствующий
+сервер пропускается. Каждый сервер запускается одним процессом на копии
+базы из DJANGO_DB_PATH, кэш ответов выключен, чтобы каждый запрос шел в
+базу. Клиент держит --concurrency соединений keep-alive и считает
+пропускную способность и задержки.
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Имя -> (модуль сервера, аргументы, дополнительные переменные окружения).
+SERVERS = {
+    "wsgi": (
+        "gunicorn",
+        ["config.wsgi:application", "-k", "gthread", "-w", "1", "--threads", "{threads}",
+         "--bind", "127.0.0.1:{port}"],
+        {},
+    ),
+    "asgi, синхронные представления": (
+        "uvicorn",
+        ["config.asgi:application", "--port", "{port}", "--no-access-log"],
+        {"DJANGO_ASYNC_VIEWS": "false"},
+    ),
+    "asgi, асинхронные представления": (
+        "uvicorn",
+        ["config.asgi:application", "--port", "{port}", "--no-access-log"],
+        {"DJANGO_ASYNC_VIEWS": "true"},
+    ),
+}
+
+
+def build_requests(database: Path) -> list[tuple[str, str, bytes | None]]:
+    """Смесь запросов: карточки, маршруты, справочники, фильтр, расчет сырья."""
+
+    with sqlite3.connect(database) as conn:
+        product_ids = [row[0] for row in conn.execute("SELECT id FROM product")]
+        type_ids = [row[0] for row in conn.execute("SELECT id FROM product_type")]
+        material_ids = [row[0] for row in conn.execute("SELECT id FROM material_type")]
+    conn.close()
+
+    requests = []
+    for _ in range(200):
+        product_id = random.choice(product_ids)
+        line = {
+            "product_type_id": random.choice(type_ids),
+            "material_type_id": random.choice(material_ids),
+            "product_quantity": random.randint(1, 100),
+            "parameter_one": round(random.uniform(0.5, 3), 2),
+            "parameter_two": round(random.uniform(0.5, 3), 2),
+        }
+        price = random.randint(1, 60) * 1000
+        requests += [
+            ("GET", f"/api/products/{product_id}", None),
+            ("GET", f"/api/products/{product_id}/workshops", None),
+            ("GET", "/api/product-types", None),
+            ("GET", "/api/material-types", None),
+            ("GET", "/api/workshops", None),
+            ("GET", f"/api/products?min_price={price}&max_price={price + 500}", None),
+            ("POST", "/api/raw-material/calculate", json.dumps(line).encode()),
+        ]
+    random.shuffle(requests)
+    return requests
+
+
+async def http_request(reader, writer, method: str, path: str, body: bytes | None) -> int:
+    head = f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nAccept: application/json\r\n"
+    if body is not None:
+        head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+    writer.write(head.encode() + b"\r\n" + (body or b""))
+    await writer.drain()
+
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("сервер закрыл соединение")
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    await reader.readexactly(int(headers.get("content-length", 0)))
+    if headers.get("connection", "").lower() == "close":
+        raise ConnectionResetError
+    return int(status_line.split()[1])
+
+
+async def client(port: int, requests, deadline: float, latencies: list, errors: list) -> None:
+    connection = None
+    while time.perf_counter() < deadline:
+        method, path, body = random.choice(requests)
+        started = time.perf_counter()
+        try:
+            if connection is None:
+                connection = await asyncio.open_connection("127.0.0.1", port)
+            status = await http_request(*connection, method, path, body)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            if connection is not None:
+                connection[1].close()
+            connection = None
+            continue
+        except OSError:
+            errors.append(None)
+            connection = None
+            await asyncio.sleep(0.01)
+            continue
+        latencies.append(time.perf_counter() - started)
+        if status >= 400:
+            errors.append(status)
+    if connection is not None:
+        connection[1].close()
+
+
+async def run_load(port: int, requests, seconds: float, concurrency: int):
+    latencies: list[float] = []
+    errors: list = []
+    deadline = time.perf_counter() + seconds
+    await asyncio.gather(
+        *(client(port, requests, deadline, latencies, errors) for _ in range(concurrency))
+    )
+    return latencies, errors
+
+
+def wait_until_ready(port: int, timeout: float = 30) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/api/health", timeout=1)
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("сервер не запустился")
+
+
+def percentile(values: list[float], share: float) -> float:
+    return statistics.quantiles(values, n=100)[int(share * 100) - 1] if len(values) > 1 else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=8, help="потоки gunicorn gthread")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    from django.conf import settings
+
+    source = Path(settings.DATABASES["default"]["NAME"])
+    with tempfile.TemporaryDirectory(dir=source.parent) as tmp:
+        database = Path(tmp) / "load.db"
+        with sqlite3.connect(source) as src, sqlite3.connect(database) as dst:
+            src.backup(dst)
+        src.close()
+        dst.close()
+        requests = build_requests(database)
+
+        for name, (module, server_args, extra_env) in SERVERS.items():
+            if importlib.util.find_spec(module) is None:
+                print(f"{name}: пропущен, не установлен {module}")
+                continue
+            command = [sys.executable, "-m", module] + [
+                part.format(port=args.port, threads=args.threads) for part in server_args
+            ]
+            env = dict(
+                os.environ,
+                DJANGO_DB_PATH=str(database),
+                DJANGO_DEBUG="false",
+                DJANGO_RESPONSE_CACHE_TIMEOUT="0",
+                **extra_env,
+            )
+            server = subprocess.Popen(
+                command,
+                cwd=BACKEND_DIR,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                wait_until_ready(args.port)
+                # Прогрев: соединения, кэш справочников, импорт модулей.
+                asyncio.run(run_load(args.port, requests, 1, 4))
+                latencies, errors = asyncio.run(
+                    run_load(args.port, requests, args.seconds, args.concurrency)
+                )
+            finally:
+                server.terminate()
+                server.wait()
+            print(
+                f"{name}: {len(latencies) / args.seconds:.0f} запр/с, "
+                f"p50 {percentile(latencies, 0.5) * 1000:.0f} мс, "
+                f"p99 {percentile(latencies, 0.99) * 1000:.0f} мс, "
+                f"ошибок {len(errors)}"
+            )
+
+
+if __name__ == "__main__":
+    main()
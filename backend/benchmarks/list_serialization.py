@@ -0,0 +1,82 @@
+"""
+Сравнение обычной сериализации списков (ModelSerializer + JSONRenderer)
+с быстрым путем config.fast_list (values_list + RowFormat + render_json).
+
+    python backend/benchmarks/list_serialization.py [--repeat 5]
+
+Скрипт работает с базой из DJANGO_DB_PATH (как и сервер) и проверяет,
+что оба пути дают одинаковые байты.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BACKEND_DIR))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from company_warehouse.serializers import MaterialSerializer  # noqa: E402
+from company_warehouse.views import MaterialListCreateView  # noqa: E402
+from config.fast_list import RowFormat, render_json  # noqa: E402
+from products.serializers import ProductListSerializer  # noqa: E402
+from products.views import ProductListCreateView  # noqa: E402
+
+LISTS = {
+    "products": (ProductListCreateView, ProductListSerializer),
+    "materials": (MaterialListCreateView, MaterialSerializer),
+}
+
+
+def serializer_path(view_class, serializer_class) -> bytes:
+    data = serializer_class(view_class.queryset.all(), many=True).data
+    return JSONRenderer().render(data)
+
+
+def fast_path(view_class, serializer_class) -> bytes:
+    row_format = RowFormat(serializer_class, view_class.fast_list_overrides)
+    rows = view_class.queryset.all().values_list(*row_format.lookups)
+    return render_json([row_format.to_dict(row) for row in rows])
+
+
+def best_time(func, repeat: int) -> tuple[float, bytes]:
+    best = float("inf")
+    result = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, (view_class, serializer_class) in LISTS.items():
+        slow_seconds, slow = best_time(
+            lambda: serializer_path(view_class, serializer_class), args.repeat
+        )
+        fast_seconds, fast = best_time(
+            lambda: fast_path(view_class, serializer_class), args.repeat
+        )
+        rows = view_class.queryset.count()
+        print(
+            f"{name}: {rows} строк, сериализатор {slow_seconds * 1000:.1f} мс, "
+            f"быстрый путь {fast_seconds * 1000:.1f} мс "
+            f"(x{slow_seconds / fast_seconds:.1f}), "
+            f"ответы {'совпадают' if slow == fast else 'РАЗЛИЧАЮТСЯ'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
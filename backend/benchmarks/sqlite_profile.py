@@ -0,0 +1,161 @@
+"""
+Пропускная способность чтения и записи через API с профилями SQLite
+"default" и "production" (DJANGO_DB_PROFILE).
+
+    python backend/benchmarks/sqlite_profile.py [--seconds 10] [--readers 4] [--writers 2]
+
+Для каждого профиля база из DJANGO_DB_PATH копируется во временную папку
+рядом с ней (на тот же диск), и на копии одновременно работают
+процессы-читатели (GET /api/products/<id>) и процессы-писатели
+(PUT /api/products/<id>), как воркеры сервера. Кэш ответов выключен,
+чтобы каждый запрос шел в базу.
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+PROFILES = ("default", "production")
+
+
+def run_worker(role: str, seconds: float, start_at: float) -> dict:
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+    import logging
+
+    import django
+
+    django.setup()
+    # Ошибки считаются ниже; трассировки django.request только мешают выводу.
+    logging.getLogger("django.request").setLevel(logging.CRITICAL)
+
+    from django.test import Client
+
+    from products.models import Product
+
+    products = list(
+        Product.objects.values(
+            "id",
+            "article",
+            "name",
+            "min_partner_price",
+            "product_type_id",
+            "material_type_id",
+        )
+    )
+    client = Client()
+    ops = errors = 0
+    time.sleep(max(0.0, start_at - time.time()))
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        product = random.choice(products)
+        try:
+            if role == "read":
+                response = client.get(f"/api/products/{product['id']}")
+            else:
+                price = f"{random.uniform(1000, 50000):.2f}"
+                payload = dict(product, min_partner_price=price)
+                response = client.put(
+                    f"/api/products/{product['id']}",
+                    data=json.dumps(payload),
+                    content_type="application/json",
+                )
+        except Exception:  # "database is locked" и другие ошибки БД
+            errors += 1
+            continue
+        if response.status_code == 200:
+            ops += 1
+        else:
+            errors += 1
+    return {"role": role, "ops": ops, "errors": errors}
+
+
+def copy_database(source: Path, target: Path) -> None:
+    # Копия через backup API согласована, даже если исходная база в WAL;
+    # режим журнала сбрасывается, чтобы профиль "default" начинал с чистого.
+    with sqlite3.connect(source) as src, sqlite3.connect(target) as dst:
+        src.backup(dst)
+        dst.execute("PRAGMA journal_mode = DELETE")
+    src.close()
+    dst.close()
+
+
+def run_profile(profile: str, database: Path, args) -> dict:
+    env = dict(
+        os.environ,
+        DJANGO_DB_PROFILE=profile,
+        DJANGO_DB_PATH=str(database),
+        DJANGO_RESPONSE_CACHE_TIMEOUT="0",
+        DJANGO_DEBUG="false",
+    )
+    # Запас времени на django.setup() в каждом процессе.
+    start_at = time.time() + 3
+    roles = ["read"] * args.readers + ["write"] * args.writers
+    workers = [
+        subprocess.Popen(
+            [
+                sys.executable,
+                __file__,
+                "--worker",
+                role,
+                "--seconds",
+                str(args.seconds),
+                "--start-at",
+                str(start_at),
+            ],
+            env=env,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        for role in roles
+    ]
+    totals = {"read": 0, "write": 0, "errors": 0}
+    for worker in workers:
+        output, _ = worker.communicate()
+        result = json.loads(output.strip().splitlines()[-1])
+        totals[result["role"]] += result["ops"]
+        totals["errors"] += result["errors"]
+    return totals
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--worker", choices=("read", "write"), help=argparse.SUPPRESS)
+    parser.add_argument("--start-at", type=float, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.seconds, args.start_at)))
+        return
+
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    from django.conf import settings
+
+    source = Path(settings.DATABASES["default"]["NAME"])
+    with tempfile.TemporaryDirectory(dir=source.parent) as tmp:
+        for profile in PROFILES:
+            database = Path(tmp) / f"{profile}.db"
+            copy_database(source, database)
+            totals = run_profile(profile, database, args)
+            print(
+                f"{profile}: чтение {totals['read'] / args.seconds:.0f} запр/с, "
+                f"запись {totals['write'] / args.seconds:.0f} запр/с, "
+                f"ошибок {totals['errors']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class ChangefeedConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "changefeed"
+    verbose_name = "Журнал изменений"
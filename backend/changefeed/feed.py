@@ -0,0 +1,184 @@
+"""
+Чтение и сжатие журнала change_log (миграция changefeed.0001_initial).
+
+Событие — {"seq", "table", "id", "op"}, где op — "upsert" (строку нужно
+перечитать) или "delete". Страница читается диапазоном по первичному ключу
+(seq > since ORDER BY seq LIMIT n), поэтому стоимость опроса зависит от
+размера страницы, а не журнала. Одна строка может прийти несколькими
+событиями, клиенту достаточно применить их по порядку; повторы убирает
+compact_change_log.
+"""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from config.async_db import read_pool
+from config.db_routing import read_connection, read_only_database
+from config.fast_list import render_json
+
+CHANGES_SQL = """
+    SELECT seq, table_name, row_id, op
+    FROM change_log
+    WHERE seq > %s
+    ORDER BY seq
+    LIMIT %s
+"""
+
+# Через сколько миллисекунд EventSource переподключается после закрытия
+# потока: обычного и при превышении CHANGEFEED_MAX_STREAMS.
+RETRY_MS = 3000
+BUSY_RETRY_MS = 15000
+
+# Открытые потоки SSE этого процесса (все они в одном цикле событий ASGI).
+_active_streams = 0
+
+
+class Compaction(NamedTuple):
+    superseded: int  # события, после которых по той же строке были другие
+    expired: int  # события старше срока хранения или сверх лимита строк
+    truncated_through: int
+
+
+def latest_seq() -> int:
+    """
+    Последний выданный seq. Берется из sqlite_sequence (AUTOINCREMENT): в
+    отличие от MAX(seq) он не уменьшается, даже если сжатие удалило все события.
+    """
+
+    with read_connection().cursor() as cursor:
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'")
+        row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def truncated_through() -> int:
+    """Последний seq, удаленный по сроку хранения (0 — журнал не сокращался)."""
+
+    with read_connection().cursor() as cursor:
+        cursor.execute("SELECT value FROM change_log_state WHERE name = 'truncated_through'")
+        row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def read_changes(since: int, limit: int) -> tuple[list[dict], bool]:
+    """События после since (не больше limit) и признак, что есть еще."""
+
+    with read_connection().cursor() as cursor:
+        cursor.execute(CHANGES_SQL, [since, limit + 1])
+        rows = cursor.fetchall()
+    events = [
+        {"seq": seq, "table": table, "id": row_id, "op": op}
+        for seq, table, row_id, op in rows[:limit]
+    ]
+    return events, len(rows) > limit
+
+
+def is_stale(since: int, latest: int) -> bool:
+    """Курсор нельзя продолжить: журнал до него сокращен или база сменилась."""
+
+    return since < truncated_through() or since > latest
+
+
+def poll_changes(since: int, limit: int) -> tuple[int, list[dict] | None, bool]:
+    """
+    Один опрос журнала для потока: (последний seq, события после since или
+    None, если курсор устарел, есть ли еще). Пока новых событий нет, это
+    одно чтение sqlite_sequence и состояния журнала.
+    """
+
+    with read_only_database():
+        latest = latest_seq()
+        if is_stale(since, latest):
+            return latest, None, False
+        if latest <= since:
+            return latest, [], False
+        events, has_more = read_changes(since, limit)
+        return latest, events, has_more
+
+
+async def aiter_event_stream(since: int) -> AsyncIterator[str]:
+    """
+    Server-Sent Events: события журнала после since по мере появления.
+
+    Журнал опрашивается раз в CHANGEFEED_POLL_SECONDS в потоке
+    config.async_db.read_pool, а ожидание — asyncio.sleep, так что открытый
+    поток не занимает поток сервера. Через CHANGEFEED_STREAM_SECONDS поток
+    закрывается, и EventSource переподключается с Last-Event-ID. Пустое
+    событие с id на каждом опросе держит курсор клиента актуальным и заодно
+    проверяет, что соединение живо. Сверх CHANGEFEED_MAX_STREAMS потоков на
+    процесс клиент получает событие busy и переподключается позже.
+    """
+
+    global _active_streams
+    if _active_streams >= settings.CHANGEFEED_MAX_STREAMS:
+        yield f"retry: {BUSY_RETRY_MS}\nevent: busy\ndata: {{}}\n\n"
+        return
+    _active_streams += 1
+    try:
+        deadline = time.monotonic() + settings.CHANGEFEED_STREAM_SECONDS
+        yield f"retry: {RETRY_MS}\nid: {since}\n\n"
+        while True:
+            latest, events, has_more = await read_pool.run(
+                poll_changes, since, settings.CHANGEFEED_PAGE_SIZE
+            )
+            if events is None:
+                payload = render_json({"cursor": latest}).decode()
+                yield f"event: reset\ndata: {payload}\n\n"
+                return
+            for event in events:
+                yield f"id: {event['seq']}\ndata: {render_json(event).decode()}\n\n"
+                since = event["seq"]
+            if has_more:
+                continue
+            if time.monotonic() >= deadline:
+                return
+            await asyncio.sleep(settings.CHANGEFEED_POLL_SECONDS)
+            yield f"id: {since}\n\n"
+    finally:
+        # В том числе при отключении клиента (отмена задачи ответа).
+        _active_streams -= 1
+
+
+def compact_change_log(retention_seconds: int, max_rows: int) -> Compaction:
+    """
+    Сжать журнал: удалить события, перекрытые более поздними по той же
+    строке (клиент все равно получит последнее), затем события старше
+    retention_seconds и сверх max_rows самых новых. Граница удаления по
+    сроку запоминается в change_log_state: клиенты с более старым курсором
+    получают 410 и синхронизируются заново.
+    """
+
+    cutoff = int(time.time()) - retention_seconds
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM change_log WHERE seq NOT IN "
+            "(SELECT MAX(seq) FROM change_log GROUP BY table_name, row_id)"
+        )
+        superseded = cursor.rowcount
+
+        cursor.execute(
+            "SELECT COALESCE(MAX(seq), 0) FROM change_log WHERE changed_at < %s", [cutoff]
+        )
+        through = cursor.fetchone()[0]
+        cursor.execute(
+            "SELECT seq FROM change_log ORDER BY seq DESC LIMIT 1 OFFSET %s", [max_rows]
+        )
+        row = cursor.fetchone()
+        through = max(through, row[0] if row else 0)
+
+        expired = 0
+        if through:
+            cursor.execute("DELETE FROM change_log WHERE seq <= %s", [through])
+            expired = cursor.rowcount
+            cursor.execute(
+                "UPDATE change_log_state SET value = MAX(value, %s) "
+                "WHERE name = 'truncated_through'",
+                [through],
+            )
+        cursor.execute("SELECT value FROM change_log_state WHERE name = 'truncated_through'")
+        return Compaction(superseded, expired, cursor.fetchone()[0])
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from changefeed.feed import compact_change_log
+
+
+class Command(BaseCommand):
+    help = "Сжать журнал изменений (change_log): перекрытые события и события сверх срока хранения."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention-days",
+            type=float,
+            default=settings.CHANGEFEED_RETENTION_DAYS,
+            help="сколько дней хранить события (по умолчанию CHANGEFEED_RETENTION_DAYS)",
+        )
+        parser.add_argument(
+            "--max-rows",
+            type=int,
+            default=settings.CHANGEFEED_MAX_ROWS,
+            help="сколько последних событий хранить не больше (по умолчанию CHANGEFEED_MAX_ROWS)",
+        )
+
+    def handle(self, *args, **options):
+        result = compact_change_log(
+            int(options["retention_days"] * 86400), options["max_rows"]
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Удалено перекрытых событий: {result.superseded}, "
+                f"устаревших: {result.expired}. Журнал начинается после seq "
+                f"{result.truncated_through}."
+            )
+        )
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:40
+
+from django.db import migrations
+
+# Журнал изменений для /api/changes: триггеры пишут (таблица, id, операция),
+# seq служит курсором клиента. Для product_workshop row_id — id продукции,
+# маршрут которой изменился, и операция всегда upsert.
+# (таблица, колонка с id строки для журнала)
+SOURCES = (
+    ("product", "id"),
+    ("product_workshop", "product_id"),
+    ("workshop", "id"),
+    ("material", "id"),
+    ("supplier", "id"),
+    ("partner", "id"),
+    ("employee", "id"),
+)
+
+CHANGEFEED_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS change_log (
+        seq             INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name      TEXT NOT NULL,
+        row_id          INTEGER NOT NULL,
+        op              TEXT NOT NULL,
+        changed_at      INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+    )
+    """,
+    # truncated_through — последний seq, удаленный по сроку хранения: клиенту
+    # с курсором меньше этого нужна полная синхронизация.
+    """
+    CREATE TABLE IF NOT EXISTS change_log_state (
+        name            TEXT PRIMARY KEY,
+        value           INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "INSERT OR IGNORE INTO change_log_state (name, value) VALUES ('truncated_through', 0)",
+]
+DROP_CHANGEFEED_SQL = []
+for _table, _key in SOURCES:
+    _delete_op = "upsert" if _table == "product_workshop" else "delete"
+    CHANGEFEED_SQL += [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS change_log_{_table}_insert AFTER INSERT ON {_table}
+        BEGIN
+            INSERT INTO change_log (table_name, row_id, op)
+            VALUES ('{_table}', new.{_key}, 'upsert');
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS change_log_{_table}_update AFTER UPDATE ON {_table}
+        BEGIN
+            INSERT INTO change_log (table_name, row_id, op)
+            SELECT '{_table}', old.{_key}, '{_delete_op}' WHERE old.{_key} != new.{_key};
+            INSERT INTO change_log (table_name, row_id, op)
+            VALUES ('{_table}', new.{_key}, 'upsert');
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS change_log_{_table}_delete AFTER DELETE ON {_table}
+        BEGIN
+            INSERT INTO change_log (table_name, row_id, op)
+            VALUES ('{_table}', old.{_key}, '{_delete_op}');
+        END
+        """,
+    ]
+    DROP_CHANGEFEED_SQL += [
+        f"DROP TRIGGER IF EXISTS change_log_{_table}_{event}"
+        for event in ("insert", "update", "delete")
+    ]
+DROP_CHANGEFEED_SQL += [
+    "DROP TABLE IF EXISTS change_log_state",
+    "DROP TABLE IF EXISTS change_log",
+]
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0001_initial'),
+        ('company_partners', '0001_initial'),
+        ('company_warehouse', '0001_initial'),
+        ('company_staff', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(CHANGEFEED_SQL, DROP_CHANGEFEED_SQL),
+    ]
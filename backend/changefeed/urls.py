@@ -0,0 +1,8 @@
+from django.urls import path
+
+from . import views
+
+urlpatterns = [
+    path("api/changes", views.changes_view, name="changes"),
+    path("api/changes/stream", views.change_stream, name="change-stream"),
+]
@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from config.async_db import read_pool
+
+from .feed import aiter_event_stream, is_stale, latest_seq, read_changes
+
+MAX_LIMIT = 10000
+STALE_CURSOR = "Журнал изменений до этого курсора удален. Загрузите данные заново."
+ASGI_ONLY = "Поток изменений доступен только под ASGI. Используйте GET /api/changes?since=<cursor>."
+
+
+def _parse_cursor(raw: str | None, param: str) -> int | None:
+    if raw is None or raw == "":
+        return None
+    try:
+        value = int(raw)
+    except ValueError:
+        raise ValidationError({param: "Ожидается целое число."})
+    if value < 0:
+        raise ValidationError({param: "Ожидается число не меньше 0."})
+    return value
+
+
+@api_view(["GET"])
+def changes_view(request):
+    since = _parse_cursor(request.query_params.get("since"), "since")
+    latest = latest_seq()
+    if since is None:
+        # Курсор для начала синхронизации: взять его, затем загрузить списки.
+        return Response({"cursor": latest, "events": [], "has_more": False})
+    if is_stale(since, latest):
+        return Response({"detail": STALE_CURSOR, "cursor": latest}, status=410)
+
+    try:
+        limit = int(request.query_params.get("limit", settings.CHANGEFEED_PAGE_SIZE))
+    except ValueError:
+        raise ValidationError({"limit": "Ожидается целое число."})
+    limit = min(max(limit, 1), MAX_LIMIT)
+
+    events, has_more = read_changes(since, limit)
+    cursor = events[-1]["seq"] if events else since
+    return Response({"cursor": cursor, "events": events, "has_more": has_more})
+
+
+# Обычное асинхронное представление Django: поток text/event-stream отдается
+# без рендереров DRF. Под WSGI Django собрал бы асинхронный поток в память
+# целиком, а поток на каждого клиента занимал бы поток сервера, поэтому там
+# поток не отдается.
+@require_GET
+async def change_stream(request):
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {"detail": ASGI_ONLY}, status=501, json_dumps_params={"ensure_ascii": False}
+        )
+    # EventSource при переподключении присылает Last-Event-ID, а URL не меняет.
+    try:
+        since = _parse_cursor(request.headers.get("Last-Event-ID"), "Last-Event-ID")
+        if since is None:
+            since = _parse_cursor(request.GET.get("since"), "since")
+    except ValidationError as exc:
+        return JsonResponse(exc.detail, status=400, json_dumps_params={"ensure_ascii": False})
+    if since is None:
+        since = await read_pool.run(latest_seq)
+
+    response = StreamingHttpResponse(aiter_event_stream(since), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # nginx не должен копить поток
+    return response
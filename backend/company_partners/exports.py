@@ -0,0 +1,28 @@
+from collections.abc import Iterator
+
+from django.conf import settings
+
+from config.exports import ExportColumn
+
+from .models import Partner
+
+PARTNER_EXPORT_COLUMNS = [
+    ExportColumn("Тип партнера", "partner_type"),
+    ExportColumn("Наименование партнера", "company_name"),
+    ExportColumn("Юридический адрес", "legal_address"),
+    ExportColumn("ИНН", "inn"),
+    ExportColumn("Директор", "director_name"),
+    ExportColumn("Телефон", "phone"),
+    ExportColumn("Электронная почта", "email"),
+    ExportColumn("Логотип", "logo_url"),
+    ExportColumn("Рейтинг", "rating"),
+    ExportColumn("Места продаж", "sales_places"),
+]
+
+
+def iter_partner_records() -> Iterator[dict]:
+    return (
+        Partner.objects.order_by("id")
+        .values("id", *(column.key for column in PARTNER_EXPORT_COLUMNS))
+        .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    )
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Partner',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('partner_type', models.CharField(max_length=100)),
+                ('company_name', models.CharField(max_length=255)),
+                ('legal_address', models.TextField(blank=True)),
+                ('inn', models.CharField(blank=True, max_length=12)),
+                ('director_name', models.CharField(blank=True, max_length=255)),
+                ('phone', models.CharField(blank=True, max_length=50)),
+                ('email', models.EmailField(blank=True, max_length=254)),
+                ('logo_url', models.URLField(blank=True)),
+                ('rating', models.IntegerField(default=0)),
+                ('sales_places', models.TextField(blank=True)),
+            ],
+            options={
+                'db_table': 'partner',
+            },
+        ),
+    ]
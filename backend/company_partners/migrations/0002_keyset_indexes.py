@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company_partners', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='partner',
+            index=models.Index(fields=['company_name', 'id'], name='partner_company_name_id_idx'),
+        ),
+    ]
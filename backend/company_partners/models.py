@@ -15,6 +15,9 @@ class Partner(models.Model):
 
     class Meta:
         db_table = "partner"
+        indexes = [
+            models.Index(fields=["company_name", "id"], name="partner_company_name_id_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.company_name
@@ -4,6 +4,7 @@ from . import views
 
 urlpatterns = [
     path("api/partners", views.PartnerListCreateView.as_view(), name="partner-list"),
+    path("api/partners/export", views.partner_export, name="partner-export"),
     path(
         "api/partners/<int:pk>",
         views.PartnerRetrieveUpdateDestroyView.as_view(),
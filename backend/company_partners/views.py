@@ -1,14 +1,21 @@
 from django.db import IntegrityError, transaction
+from django.views.decorators.http import require_GET
 from rest_framework import generics
 from rest_framework.exceptions import ValidationError
 
+from config.conditional import ConditionalGetMixin
+from config.exports import export_response
+from config.fast_list import FastListMixin
+
+from .exports import PARTNER_EXPORT_COLUMNS, iter_partner_records
 from .models import Partner
 from .serializers import PartnerSerializer
 
 
-class PartnerListCreateView(generics.ListCreateAPIView):
+class PartnerListCreateView(ConditionalGetMixin, FastListMixin, generics.ListCreateAPIView):
     serializer_class = PartnerSerializer
     queryset = Partner.objects.order_by("company_name")
+    version_tables = ("partner",)
 
     def perform_create(self, serializer):
         try:
@@ -18,9 +25,10 @@ class PartnerListCreateView(generics.ListCreateAPIView):
             raise ValidationError("Не удалось создать партнера из-за конфликта данных.")
 
 
-class PartnerRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class PartnerRetrieveUpdateDestroyView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = PartnerSerializer
     queryset = Partner.objects.all()
+    version_tables = ("partner",)
 
     def perform_update(self, serializer):
         try:
@@ -29,3 +37,7 @@ class PartnerRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         except IntegrityError:
             raise ValidationError("Не удалось обновить партнера из-за конфликта данных.")
 
+
+@require_GET
+def partner_export(request):
+    return export_response(request, "partners", PARTNER_EXPORT_COLUMNS, iter_partner_records())
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Employee',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('full_name', models.CharField(max_length=255)),
+                ('birth_date', models.DateField(blank=True, null=True)),
+                ('passport_data', models.CharField(blank=True, max_length=255)),
+                ('bank_details', models.CharField(blank=True, max_length=255)),
+                ('has_family', models.BooleanField(default=False)),
+                ('health_status', models.CharField(blank=True, max_length=255)),
+            ],
+            options={
+                'db_table': 'employee',
+            },
+        ),
+    ]
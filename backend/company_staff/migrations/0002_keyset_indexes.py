@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company_staff', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='employee',
+            index=models.Index(fields=['full_name', 'id'], name='employee_full_name_id_idx'),
+        ),
+    ]
@@ -11,6 +11,9 @@ class Employee(models.Model):
 
     class Meta:
         db_table = "employee"
+        indexes = [
+            models.Index(fields=["full_name", "id"], name="employee_full_name_id_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.full_name
@@ -2,13 +2,17 @@ from django.db import IntegrityError, transaction
 from rest_framework import generics
 from rest_framework.exceptions import ValidationError
 
+from config.conditional import ConditionalGetMixin
+from config.fast_list import FastListMixin
+
 from .models import Employee
 from .serializers import EmployeeSerializer
 
 
-class EmployeeListCreateView(generics.ListCreateAPIView):
+class EmployeeListCreateView(ConditionalGetMixin, FastListMixin, generics.ListCreateAPIView):
     serializer_class = EmployeeSerializer
     queryset = Employee.objects.order_by("full_name")
+    version_tables = ("employee",)
 
     def perform_create(self, serializer):
         try:
@@ -18,9 +22,10 @@ class EmployeeListCreateView(generics.ListCreateAPIView):
             raise ValidationError("Не удалось создать сотрудника из-за конфликта данных.")
 
 
-class EmployeeRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class EmployeeRetrieveUpdateDestroyView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = EmployeeSerializer
     queryset = Employee.objects.all()
+    version_tables = ("employee",)
 
     def perform_update(self, serializer):
         try:
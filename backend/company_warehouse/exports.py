@@ -0,0 +1,48 @@
+from collections.abc import Iterator
+
+from django.conf import settings
+from django.db.models import F
+
+from config.exports import ExportColumn
+from products.reference_cache import reference_cache
+
+from .models import Material
+
+MATERIAL_EXPORT_COLUMNS = [
+    ExportColumn("Наименование материала", "name"),
+    ExportColumn("Тип материала", "material_type"),
+    ExportColumn("Поставщик", "supplier_name"),
+    ExportColumn("Единица измерения", "unit"),
+    ExportColumn("Количество в упаковке", "quantity_in_package"),
+    ExportColumn("Описание", "description"),
+    ExportColumn("Изображение", "image_url"),
+    ExportColumn("Стоимость", "cost"),
+    ExportColumn("Количество на складе", "stock_quantity"),
+    ExportColumn("Минимальное количество", "min_quantity"),
+]
+
+
+def iter_material_records() -> Iterator[dict]:
+    """Материалы с названиями типа и поставщика, пачками по EXPORT_CHUNK_SIZE."""
+
+    rows = (
+        Material.objects.order_by("id")
+        .values(
+            "id",
+            "name",
+            "material_type_id",
+            "supplier_id",
+            "unit",
+            "quantity_in_package",
+            "description",
+            "image_url",
+            "cost",
+            "stock_quantity",
+            "min_quantity",
+            supplier_name=F("supplier__name"),
+        )
+        .iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+    )
+    for row in rows:
+        row["material_type"] = reference_cache.name("material_type", row["material_type_id"])
+        yield row
@@ -0,0 +1,105 @@
+"""
+Журнал material_low_stock_log (миграция 0005_low_stock) для
+GET /api/materials/low-stock?since=<cursor>.
+
+Для ответа важно только, менялся ли материал после курсора, поэтому из
+журнала без потерь удаляются все записи материала, кроме последней. Если
+журнал все равно больше лимита, старые записи удаляются, а граница
+запоминается в material_low_stock_state: клиенту с более старым курсором
+отдается полный список.
+"""
+
+from typing import NamedTuple
+
+from django.db import connection, transaction
+from django.db.models.expressions import RawSQL
+
+from config.db_routing import read_connection
+
+
+class Compaction(NamedTuple):
+    superseded: int  # записи, после которых по тому же материалу были другие
+    expired: int  # записи сверх лимита строк
+    truncated_through: int
+
+
+def low_stock_cursor() -> int:
+    """
+    Последний выданный seq журнала (0 — журнал пуст). Берется из
+    sqlite_sequence: сжатие журнала его не уменьшает.
+    """
+
+    with read_connection().cursor() as cursor:
+        cursor.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'material_low_stock_log'"
+        )
+        row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def low_stock_truncated_through() -> int:
+    """Последний seq, удаленный сверх лимита строк (0 — журнал не сокращался)."""
+
+    with read_connection().cursor() as cursor:
+        cursor.execute(
+            "SELECT value FROM material_low_stock_state WHERE name = 'truncated_through'"
+        )
+        row = cursor.fetchone()
+    return row[0] if row else 0
+
+
+def changed_since(since: int) -> RawSQL:
+    """
+    Подзапрос для id__in: материалы, у которых после записи since менялась
+    нехватка (стал или перестал быть ниже min_quantity либо изменился,
+    оставаясь ниже).
+    """
+
+    return RawSQL("SELECT material_id FROM material_low_stock_log WHERE seq > %s", [since])
+
+
+def changed_ids_since(since: int) -> list[int]:
+    """Все id материалов из журнала после since, включая удаленные, по возрастанию."""
+
+    with read_connection().cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT DISTINCT material_id FROM material_low_stock_log
+            WHERE seq > %s ORDER BY material_id
+            """,
+            [since],
+        )
+        return [material_id for (material_id,) in cursor.fetchall()]
+
+
+def compact_low_stock_log(max_rows: int) -> Compaction:
+    """
+    Сжать журнал: удалить записи, перекрытые более поздними по тому же
+    материалу, затем записи сверх max_rows самых новых.
+    """
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            "DELETE FROM material_low_stock_log WHERE seq NOT IN "
+            "(SELECT MAX(seq) FROM material_low_stock_log GROUP BY material_id)"
+        )
+        superseded = cursor.rowcount
+
+        cursor.execute(
+            "SELECT seq FROM material_low_stock_log ORDER BY seq DESC LIMIT 1 OFFSET %s",
+            [max_rows],
+        )
+        row = cursor.fetchone()
+        expired = 0
+        if row:
+            cursor.execute("DELETE FROM material_low_stock_log WHERE seq <= %s", [row[0]])
+            expired = cursor.rowcount
+            cursor.execute(
+                "UPDATE material_low_stock_state SET value = MAX(value, %s) "
+                "WHERE name = 'truncated_through'",
+                [row[0]],
+            )
+        cursor.execute(
+            "SELECT value FROM material_low_stock_state WHERE name = 'truncated_through'"
+        )
+        return Compaction(superseded, expired, cursor.fetchone()[0])
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from company_warehouse.low_stock import compact_low_stock_log
+
+
+class Command(BaseCommand):
+    help = "Сжать журнал нехватки материалов (material_low_stock_log)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-rows",
+            type=int,
+            default=settings.LOW_STOCK_LOG_MAX_ROWS,
+            help="сколько последних записей хранить не больше (по умолчанию LOW_STOCK_LOG_MAX_ROWS)",
+        )
+
+    def handle(self, *args, **options):
+        result = compact_low_stock_log(options["max_rows"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Удалено перекрытых записей: {result.superseded}, "
+                f"сверх лимита: {result.expired}. Журнал начинается после seq "
+                f"{result.truncated_through}."
+            )
+        )
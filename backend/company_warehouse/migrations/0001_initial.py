@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Supplier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('supplier_type', models.CharField(max_length=100)),
+                ('name', models.CharField(max_length=255)),
+                ('inn', models.CharField(blank=True, max_length=12)),
+                ('phone', models.CharField(blank=True, max_length=50)),
+                ('email', models.EmailField(blank=True, max_length=254)),
+            ],
+            options={
+                'db_table': 'supplier',
+            },
+        ),
+        migrations.CreateModel(
+            name='Material',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('material_type_id', models.IntegerField()),
+                ('unit', models.CharField(default='шт', max_length=50)),
+                ('quantity_in_package', models.IntegerField(blank=True, null=True)),
+                ('description', models.TextField(blank=True)),
+                ('image_url', models.URLField(blank=True)),
+                ('cost', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('stock_quantity', models.IntegerField(default=0)),
+                ('min_quantity', models.IntegerField(default=0)),
+                ('supplier', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='materials', to='company_warehouse.supplier')),
+            ],
+            options={
+                'db_table': 'material',
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company_warehouse', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['name', 'id'], name='material_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(fields=['name', 'id'], name='supplier_name_id_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company_warehouse', '0003_table_version'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(fields=['material_type_id', 'name'], name='material_type_name_idx'),
+        ),
+    ]
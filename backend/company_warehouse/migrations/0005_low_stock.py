@@ -0,0 +1,60 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:30
+
+from django.db import migrations, models
+
+# Журнал для GET /api/materials/low-stock?since=<cursor>: триггеры пишут id
+# материала, который был или стал ниже неснижаемого остатка, seq служит курсором.
+LOW_STOCK = "{row}.stock_quantity < {row}.min_quantity"
+
+LOW_STOCK_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS material_low_stock_log (
+        seq             INTEGER PRIMARY KEY AUTOINCREMENT,
+        material_id     INTEGER NOT NULL
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS material_low_stock_insert
+    AFTER INSERT ON material
+    WHEN {LOW_STOCK.format(row="new")}
+    BEGIN
+        INSERT INTO material_low_stock_log (material_id) VALUES (new.id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS material_low_stock_update
+    AFTER UPDATE ON material
+    WHEN {LOW_STOCK.format(row="old")} OR {LOW_STOCK.format(row="new")}
+    BEGIN
+        INSERT INTO material_low_stock_log (material_id) VALUES (new.id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS material_low_stock_delete
+    AFTER DELETE ON material
+    WHEN {LOW_STOCK.format(row="old")}
+    BEGIN
+        INSERT INTO material_low_stock_log (material_id) VALUES (old.id);
+    END
+    """,
+]
+
+DROP_LOW_STOCK_SQL = [
+    f"DROP TRIGGER IF EXISTS material_low_stock_{event}"
+    for event in ("insert", "update", "delete")
+] + ["DROP TABLE IF EXISTS material_low_stock_log"]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company_warehouse', '0004_material_type_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='material',
+            index=models.Index(condition=models.Q(('stock_quantity__lt', models.F('min_quantity'))), fields=['name', 'id'], name='material_low_stock_idx'),
+        ),
+        migrations.RunSQL(LOW_STOCK_SQL, DROP_LOW_STOCK_SQL),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:40
+
+from django.db import migrations
+
+# truncated_through — последний seq, удаленный из material_low_stock_log
+# сверх лимита строк (команда compact_low_stock): клиенту с курсором меньше
+# этого нужен полный список заново. От него зависит ответ low-stock, поэтому
+# у таблицы есть версия для ETag и кэша ответов.
+STATE_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS material_low_stock_state (
+        name            TEXT PRIMARY KEY,
+        value           INTEGER NOT NULL
+    ) WITHOUT ROWID
+    """,
+    "INSERT OR IGNORE INTO material_low_stock_state (name, value) VALUES ('truncated_through', 0)",
+    "INSERT OR IGNORE INTO table_version (table_name) VALUES ('material_low_stock_state')",
+    """
+    CREATE TRIGGER IF NOT EXISTS table_version_material_low_stock_state_update
+    AFTER UPDATE ON material_low_stock_state
+    BEGIN
+        UPDATE table_version
+        SET version = version + 1,
+            updated_at = CAST(strftime('%s', 'now') AS INTEGER)
+        WHERE table_name = 'material_low_stock_state';
+    END
+    """,
+]
+
+DROP_STATE_SQL = [
+    "DROP TRIGGER IF EXISTS table_version_material_low_stock_state_update",
+    "DELETE FROM table_version WHERE table_name = 'material_low_stock_state'",
+    "DROP TABLE IF EXISTS material_low_stock_state",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company_warehouse', '0005_low_stock'),
+        ('products', '0003_table_version'),
+    ]
+
+    operations = [
+        migrations.RunSQL(STATE_SQL, DROP_STATE_SQL),
+    ]
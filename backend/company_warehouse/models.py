@@ -10,6 +10,9 @@ class Supplier(models.Model):
 
     class Meta:
         db_table = "supplier"
+        indexes = [
+            models.Index(fields=["name", "id"], name="supplier_name_id_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -33,6 +36,16 @@ class Material(models.Model):
 
     class Meta:
         db_table = "material"
+        indexes = [
+            models.Index(fields=["name", "id"], name="material_name_id_idx"),
+            models.Index(fields=["material_type_id", "name"], name="material_type_name_idx"),
+            # Только материалы ниже неснижаемого остатка (/api/materials/low-stock).
+            models.Index(
+                fields=["name", "id"],
+                condition=models.Q(stock_quantity__lt=models.F("min_quantity")),
+                name="material_low_stock_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -0,0 +1,87 @@
+"""
+Потребность в сырье по плану производства и нехватка на складе
+(POST /api/materials/requirements).
+
+Сырье на каждую строку плана считает calculate_raw_material_amounts (NumPy,
+справочники из кэша), потребность суммируется по типам материалов в целых
+Python: количество на строку не ограничено 64 битами, и сумма не должна ни
+переполняться, ни молча заворачиваться. Остатки по тем же типам выбираются
+одним запросом с GROUP BY. Запросов на строку плана или на материал нет.
+"""
+
+from collections.abc import Sequence
+
+from django.conf import settings
+from django.db.models import Sum
+
+from config.db_routing import read_only_database
+from products.reference_cache import reference_cache
+from raw_material_calculation import calculate_raw_material_amounts
+
+from .models import Material
+
+
+def material_requirements(lines: Sequence) -> dict:
+    """
+    Потребность, остатки и нехватка по типам материалов для строк плана.
+
+    Строки — как у /api/raw-material/calculate/batch. Нехватка считается с
+    учетом неснижаемого остатка: max(0, потребность + min_quantity - stock_quantity).
+    Номера некорректных строк (расчет вернул -1) возвращаются в invalid_lines,
+    в потребность они не входят.
+    """
+
+    amounts = calculate_raw_material_amounts(
+        lines, db_path=settings.DATABASES["default"]["NAME"]
+    )
+    required, invalid_lines = sum_by_material_type(lines, amounts)
+    stock = _stock_by_material_type(list(required))
+
+    materials = []
+    for type_id, need in sorted(required.items()):
+        row = stock.get(type_id, {})
+        stock_quantity = row.get("stock_quantity") or 0
+        min_quantity = row.get("min_quantity") or 0
+        materials.append(
+            {
+                "material_type_id": type_id,
+                "material_type": reference_cache.name("material_type", type_id),
+                "required": need,
+                "stock_quantity": stock_quantity,
+                "min_quantity": min_quantity,
+                "shortage": max(0, need + min_quantity - stock_quantity),
+            }
+        )
+    materials.sort(key=lambda item: item["material_type"])
+    return {
+        "materials": materials,
+        "invalid_lines": invalid_lines,
+    }
+
+
+def sum_by_material_type(
+    lines: Sequence, amounts: Sequence[int]
+) -> tuple[dict[int, int], list[int]]:
+    """Потребность {material_type_id: сумма} и номера строк, где расчет вернул -1."""
+
+    required: dict[int, int] = {}
+    invalid_lines = []
+    for index, (line, amount) in enumerate(zip(lines, amounts)):
+        if amount < 0:
+            invalid_lines.append(index)
+            continue
+        # У корректной строки material_type_id уже проверен расчетом.
+        type_id = int(line["material_type_id"])
+        required[type_id] = required.get(type_id, 0) + amount
+    return required, invalid_lines
+
+
+def _stock_by_material_type(type_ids: list[int]) -> dict[int, dict]:
+    with read_only_database():
+        return {
+            row["material_type_id"]: row
+            for row in Material.objects.filter(material_type_id__in=type_ids)
+            .values("material_type_id")
+            .annotate(stock_quantity=Sum("stock_quantity"), min_quantity=Sum("min_quantity"))
+            .order_by()
+        }
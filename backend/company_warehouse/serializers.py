@@ -2,7 +2,7 @@ from decimal import Decimal
 
 from rest_framework import serializers
 
-from products.models import MaterialType
+from products.reference_cache import reference_cache
 
 from .models import Material, Supplier
 
@@ -41,14 +41,12 @@ class MaterialSerializer(serializers.ModelSerializer):
         ]
 
     def get_material_type(self, obj: Material) -> str:
-        material_type = MaterialType.objects.filter(id=obj.material_type_id).first()
-        return material_type.name if material_type else "—"
+        return reference_cache.name("material_type", obj.material_type_id)
 
     def validate_material_type_id(self, value: int) -> int:
         if value <= 0:
             raise serializers.ValidationError("Некорректный тип материала.")
-        exists = MaterialType.objects.filter(id=value).exists()
-        if not exists:
+        if reference_cache.get("material_type", value) is None:
             raise serializers.ValidationError("Тип материала не найден.")
         return value
 
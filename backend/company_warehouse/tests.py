@@ -0,0 +1,51 @@
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from company_warehouse.requirements import material_requirements
+
+LINE = {
+    "product_type_id": 1,
+    "material_type_id": 3,
+    "product_quantity": 10**17,
+    "parameter_one": 200,
+    "parameter_two": 300,
+}
+
+
+class MaterialRequirementsOverflowTests(SimpleTestCase):
+    """Потребность больше int64: сумма точная, без OverflowError и переполнения."""
+
+    def requirements(self, lines, amounts, stock):
+        with (
+            mock.patch(
+                "company_warehouse.requirements.calculate_raw_material_amounts",
+                return_value=amounts,
+            ),
+            mock.patch(
+                "company_warehouse.requirements._stock_by_material_type", return_value=stock
+            ),
+            mock.patch(
+                "company_warehouse.requirements.reference_cache.name", return_value="Тип"
+            ),
+        ):
+            return material_requirements(lines)
+
+    def test_amounts_beyond_int64_are_summed_exactly(self):
+        # Порядок величины, который дает расчет при product_quantity = 1e17.
+        amount = 6 * 10**21
+        result = self.requirements(
+            [LINE, LINE, {"material_type_id": "x"}],
+            [amount, amount, -1],
+            {3: {"stock_quantity": 10, "min_quantity": 4}},
+        )
+        self.assertEqual(result["invalid_lines"], [2])
+        [material] = result["materials"]
+        self.assertEqual(material["required"], 2 * amount)
+        self.assertEqual(material["shortage"], 2 * amount + 4 - 10)
+
+    def test_sum_past_int64_does_not_wrap(self):
+        amount = 2**62
+        result = self.requirements([LINE, LINE, LINE], [amount] * 3, {})
+        self.assertEqual(result["materials"][0]["required"], 3 * 2**62)
+        self.assertEqual(result["invalid_lines"], [])
@@ -10,6 +10,13 @@ urlpatterns = [
         name="supplier-detail",
     ),
     path("api/materials", views.MaterialListCreateView.as_view(), name="material-list"),
+    path("api/materials/export", views.material_export, name="material-export"),
+    path("api/materials/low-stock", views.MaterialLowStockView.as_view(), name="material-low-stock"),
+    path(
+        "api/materials/requirements",
+        views.material_requirements_view,
+        name="material-requirements",
+    ),
     path(
         "api/materials/<int:pk>",
         views.MaterialRetrieveUpdateDestroyView.as_view(),
@@ -1,15 +1,36 @@
+from functools import partial
+
 from django.db.models.deletion import ProtectedError
 from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.views.decorators.http import require_GET
 from rest_framework import generics
+from rest_framework.decorators import api_view
 from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from config.conditional import ConditionalGetMixin
+from config.exports import export_response
+from config.fast_list import FastListMixin
+from config.filters import MAX_INT, sqlite_int
+from products.reference_cache import reference_cache
 
+from .exports import MATERIAL_EXPORT_COLUMNS, iter_material_records
+from .low_stock import (
+    changed_ids_since,
+    changed_since,
+    low_stock_cursor,
+    low_stock_truncated_through,
+)
 from .models import Material, Supplier
+from .requirements import material_requirements
 from .serializers import MaterialSerializer, SupplierSerializer
 
 
-class SupplierListCreateView(generics.ListCreateAPIView):
+class SupplierListCreateView(ConditionalGetMixin, FastListMixin, generics.ListCreateAPIView):
     serializer_class = SupplierSerializer
     queryset = Supplier.objects.order_by("name")
+    version_tables = ("supplier",)
 
     def perform_create(self, serializer):
         try:
@@ -19,9 +40,10 @@ class SupplierListCreateView(generics.ListCreateAPIView):
             raise ValidationError("Не удалось создать поставщика из-за конфликта данных.")
 
 
-class SupplierRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class SupplierRetrieveUpdateDestroyView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = SupplierSerializer
     queryset = Supplier.objects.all()
+    version_tables = ("supplier",)
 
     def perform_update(self, serializer):
         try:
@@ -40,9 +62,17 @@ class SupplierRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
             )
 
 
-class MaterialListCreateView(generics.ListCreateAPIView):
+class MaterialListCreateView(ConditionalGetMixin, FastListMixin, generics.ListCreateAPIView):
     serializer_class = MaterialSerializer
     queryset = Material.objects.select_related("supplier").order_by("name")
+    version_tables = ("material", "supplier", "material_type")
+    fast_list_overrides = {
+        "material_type": ("material_type_id", partial(reference_cache.name, "material_type")),
+    }
+    filter_params = {
+        "supplier_id": ("supplier_id", sqlite_int),
+        "material_type_id": ("material_type_id", sqlite_int),
+    }
 
     def perform_create(self, serializer):
         try:
@@ -52,9 +82,65 @@ class MaterialListCreateView(generics.ListCreateAPIView):
             raise ValidationError("Не удалось создать материал из-за конфликта данных.")
 
 
-class MaterialRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class MaterialLowStockView(ConditionalGetMixin, generics.GenericAPIView):
+    """
+    Материалы ниже неснижаемого остатка (частичный индекс material_low_stock_idx).
+
+    Ответ: {"cursor": N, "reset": false, "materials": [...], "removed": [...]}.
+    С ?since=<cursor> возвращаются только материалы, изменившиеся после этого
+    курсора: в materials — те, что сейчас ниже остатка и подходят под
+    фильтры, в removed — id всех остальных изменившихся (вышли из нехватки,
+    из-под фильтров или удалены). Если журнал до курсора уже сокращен
+    (compact_low_stock), отдается полный список с reset: true. Без изменений
+    опрос стоит одного запроса версий таблиц (304 или ответ из кэша).
+    """
+
+    serializer_class = MaterialSerializer
+    queryset = (
+        Material.objects.select_related("supplier")
+        .filter(stock_quantity__lt=F("min_quantity"))
+        .order_by("name")
+    )
+    version_tables = ("material", "supplier", "material_type", "material_low_stock_state")
+    filter_params = MaterialListCreateView.filter_params
+
+    def get(self, request, *args, **kwargs):
+        return self.conditional_get(request, self.low_stock)
+
+    def low_stock(self, request):
+        since = request.query_params.get("since")
+        if since is not None:
+            try:
+                since = int(since)
+                if not 0 <= since <= MAX_INT:
+                    raise ValueError(since)
+            except ValueError:
+                raise ValidationError({"since": f"Ожидается целое число от 0 до {MAX_INT}."})
+
+        # Курсор читается до данных: изменение между запросами придет повторно.
+        cursor = low_stock_cursor()
+        # Журнал до курсора сокращен: клиент получает полный список заново.
+        reset = since is not None and since < low_stock_truncated_through()
+        queryset = self.filter_queryset(self.get_queryset())
+        incremental = since is not None and not reset
+        if incremental:
+            queryset = queryset.filter(id__in=changed_since(since))
+        materials = self.get_serializer(queryset, many=True).data
+        removed = []
+        if incremental:
+            # Все изменившиеся, которых нет в materials: вышли из нехватки,
+            # перестали подходить под фильтры клиента или удалены.
+            listed = {material["id"] for material in materials}
+            removed = [pk for pk in changed_ids_since(since) if pk not in listed]
+        return Response(
+            {"cursor": cursor, "reset": reset, "materials": materials, "removed": removed}
+        )
+
+
+class MaterialRetrieveUpdateDestroyView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = MaterialSerializer
     queryset = Material.objects.select_related("supplier")
+    version_tables = ("material", "supplier", "material_type")
 
     def perform_update(self, serializer):
         try:
@@ -62,3 +148,17 @@ class MaterialRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
                 serializer.save()
         except IntegrityError:
             raise ValidationError("Не удалось обновить материал из-за конфликта данных.")
+
+
+@require_GET
+def material_export(request):
+    return export_response(request, "materials", MATERIAL_EXPORT_COLUMNS, iter_material_records())
+
+
+@api_view(["POST"])
+def material_requirements_view(request):
+    data = request.data
+    lines = data.get("lines") if isinstance(data, dict) else data
+    if not isinstance(lines, list):
+        raise ValidationError({"lines": "Ожидается список строк плана."})
+    return Response(material_requirements(lines))
@@ -0,0 +1,16 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class ConfigConfig(AppConfig):
+    """Инфраструктура проекта: подключает PRAGMA SQLite к каждому соединению."""
+
+    name = "config"
+    verbose_name = "Настройки проекта"
+
+    def ready(self):
+        from .sqlite import apply_pragmas
+
+        connection_created.connect(
+            apply_pragmas, dispatch_uid="config.sqlite.apply_pragmas"
+        )
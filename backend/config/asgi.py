@@ -1,7 +1,24 @@
 import os
 
-from django.core.asgi import get_asgi_application
+import django
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
-application = get_asgi_application()
+django.setup(set_prefix=False)
+
+
+class AsyncViewsASGIHandler(ASGIHandler):
+    """ASGIHandler, который разрешает URL по config.urls_async."""
+
+    def create_request(self, scope, body_file):
+        request, error_response = super().create_request(scope, body_file)
+        if request is not None:
+            request.urlconf = "config.urls_async"
+        return request, error_response
+
+
+# То же, что get_asgi_application(), но с асинхронными представлениями,
+# если они не выключены (DJANGO_ASYNC_VIEWS=false).
+application = AsyncViewsASGIHandler() if settings.ASYNC_VIEWS else ASGIHandler()
@@ -0,0 +1,78 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from .db_routing import read_connection
+
+
+class AsyncReadPool:
+    """
+    Чтение SQLite из асинхронных представлений без sync_to_async.
+
+    Запросы ORM и сырой SQL выполняются в отдельном пуле потоков
+    (settings.ASYNC_READ_POOL_SIZE) обычными средствами Django: у каждого
+    потока свое соединение, PRAGMA ему выставляет config.sqlite, а
+    read_only_database() вызывающего кода действует и в потоке пула (контекст
+    копируется). Модуль sqlite3 отпускает GIL на время запроса, поэтому цикл
+    событий продолжает принимать соединения, а одновременно к базе обращается
+    не больше потоков, чем в пуле. В отличие от sync_to_async с
+    thread_sensitive=True, запросы разных клиентов не выстраиваются в очередь
+    к одному потоку.
+
+    Соединения потоков пула живут по тем же правилам, что и у запросов:
+    перед задачей и после нее close_old_connections() закрывает устаревшие
+    (CONN_MAX_AGE) и сломанные (CONN_HEALTH_CHECKS) соединения.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=settings.ASYNC_READ_POOL_SIZE,
+                    thread_name_prefix="sqlite-read",
+                )
+            return self._executor
+
+    async def run(self, func, *args):
+        """Выполнить синхронную функцию в потоке пула с контекстом вызывающего кода."""
+
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self.executor, partial(context.run, _run_job, func, *args)
+        )
+
+    async def fetchall(self, sql: str, params=()) -> list[tuple]:
+        return await self.run(_fetchall, sql, params)
+
+    async def values_list(self, queryset, *fields) -> list[tuple]:
+        """Асинхронный list(queryset.values_list(*fields))."""
+
+        return await self.run(list, queryset.values_list(*fields))
+
+
+def _run_job(func, *args):
+    close_old_connections()
+    try:
+        return func(*args)
+    finally:
+        close_old_connections()
+
+
+def _fetchall(sql: str, params) -> list[tuple]:
+    with read_connection().cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+read_pool = AsyncReadPool()
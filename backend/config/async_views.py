@@ -0,0 +1,112 @@
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import HttpRequest, HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
+
+from .async_db import read_pool
+from .conditional import aconditional_get
+from .fast_list import RowFormat, render_json
+from .filters import parse_filter_params
+
+# Параметры, которые асинхронный путь не обрабатывает сам (формат DRF и
+# постраничная выдача config.pagination): такие запросы идут обычным путем.
+SYNC_ONLY_PARAMS = ("format", "cursor", "page_size")
+
+
+def is_plain_json_get(request) -> bool:
+    """GET, на который обычное представление ответило бы компактным JSON."""
+
+    if request.method != "GET" or any(param in request.GET for param in SYNC_ONLY_PARAMS):
+        return False
+    accept = request.headers.get("Accept", "")
+    if "indent" in accept:
+        return False
+    return not accept or "*/*" in accept or JSONRenderer.media_type in accept
+
+
+def allow_header(view_class) -> str:
+    """Заголовок Allow, который поставил бы DRF-представление view_class."""
+
+    view = view_class()
+    view.setup(HttpRequest())  # как в as_view(): добавляет HEAD к GET
+    return ", ".join(view.allowed_methods)
+
+
+def json_response(data, status: int = 200) -> HttpResponse:
+    """Ответ с тем же телом и типом, что у Response DRF с JSONRenderer."""
+
+    return HttpResponse(render_json(data), status=status, content_type=JSONRenderer.media_type)
+
+
+def json_body(request):
+    """
+    Тело запроса application/json или None, если его должен разобрать DRF
+    (другой тип, пустое или некорректное тело — DRF вернет свою ошибку).
+    """
+
+    if request.content_type != "application/json" or not request.body:
+        return None
+
+    def reject_constant(name):
+        # NaN и Infinity DRF не принимает (STRICT_JSON).
+        raise ValueError(name)
+
+    try:
+        return json.loads(request.body, parse_constant=reject_constant)
+    except ValueError:
+        return None
+
+
+def delegate(sync_view):
+    """Корутина, которая отдает запрос обычному (синхронному) представлению."""
+
+    sync_view = sync_to_async(sync_view)
+
+    async def view(request, *args, **kwargs):
+        return await sync_view(request, *args, **kwargs)
+
+    return view
+
+
+def async_list_view(view_class, serializer_class=None):
+    """
+    Асинхронный GET-список для DRF-представления view_class.
+
+    Запрос выполняется через config.async_db.read_pool, поля берутся из
+    сериализатора (RowFormat и fast_list_overrides, как в FastListMixin),
+    фильтры — из filter_params, ETag и кэш — как в ConditionalGetMixin.
+    Ответ совпадает с обычным побайтно; остальные методы и запросы с
+    пагинацией или другим форматом обслуживает сам view_class.
+    """
+
+    sync_view = delegate(view_class.as_view())
+    row_format = RowFormat(
+        serializer_class or view_class.serializer_class,
+        getattr(view_class, "fast_list_overrides", {}),
+    )
+    filter_params = getattr(view_class, "filter_params", {})
+    allow = allow_header(view_class)
+
+    @csrf_exempt
+    async def view(request, **kwargs):
+        if not is_plain_json_get(request):
+            return await sync_view(request, **kwargs)
+
+        async def handler():
+            try:
+                lookups = parse_filter_params(request.GET, filter_params)
+            except ValidationError as exc:
+                return json_response(exc.detail, status=400)
+            queryset = view_class(kwargs=kwargs).get_queryset().filter(**lookups)
+            rows = await read_pool.values_list(queryset, *row_format.lookups)
+            return json_response([row_format.to_dict(row) for row in rows])
+
+        response = await aconditional_get(request, view_class.version_tables, handler)
+        # DRF ставит Allow на любой ответ, в том числе из кэша и 304.
+        response["Allow"] = allow
+        return response
+
+    return view
@@ -0,0 +1,99 @@
+import hashlib
+
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+)
+
+from .response_cache import response_cache
+from .table_versions import aread_table_versions, read_table_versions
+
+
+def make_etag(url: str, media_type: str, tables, versions) -> str:
+    """
+    ETag по URL, формату ответа и версиям таблиц.
+
+    Last-Modified не выдается: updated_at в table_version хранится с
+    точностью до секунды, а версия за секунду может смениться несколько
+    раз, и по If-Modified-Since клиент получил бы 304 на устаревшие данные.
+    Счетчик версий монотонен, поэтому ETag такой ошибки не дает.
+    """
+
+    key = "|".join(
+        [url, media_type] + [f"{table}:{versions[table].version}" for table in tables]
+    )
+    return '"%s"' % hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def set_validators(response, etag: str):
+    if response.status_code in (200, 304):
+        response["ETag"] = etag
+        # Браузер должен каждый раз переспрашивать сервер, а не брать
+        # ответ из своего кэша по эвристике.
+        patch_cache_control(response, no_cache=True)
+        patch_vary_headers(response, ["Accept"])
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    ETag и кэш ответов для GET по версиям таблиц из table_version.
+
+    Версии читаются одним запросом до основного; если у клиента та же
+    версия (If-None-Match), ответ 304 отдается без
+    выборки данных и сериализации, а если готовое тело есть в кэше
+    (config.response_cache) — отдается оно. В представлении нужно
+    перечислить version_tables — все таблицы, от которых зависит ответ.
+    """
+
+    version_tables: tuple[str, ...] = ()
+
+    def get_etag(self, request) -> str:
+        versions = read_table_versions(self.version_tables)
+        return make_etag(
+            request.build_absolute_uri(),
+            getattr(request, "accepted_media_type", ""),
+            self.version_tables,
+            versions,
+        )
+
+    def conditional_get(self, request, handler, *args, **kwargs):
+        etag = self.get_etag(request)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = response_cache.get(etag)
+            if response is None:
+                response = handler(request, *args, **kwargs)
+                response_cache.store(etag, response)
+                response["X-Cache"] = "MISS"
+            else:
+                response["X-Cache"] = "HIT"
+        return set_validators(response, etag)
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_get(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(request, super().retrieve, *args, **kwargs)
+
+
+async def aconditional_get(request, version_tables, handler, media_type="application/json"):
+    """
+    ConditionalGetMixin.conditional_get для асинхронных представлений:
+    handler — корутина без аргументов, которая строит ответ. ETag совпадает
+    с синхронным путем, поэтому кэш ответов у них общий.
+    """
+
+    versions = await aread_table_versions(version_tables)
+    etag = make_etag(request.build_absolute_uri(), media_type, version_tables, versions)
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = await response_cache.aget(etag)
+        if response is None:
+            response = await handler()
+            await response_cache.astore(etag, response)
+            response["X-Cache"] = "MISS"
+        else:
+            response["X-Cache"] = "HIT"
+    return set_validators(response, etag)
@@ -0,0 +1,102 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+# Соединение только для чтения с тем же файлом БД (DJANGO_DB_READONLY=true).
+READ_ONLY_ALIAS = "readonly"
+
+_read_only: ContextVar[bool] = ContextVar("read_only_database", default=False)
+
+
+@contextmanager
+def read_only_database() -> Iterator[None]:
+    """Направить чтение внутри блока в соединение только для чтения."""
+
+    token = _read_only.set(True)
+    try:
+        yield
+    finally:
+        _read_only.reset(token)
+
+
+def read_alias() -> str:
+    """Псевдоним БД, из которой сейчас читать: readonly внутри read_only_database()."""
+
+    if _read_only.get() and READ_ONLY_ALIAS in settings.DATABASES:
+        return READ_ONLY_ALIAS
+    return DEFAULT_DB_ALIAS
+
+
+def read_connection():
+    """Соединение для чтения сырым SQL (то же правило, что у ReadOnlyRouter)."""
+
+    return connections[read_alias()]
+
+
+class ReadOnlyRouter:
+    """
+    Чтение из readonly внутри read_only_database() (GET/HEAD/OPTIONS, см.
+    ReadOnlyDatabaseMiddleware), все записи и миграции — в default.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Оба псевдонима указывают на один файл БД.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != READ_ONLY_ALIAS
+
+
+class ReadOnlyDatabaseMiddleware:
+    """
+    Безопасные запросы (GET, HEAD, OPTIONS) читают через соединение только
+    для чтения. Потоковые ответы (выгрузки) читают БД уже после выхода из
+    представления, поэтому их содержимое тоже отдается внутри
+    read_only_database().
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if request.method not in SAFE_METHODS:
+            return self.get_response(request)
+        with read_only_database():
+            response = self.get_response(request)
+        return self.wrap_streaming(response)
+
+    async def __acall__(self, request):
+        if request.method not in SAFE_METHODS:
+            return await self.get_response(request)
+        with read_only_database():
+            response = await self.get_response(request)
+        return self.wrap_streaming(response)
+
+    @staticmethod
+    def wrap_streaming(response):
+        if response.streaming and not response.is_async:
+            response.streaming_content = _read_only_stream(response.streaming_content)
+        return response
+
+
+def _read_only_stream(content):
+    with read_only_database():
+        yield from content
@@ -0,0 +1,111 @@
+import csv
+import json
+import tempfile
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from typing import NamedTuple
+
+from django.conf import settings
+from django.http import FileResponse, JsonResponse, StreamingHttpResponse
+from openpyxl import Workbook
+
+EXPORT_FORMATS = ("csv", "ndjson", "xlsx")
+XLSX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+class ExportColumn(NamedTuple):
+    header: str  # заголовок в CSV и XLSX
+    key: str  # ключ в NDJSON
+    flatten: Callable | None = None  # значение для CSV и XLSX, если не скаляр
+
+
+class _Echo:
+    """Файловый объект для csv.writer, который просто возвращает строку."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _batches(rows: Iterable, size: int) -> Iterator[list]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _csv_chunks(columns: list[ExportColumn], rows: Iterable[tuple]) -> Iterator[bytes]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow([column.header for column in columns]).encode("utf-8")
+    for batch in _batches(rows, settings.EXPORT_CHUNK_SIZE):
+        yield "".join(writer.writerow(row) for row in batch).encode("utf-8")
+
+
+def _ndjson_chunks(columns: list[ExportColumn], records: Iterable[dict]) -> Iterator[bytes]:
+    for batch in _batches(records, settings.EXPORT_CHUNK_SIZE):
+        lines = (
+            json.dumps(record, ensure_ascii=False, separators=(",", ":"), default=str)
+            for record in batch
+        )
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def _xlsx_file(columns: list[ExportColumn], rows: Iterable[tuple]):
+    # В режиме write_only строки сразу уходят во временные файлы openpyxl,
+    # а готовая книга пишется во временный файл, а не в память.
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([column.header for column in columns])
+    for row in rows:
+        sheet.append(row)
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
+
+
+def export_response(request, name: str, columns: list[ExportColumn], records: Iterable[dict]):
+    """
+    Ответ с выгрузкой в формате из параметра ?format= (csv по умолчанию).
+
+    records — ленивый поток словарей с ключами column.key; в CSV и XLSX
+    значения идут в порядке columns. Составные значения (например, маршрут
+    по цехам) в NDJSON остаются как есть, а в таблицах сводятся к строке
+    функцией column.flatten. Decimal и даты в NDJSON пишутся строками.
+    """
+
+    export_format = request.GET.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        return JsonResponse(
+            {"format": [f"Поддерживаются форматы: {', '.join(EXPORT_FORMATS)}."]},
+            status=400,
+            json_dumps_params={"ensure_ascii": False},
+        )
+
+    if export_format == "ndjson":
+        response = StreamingHttpResponse(
+            _ndjson_chunks(columns, records),
+            content_type="application/x-ndjson; charset=utf-8",
+        )
+        response["Content-Disposition"] = f'attachment; filename="{name}.ndjson"'
+        return response
+
+    rows = (
+        tuple(
+            column.flatten(record[column.key]) if column.flatten else record[column.key]
+            for column in columns
+        )
+        for record in records
+    )
+    if export_format == "xlsx":
+        return FileResponse(
+            _xlsx_file(columns, rows),
+            as_attachment=True,
+            filename=f"{name}.xlsx",
+            content_type=XLSX_CONTENT_TYPE,
+        )
+    response = StreamingHttpResponse(
+        _csv_chunks(columns, rows),
+        content_type="text/csv; charset=utf-8",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{name}.csv"'
+    return response
+
@@ -0,0 +1,154 @@
+import json
+import operator
+import re
+from collections.abc import Callable
+
+from django.http import HttpResponse
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # необязательная зависимость: без нее работает json
+    orjson = None
+
+# Поля, у которых to_representation для значения из БД ничего не меняет.
+IDENTITY_FIELDS = (
+    serializers.CharField,
+    serializers.IntegerField,
+    serializers.FloatField,
+    serializers.BooleanField,
+)
+
+# orjson пишет экспоненту как 1e16, а json — как 1e+16; такие ответы
+# кодируются через json, чтобы вывод совпадал побайтно.
+_ORJSON_EXPONENT = re.compile(rb"[0-9]e-?[0-9]")
+
+
+def render_json(data) -> bytes:
+    """Тот же вывод, что у JSONRenderer DRF: компактный JSON в UTF-8."""
+
+    content = None
+    if orjson is not None:
+        try:
+            content = orjson.dumps(data)
+        except TypeError:
+            content = None
+        if content is not None and _ORJSON_EXPONENT.search(content):
+            content = None
+    if content is None:
+        content = json.dumps(
+            data,
+            ensure_ascii=JSONRenderer.ensure_ascii,
+            allow_nan=not JSONRenderer.strict,
+            separators=(",", ":"),
+        ).encode("utf-8")
+    # JSONRenderer всегда экранирует U+2028 и U+2029.
+    return content.replace("\u2028".encode(), b"\\u2028").replace(
+        "\u2029".encode(), b"\\u2029"
+    )
+
+
+class RowFormat:
+    """
+    Скомпилированное описание строки списка для values_list().
+
+    lookups — аргументы values_list, to_dict превращает кортеж из БД в
+    словарь с теми же ключами и значениями, что вернул бы сериализатор.
+    """
+
+    def __init__(self, serializer_class, overrides: dict[str, tuple[str, Callable]]):
+        self.names: list[str] = []
+        self.lookups: list[str] = []
+        # (имя, индекс значения, функция, вызывать ли ее для None)
+        self.converters: list[tuple[str, int, Callable, bool]] = []
+        indexes = []
+
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if name in overrides:
+                lookup, convert = overrides[name]
+                with_none = True
+            elif isinstance(field, (serializers.SerializerMethodField, serializers.BaseSerializer)):
+                raise TypeError(f"Поле {name} нужно описать в fast_list_overrides.")
+            else:
+                lookup = "__".join(field.source_attrs)
+                convert = self.field_converter(field)
+                with_none = False
+            if lookup not in self.lookups:
+                self.lookups.append(lookup)
+            index = self.lookups.index(lookup)
+            if convert is not None:
+                self.converters.append((name, index, convert, with_none))
+            self.names.append(name)
+            indexes.append(index)
+
+        self.values = operator.itemgetter(*indexes)
+
+    @staticmethod
+    def field_converter(field) -> Callable | None:
+        if isinstance(field, IDENTITY_FIELDS):
+            return None
+        if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+            return None  # values_list уже вернул первичный ключ
+        return field.to_representation
+
+    def to_dict(self, row) -> dict:
+        data = dict(zip(self.names, self.values(row)))
+        for name, index, convert, with_none in self.converters:
+            value = row[index]
+            if value is not None or with_none:
+                data[name] = convert(value)
+        return data
+
+
+class FastListMixin:
+    """
+    Быстрый путь для GET-списка: values_list() вместо моделей, RowFormat
+    вместо сериализатора и render_json вместо JSONRenderer.
+
+    Поля берутся из сериализатора списка; вычисляемые поля описываются в
+    fast_list_overrides: {имя: (lookup для values_list, функция от значения)}.
+    Ответ совпадает с обычным побайтно; запросы с ?indent= и другие форматы
+    идут обычным путем.
+    """
+
+    fast_list_overrides: dict[str, tuple[str, Callable]] = {}
+    _row_formats: dict[tuple[type, type], RowFormat] = {}
+
+    def get_row_format(self) -> RowFormat:
+        key = (type(self), self.get_serializer_class())
+        row_format = self._row_formats.get(key)
+        if row_format is None:
+            row_format = RowFormat(key[1], self.fast_list_overrides)
+            self._row_formats[key] = row_format
+        return row_format
+
+    def use_fast_list(self, request) -> bool:
+        return (
+            isinstance(request.accepted_renderer, JSONRenderer)
+            and "indent" not in (request.accepted_media_type or "")
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_list(request):
+            return super().list(request, *args, **kwargs)
+
+        row_format = self.get_row_format()
+        queryset = self.filter_queryset(self.get_queryset())
+        lookups = list(row_format.lookups)
+        # Пагинатору нужны поля сортировки последней строки.
+        for field in queryset.query.order_by:
+            if isinstance(field, str) and field.lstrip("-") not in lookups:
+                lookups.append(field.lstrip("-"))
+        if "id" not in lookups:
+            lookups.append("id")
+        rows = queryset.values_list(*lookups, named=True)
+
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            data = self.get_paginated_response([row_format.to_dict(row) for row in page]).data
+        else:
+            data = [row_format.to_dict(row) for row in rows]
+        return HttpResponse(render_json(data), content_type=JSONRenderer.media_type)
@@ -0,0 +1,80 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+# Диапазон INTEGER в SQLite: большее число драйвер не передаст в запрос
+# (OverflowError вместо ответа 400).
+MIN_INT = -(2**63)
+MAX_INT = 2**63 - 1
+
+
+def sqlite_int(raw) -> int:
+    """int(raw) в пределах INTEGER SQLite, иначе ValueError."""
+
+    value = int(raw)
+    if not MIN_INT <= value <= MAX_INT:
+        raise ValueError(f"{raw!r} вне диапазона INTEGER")
+    return value
+
+
+PARSE_ERRORS = {
+    sqlite_int: "Ожидается целое число.",
+    float: "Ожидается число.",
+}
+
+
+class InSubquery:
+    """
+    Разбор параметра в подзапрос для lookup "id__in" вместо JOIN по связи:
+
+        "workshop_id": ("id__in", InSubquery(ProductWorkshop.objects, "workshop_id", "product_id"))
+
+    дает WHERE id IN (SELECT product_id ... WHERE workshop_id = ?). Список
+    id строится один раз по индексу связующей таблицы, и план не зависит от
+    того, в каком порядке SQLite решит обходить JOIN после ANALYZE.
+    """
+
+    def __init__(self, manager, lookup: str, field: str, parse=sqlite_int):
+        self.manager = manager
+        self.lookup = lookup
+        self.field = field
+        self.parse = parse
+
+    def __call__(self, raw):
+        return self.manager.filter(**{self.lookup: self.parse(raw)}).values(self.field)
+
+
+class QueryParamFilter(BaseFilterBackend):
+    """
+    Фильтры списков по параметрам запроса.
+
+    Представление описывает их в filter_params: {параметр: (lookup ORM, тип)},
+    например {"min_price": ("min_partner_price__gte", float)}; целые параметры
+    разбирает sqlite_int. Неуказанные параметры не фильтруют, некорректные
+    значения дают ошибку 400.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        filter_params = getattr(view, "filter_params", None)
+        if not filter_params:
+            return queryset
+        lookups = parse_filter_params(request.query_params, filter_params)
+        return queryset.filter(**lookups) if lookups else queryset
+
+
+def parse_filter_params(query_params, filter_params) -> dict:
+    """Аргументы для queryset.filter() по filter_params или ValidationError."""
+
+    lookups = {}
+    errors = {}
+    for param, (lookup, parse) in filter_params.items():
+        raw = query_params.get(param)
+        if raw is None or raw == "":
+            continue
+        try:
+            lookups[lookup] = parse(raw)
+        except (TypeError, ValueError):
+            parse = getattr(parse, "parse", parse)
+            errors[param] = PARSE_ERRORS.get(parse, "Некорректное значение.")
+    if errors:
+        raise ValidationError(errors)
+    return lookups
@@ -0,0 +1,121 @@
+import base64
+import binascii
+import json
+from functools import reduce
+from operator import or_
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Курсорная (keyset) пагинация по полям order_by запроса и id.
+
+    Включается параметром page_size или cursor; без них список отдается
+    целиком, как раньше. Курсор хранит значения полей сортировки последней
+    строки страницы, поэтому следующая страница выбирается условием
+    "после этих значений" и стоит столько же, сколько первая (при наличии
+    индекса по полям сортировки). Поля сортировки должны быть NOT NULL.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset)
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(self.keyset_filter(cursor))
+
+        rows = list(queryset.order_by(*self.ordering)[: self.page_size + 1])
+        page = rows[: self.page_size]
+        self.next_cursor = (
+            self.encode_cursor(self.row_position(page[-1]))
+            if len(rows) > self.page_size
+            else None
+        )
+        return page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_page_size(self, request) -> int:
+        default = api_settings.PAGE_SIZE or 100
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, default))
+        except (TypeError, ValueError):
+            return default
+        if page_size <= 0:
+            return default
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset) -> list[str]:
+        ordering = [field for field in queryset.query.order_by if isinstance(field, str)]
+        if not any(field.lstrip("-") in {"pk", "id"} for field in ordering):
+            ordering.append("id")
+        return ordering
+
+    def keyset_filter(self, cursor: list) -> Q:
+        if len(cursor) != len(self.ordering):
+            raise NotFound("Некорректный курсор.")
+
+        # (a, b, pk) > (va, vb, vpk) раскрывается в
+        # a >= va AND (a > va OR a = va AND b > vb OR a = va AND b = vb AND pk > vpk);
+        # условие a >= va позволяет SQLite начать просмотр индекса с нужного места.
+        branches = []
+        equal = Q()
+        for field, value in zip(self.ordering, cursor):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            branches.append(equal & Q(**{f"{name}__{lookup}": value}))
+            equal &= Q(**{name: value})
+
+        first = self.ordering[0]
+        first_lookup = "lte" if first.startswith("-") else "gte"
+        leading = Q(**{f"{first.lstrip('-')}__{first_lookup}": cursor[0]})
+        return leading & reduce(or_, branches)
+
+    def row_position(self, row) -> list:
+        position = []
+        for field in self.ordering:
+            value = row
+            for attr in field.lstrip("-").split("__"):
+                value = value.get(attr) if isinstance(value, dict) else getattr(value, attr)
+            position.append(value)
+        return position
+
+    def encode_cursor(self, position: list) -> str:
+        raw = json.dumps(position, ensure_ascii=False, default=str).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    def decode_cursor(self, request) -> list | None:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+        except (binascii.Error, UnicodeError, ValueError):
+            raise NotFound("Некорректный курсор.")
+        if not isinstance(position, list):
+            raise NotFound("Некорректный курсор.")
+        return position
+
+    def get_next_link(self) -> str | None:
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
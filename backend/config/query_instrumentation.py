@@ -0,0 +1,144 @@
+import logging
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("config.queries")
+
+_PLACEHOLDER_LIST = re.compile(r"(%s|\?)(\s*,\s*(%s|\?))+")
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(\.\d+)?\b")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """Текст запроса без литералов и с одним плейсхолдером вместо списка IN (...)."""
+
+    sql = _STRING_LITERAL.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _PLACEHOLDER_LIST.sub("?, ...", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+class QueryRecord(NamedTuple):
+    alias: str
+    sql: str
+    params: object
+    many: bool
+    duration: float
+
+
+class QueryRecorder:
+    """Обертка execute_wrapper: запоминает каждый запрос и время его выполнения."""
+
+    def __init__(self) -> None:
+        self.queries: list[QueryRecord] = []
+
+    def wrapper(self, alias: str):
+        def record(execute, sql, params, many, context):
+            started = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                self.queries.append(
+                    QueryRecord(alias, sql, params, many, time.perf_counter() - started)
+                )
+
+        return record
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_time(self) -> float:
+        return sum(query.duration for query in self.queries)
+
+    def repeated(self, threshold: int = 2) -> list[tuple[str, int]]:
+        """Отпечатки запросов, выполненных не меньше threshold раз (признак N+1)."""
+
+        counts = Counter(fingerprint(query.sql) for query in self.queries)
+        return [(sql, count) for sql, count in counts.most_common() if count >= threshold]
+
+    def slow(self, threshold_seconds: float) -> list[QueryRecord]:
+        return [query for query in self.queries if query.duration >= threshold_seconds]
+
+
+@contextmanager
+def record_queries() -> Iterator[QueryRecorder]:
+    """Записывать запросы во все настроенные базы в текущем потоке."""
+
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for alias in connections:
+            stack.enter_context(
+                connections[alias].execute_wrapper(recorder.wrapper(alias))
+            )
+        yield recorder
+
+
+def explain_query_plan(query: QueryRecord) -> list[str]:
+    if query.many or not query.sql.lstrip().upper().startswith("SELECT"):
+        return []
+    with connections[query.alias].cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {query.sql}", query.params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Счетчики запросов к БД на каждый HTTP-запрос.
+
+    Добавляет заголовки X-DB-Query-Count и Server-Timing, пишет в лог
+    "config.queries" медленные запросы вместе с EXPLAIN QUERY PLAN и
+    повторяющиеся запросы (типичный N+1 из сериализаторов).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_seconds = settings.QUERY_LOG_SLOW_MS / 1000
+        self.repeat_threshold = settings.QUERY_LOG_REPEAT_THRESHOLD
+
+    def __call__(self, request):
+        with record_queries() as recorder:
+            response = self.get_response(request)
+
+        total_ms = recorder.total_time * 1000
+        response["X-DB-Query-Count"] = str(recorder.count)
+        response["Server-Timing"] = f"db;dur={total_ms:.1f}"
+
+        for query in recorder.slow(self.slow_seconds):
+            try:
+                plan = explain_query_plan(query)
+            except Exception:  # план нужен только для лога
+                plan = []
+            logger.warning(
+                "Медленный запрос %.1f мс на %s %s: %s\n%s",
+                query.duration * 1000,
+                request.method,
+                request.path,
+                query.sql,
+                "\n".join(plan),
+            )
+        for sql, count in recorder.repeated(self.repeat_threshold):
+            logger.warning(
+                "Запрос повторен %d раз на %s %s (возможен N+1): %s",
+                count,
+                request.method,
+                request.path,
+                sql,
+            )
+        logger.info(
+            "%s %s: %d запросов, %.1f мс",
+            request.method,
+            request.path,
+            recorder.count,
+            total_ms,
+        )
+        return response
@@ -0,0 +1,117 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+
+
+class ResponseCache:
+    """
+    Готовые тела ответов GET в кэше Django (settings.RESPONSE_CACHE_ALIAS).
+
+    Ключ — ETag ответа (config.conditional): в него входят URL с параметрами,
+    формат ответа и версии всех таблиц, от которых зависит ответ. Поэтому
+    отдельно сбрасывать кэш не нужно: любая запись в эти таблицы (через API,
+    админку или import.py) меняет версию в table_version, и старые записи
+    просто перестают запрашиваться и истекают по RESPONSE_CACHE_TIMEOUT.
+    Счетчики попаданий ведутся на процесс.
+    """
+
+    key_prefix = "response"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.RESPONSE_CACHE_TIMEOUT > 0
+
+    @property
+    def backend(self):
+        return caches[settings.RESPONSE_CACHE_ALIAS]
+
+    def make_key(self, etag: str) -> str:
+        digest = etag.strip('"')
+        return f"{self.key_prefix}:{digest}"
+
+    def get(self, etag: str) -> HttpResponse | None:
+        if not self.enabled:
+            return None
+        return self._response(self.backend.get(self.make_key(etag)))
+
+    async def aget(self, etag: str) -> HttpResponse | None:
+        """get() для асинхронных представлений."""
+
+        if not self.enabled:
+            return None
+        backend = self.backend
+        # Кэш в памяти процесса не блокирует цикл событий, а aget() других
+        # бэкендов по умолчанию уходит в поток через sync_to_async.
+        if isinstance(backend, LocMemCache):
+            cached = backend.get(self.make_key(etag))
+        else:
+            cached = await backend.aget(self.make_key(etag))
+        return self._response(cached)
+
+    def _response(self, cached) -> HttpResponse | None:
+        with self._lock:
+            if cached is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if cached is None:
+            return None
+        content, content_type = cached
+        return HttpResponse(content, content_type=content_type)
+
+    def store(self, etag: str, response) -> None:
+        """Сохранить ответ, когда DRF отрендерит его тело."""
+
+        if not self.enabled or response.status_code != 200:
+            return
+
+        def save(rendered):
+            self.backend.set(
+                self.make_key(etag),
+                (rendered.content, rendered["Content-Type"]),
+                settings.RESPONSE_CACHE_TIMEOUT,
+            )
+
+        if getattr(response, "is_rendered", True):
+            save(response)
+        else:
+            response.add_post_render_callback(save)
+
+    async def astore(self, etag: str, response: HttpResponse) -> None:
+        """store() для уже готового ответа асинхронного представления."""
+
+        if not self.enabled or response.status_code != 200:
+            return
+        key = self.make_key(etag)
+        value = (response.content, response["Content-Type"])
+        backend = self.backend
+        if isinstance(backend, LocMemCache):
+            backend.set(key, value, settings.RESPONSE_CACHE_TIMEOUT)
+        else:
+            await backend.aset(key, value, settings.RESPONSE_CACHE_TIMEOUT)
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / total, 4) if total else 0.0,
+        }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+
+response_cache = ResponseCache()
@@ -1,6 +1,8 @@
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 PROJECT_ROOT = BASE_DIR.parent
 
@@ -18,10 +20,15 @@ INSTALLED_APPS = [
     "django.contrib.messages",
     "django.contrib.staticfiles",
     "rest_framework",
+    # Первым из проектных: PRAGMA SQLite (config.sqlite) не зависят от
+    # состава приложений.
+    "config",
     "products",
     "company_partners",
     "company_warehouse",
     "company_staff",
+    "search",
+    "changefeed",
 ]
 
 MIDDLEWARE = [
@@ -34,6 +41,57 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Журнал запросов к БД по каждому HTTP-запросу (config.query_instrumentation).
+QUERY_LOG = os.environ.get("DJANGO_QUERY_LOG", "false").lower() == "true"
+QUERY_LOG_SLOW_MS = float(os.environ.get("DJANGO_QUERY_LOG_SLOW_MS", "100"))
+QUERY_LOG_REPEAT_THRESHOLD = int(os.environ.get("DJANGO_QUERY_LOG_REPEATS", "5"))
+if QUERY_LOG:
+    MIDDLEWARE.insert(0, "config.query_instrumentation.QueryInstrumentationMiddleware")
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "config.queries": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
+
+# Как часто (в секундах) кэш справочников сверяет версии таблиц с базой.
+REFERENCE_CACHE_CHECK_SECONDS = float(
+    os.environ.get("DJANGO_REFERENCE_CACHE_CHECK_SECONDS", "1")
+)
+
+# Бюджеты запросов для manage.py check_query_budgets: путь -> максимум запросов.
+# {product_id} подставляется id первой продукции. Каждому эндпоинту с ETag
+# (config.conditional) нужен еще один запрос на чтение версий таблиц.
+QUERY_BUDGETS = {
+    "/api/products": 2,
+    "/api/products/{product_id}": 4,
+    "/api/products/{product_id}/workshops": 2,
+    "/api/product-types": 2,
+    "/api/material-types": 2,
+    "/api/workshops": 2,
+    "/api/partners": 2,
+    "/api/suppliers": 2,
+    "/api/materials": 2,
+    "/api/materials/low-stock": 3,
+    "/api/employees": 2,
+}
+
+# Индексы, которые должны использовать фильтры списков (manage.py check_query_plans).
+QUERY_PLAN_CHECKS = {
+    "/api/products?product_type_id=1": "product_type_name_idx",
+    "/api/products?material_type_id=1": "product_material_type_name_idx",
+    "/api/products?min_price=1000&max_price=2000": "product_min_partner_price_idx",
+    "/api/products?workshop_id=1": "product_workshop_workshop_idx",
+    "/api/materials?material_type_id=1": "material_type_name_idx",
+    "/api/materials?supplier_id=1": "material_supplier_id",
+    "/api/materials/low-stock": "material_low_stock_idx",
+}
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -55,6 +113,11 @@ TEMPLATES = [
 WSGI_APPLICATION = "config.wsgi.application"
 ASGI_APPLICATION = "config.asgi.application"
 
+# Под ASGI горячие GET-эндпоинты обслуживают асинхронные представления
+# (config.urls_async); потоков для чтения SQLite у них ASYNC_READ_POOL_SIZE.
+ASYNC_VIEWS = os.environ.get("DJANGO_ASYNC_VIEWS", "true").lower() == "true"
+ASYNC_READ_POOL_SIZE = int(os.environ.get("DJANGO_ASYNC_READ_POOL_SIZE", "4"))
+
 db_path_env = os.environ.get("DJANGO_DB_PATH")
 if db_path_env:
     db_path = Path(db_path_env)
@@ -63,13 +126,99 @@ if db_path_env:
 else:
     db_path = PROJECT_ROOT / "furniture.db"
 
+# Профиль SQLite: "default" — настройки SQLite по умолчанию, "production" —
+# WAL, PRAGMA из SQLITE_PRAGMAS (их выставляет config.sqlite при открытии
+# соединения), постоянные соединения и транзакции BEGIN IMMEDIATE.
+DB_PROFILE = os.environ.get("DJANGO_DB_PROFILE", "default")
+if DB_PROFILE not in ("default", "production"):
+    raise ImproperlyConfigured(
+        f"DJANGO_DB_PROFILE: ожидается default или production, получено {DB_PROFILE!r}."
+    )
+
+SQLITE_PRAGMAS: dict[str, str | int] = {}
+if DB_PROFILE == "production":
+    SQLITE_PRAGMAS = {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": int(os.environ.get("DJANGO_SQLITE_MMAP_MB", "256")) * 1024 * 1024,
+        # Отрицательное значение cache_size — размер в КиБ, а не в страницах.
+        "cache_size": -int(os.environ.get("DJANGO_SQLITE_CACHE_KB", "65536")),
+        "temp_store": "MEMORY",
+        "busy_timeout": int(os.environ.get("DJANGO_SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    }
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": str(db_path),
+        "CONN_MAX_AGE": int(
+            os.environ.get(
+                "DJANGO_CONN_MAX_AGE", "600" if DB_PROFILE == "production" else "0"
+            )
+        ),
+        "CONN_HEALTH_CHECKS": DB_PROFILE == "production",
+    }
+}
+if DB_PROFILE == "production":
+    # Транзакция сразу берет блокировку на запись и ждет ее busy_timeout;
+    # при отложенной (DEFERRED) попытка перейти от чтения к записи падает
+    # с "database is locked" без ожидания.
+    DATABASES["default"]["OPTIONS"] = {"transaction_mode": "IMMEDIATE"}
+
+# Второе соединение с тем же файлом только для чтения (mode=ro, query_only):
+# через него читают GET/HEAD/OPTIONS (config.db_routing). Вместе с профилем
+# production читатели в WAL не ждут писателя и не берут блокировок записи.
+DB_READONLY = os.environ.get("DJANGO_DB_READONLY", "false").lower() == "true"
+if DB_READONLY:
+    DATABASES["readonly"] = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": f"{db_path.as_uri()}?mode=ro",
+        "OPTIONS": {"uri": True},
+        "CONN_MAX_AGE": DATABASES["default"]["CONN_MAX_AGE"],
+        "CONN_HEALTH_CHECKS": DATABASES["default"]["CONN_HEALTH_CHECKS"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_ROUTERS = ["config.db_routing.ReadOnlyRouter"]
+    MIDDLEWARE.append("config.db_routing.ReadOnlyDatabaseMiddleware")
+
+# Кэш Django; для нескольких процессов сервера можно указать общий файловый
+# кэш: DJANGO_CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+# и DJANGO_CACHE_LOCATION=<папка>.
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.environ.get("DJANGO_CACHE_LOCATION", "comfort"),
     }
 }
 
+# Кэш готовых ответов GET (config.response_cache); 0 — выключен.
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = int(os.environ.get("DJANGO_RESPONSE_CACHE_TIMEOUT", "300"))
+
+# Размер пачки строк для потоковых выгрузок (?format=csv|ndjson|xlsx).
+EXPORT_CHUNK_SIZE = int(os.environ.get("DJANGO_EXPORT_CHUNK_SIZE", "2000"))
+
+# Наибольшее число позиций в одном запросе POST /api/products/bulk.
+PRODUCT_BULK_MAX_ITEMS = int(os.environ.get("DJANGO_PRODUCT_BULK_MAX_ITEMS", "1000"))
+
+# Наибольшее число строк заказа в POST /api/production/schedule.
+SCHEDULE_MAX_LINES = int(os.environ.get("DJANGO_SCHEDULE_MAX_LINES", "100000"))
+
+# Сколько записей журнала нехватки материалов (/api/materials/low-stock?since=)
+# оставляет manage.py compact_low_stock.
+LOW_STOCK_LOG_MAX_ROWS = int(os.environ.get("DJANGO_LOW_STOCK_LOG_MAX_ROWS", "100000"))
+
+# Журнал изменений (/api/changes): размер страницы, опрос, длительность и
+# число потоков SSE на процесс, хранение для manage.py compact_changes.
+CHANGEFEED_PAGE_SIZE = int(os.environ.get("DJANGO_CHANGEFEED_PAGE_SIZE", "1000"))
+CHANGEFEED_POLL_SECONDS = float(os.environ.get("DJANGO_CHANGEFEED_POLL_SECONDS", "1"))
+CHANGEFEED_STREAM_SECONDS = float(os.environ.get("DJANGO_CHANGEFEED_STREAM_SECONDS", "60"))
+CHANGEFEED_MAX_STREAMS = int(os.environ.get("DJANGO_CHANGEFEED_MAX_STREAMS", "200"))
+CHANGEFEED_RETENTION_DAYS = float(os.environ.get("DJANGO_CHANGEFEED_RETENTION_DAYS", "7"))
+CHANGEFEED_MAX_ROWS = int(os.environ.get("DJANGO_CHANGEFEED_MAX_ROWS", "100000"))
+
 AUTH_PASSWORD_VALIDATORS: list[dict] = []
 
 LANGUAGE_CODE = "ru-ru"
@@ -89,4 +238,8 @@ REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": [
         "rest_framework.renderers.JSONRenderer",
     ],
+    "DEFAULT_FILTER_BACKENDS": ["config.filters.QueryParamFilter"],
+    # Пагинация включается только параметрами cursor/page_size.
+    "DEFAULT_PAGINATION_CLASS": "config.pagination.KeysetPagination",
+    "PAGE_SIZE": 100,
 }
@@ -0,0 +1,33 @@
+from django.conf import settings
+
+from .db_routing import READ_ONLY_ALIAS
+
+
+def connection_pragmas(read_only: bool = False) -> dict[str, str | int]:
+    """
+    PRAGMA для нового соединения: settings.SQLITE_PRAGMAS (профиль
+    DJANGO_DB_PROFILE=production). Соединению только для чтения дополнительно
+    ставится query_only, а journal_mode не меняется: его задает default.
+    """
+
+    pragmas = dict(settings.SQLITE_PRAGMAS)
+    if read_only:
+        pragmas.pop("journal_mode", None)
+        pragmas["query_only"] = 1
+    return pragmas
+
+
+def apply_pragmas(sender, connection, **kwargs) -> None:
+    """
+    Обработчик connection_created: выставляет соединению SQLite PRAGMA из
+    connection_pragmas().
+
+    PRAGMA выполняются напрямую через соединение DB-API, чтобы не попадать
+    в журнал запросов и бюджеты (config.query_instrumentation).
+    """
+
+    if connection.vendor != "sqlite":
+        return
+    pragmas = connection_pragmas(read_only=connection.alias == READ_ONLY_ALIAS)
+    for name, value in pragmas.items():
+        connection.connection.execute(f"PRAGMA {name} = {value}")
@@ -0,0 +1,57 @@
+from typing import NamedTuple
+
+from .async_db import read_pool
+from .db_routing import read_connection
+
+
+# Последние прочитанные в процессе версии: по ним кэши узнают об изменениях,
+# не дожидаясь своей проверки по таймеру.
+_last_seen: dict[str, int] = {}
+
+
+class TableVersion(NamedTuple):
+    version: int
+    updated_at: int | None  # unix-время последнего изменения, секунды
+
+
+def _versions_sql(tables: list[str]) -> str:
+    placeholders = ", ".join(["%s"] * len(tables))
+    return (
+        "SELECT table_name, version, updated_at FROM table_version "
+        f"WHERE table_name IN ({placeholders})"
+    )
+
+
+def _collect_versions(tables: list[str], rows) -> dict[str, TableVersion]:
+    found = {name: TableVersion(version, updated_at) for name, version, updated_at in rows}
+    for table, current in found.items():
+        if current.version > _last_seen.get(table, -1):
+            _last_seen[table] = current.version
+    return {table: found.get(table, TableVersion(0, None)) for table in tables}
+
+
+def read_table_versions(tables) -> dict[str, TableVersion]:
+    """
+    Версии таблиц из table_version (ее ведут триггеры SQLite).
+
+    Для таблиц без записи в table_version возвращается версия 0.
+    """
+
+    tables = list(tables)
+    with read_connection().cursor() as cursor:
+        cursor.execute(_versions_sql(tables), tables)
+        return _collect_versions(tables, cursor.fetchall())
+
+
+async def aread_table_versions(tables) -> dict[str, TableVersion]:
+    """Асинхронный read_table_versions через пул config.async_db."""
+
+    tables = list(tables)
+    rows = await read_pool.fetchall(_versions_sql(tables), tables)
+    return _collect_versions(tables, rows)
+
+
+def last_seen_version(table: str) -> int:
+    """Наибольшая версия таблицы, которую этот процесс уже видел в БД."""
+
+    return _last_seen.get(table, 0)
@@ -0,0 +1,33 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from .query_instrumentation import QueryRecorder, record_queries
+
+
+@contextmanager
+def query_budget(
+    max_queries: int,
+    max_repeats: int | None = None,
+) -> Iterator[QueryRecorder]:
+    """
+    Проверить, что блок укладывается в бюджет запросов к БД.
+
+    max_repeats ограничивает число выполнений одного и того же запроса
+    (по отпечатку без литералов), чтобы N+1 ловился и на маленьких данных.
+
+        with query_budget(1, max_repeats=1):
+            client.get("/api/materials")
+    """
+
+    with record_queries() as recorder:
+        yield recorder
+
+    problems = []
+    if recorder.count > max_queries:
+        problems.append(f"запросов {recorder.count}, бюджет {max_queries}")
+    if max_repeats is not None:
+        for sql, count in recorder.repeated(max_repeats + 1):
+            problems.append(f"запрос выполнен {count} раз (допустимо {max_repeats}): {sql}")
+    if problems:
+        queries = "\n".join(f"  {query.sql}" for query in recorder.queries)
+        raise AssertionError("\n".join(problems) + "\nЗапросы:\n" + queries)
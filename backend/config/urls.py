@@ -7,4 +7,6 @@ urlpatterns = [
     path("", include("company_partners.urls")),
     path("", include("company_warehouse.urls")),
     path("", include("company_staff.urls")),
+    path("", include("search.urls")),
+    path("", include("changefeed.urls")),
 ]
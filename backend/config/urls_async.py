@@ -0,0 +1,10 @@
+from django.urls import include, path
+
+from .urls import urlpatterns as sync_urlpatterns
+
+# URL для ASGI (config.asgi): асинхронные версии горячих эндпоинтов
+# перекрывают синхронные, остальное — как в config.urls.
+urlpatterns = [
+    path("", include("products.async_urls")),
+    *sync_urlpatterns,
+]
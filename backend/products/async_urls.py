@@ -0,0 +1,27 @@
+from django.urls import path
+
+from . import async_views
+
+# Те же пути и имена, что в urls.py; подключаются первыми в config.urls_async.
+urlpatterns = [
+    path(
+        "api/raw-material/calculate",
+        async_views.raw_material_calculate,
+        name="raw-material-calc",
+    ),
+    path(
+        "api/raw-material/calculate/batch",
+        async_views.raw_material_calculate_batch,
+        name="raw-material-calc-batch",
+    ),
+    path("api/product-types", async_views.product_type_list, name="product-type-list"),
+    path("api/material-types", async_views.material_type_list, name="material-type-list"),
+    path("api/products", async_views.product_list, name="product-list"),
+    path("api/products/<int:pk>", async_views.product_detail, name="product-detail"),
+    path(
+        "api/products/<int:pk>/workshops",
+        async_views.product_workshops,
+        name="product-workshops",
+    ),
+    path("api/workshops", async_views.workshop_list, name="workshop-list"),
+]
@@ -0,0 +1,118 @@
+"""
+Асинхронные версии горячих эндпоинтов продукции для ASGI (config.urls_async).
+
+Чтение идет через config.async_db.read_pool, ответы совпадают с
+синхронными представлениями из views.py; все, что асинхронный путь не
+обрабатывает (запись, пагинация, другие форматы), передается им.
+"""
+
+import asyncio
+
+from django.conf import settings
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import NotFound
+
+from config.async_db import read_pool
+from config.async_views import (
+    allow_header,
+    async_list_view,
+    delegate,
+    is_plain_json_get,
+    json_body,
+    json_response,
+)
+from config.conditional import aconditional_get
+from config.fast_list import RowFormat
+from raw_material_calculation import (
+    calculate_raw_material_amount,
+    calculate_raw_material_amounts,
+)
+
+from . import views
+from .models import ProductWorkshop
+from .serializers import ProductListSerializer, WorkshopTimeSerializer
+
+product_list = async_list_view(views.ProductListCreateView, ProductListSerializer)
+product_type_list = async_list_view(views.ProductTypeListView)
+material_type_list = async_list_view(views.MaterialTypeListView)
+workshop_list = async_list_view(views.WorkshopListCreateView)
+product_workshops = async_list_view(views.ProductWorkshopsView)
+
+_product_row = RowFormat(
+    ProductListSerializer, views.ProductListCreateView.fast_list_overrides
+)
+_workshop_row = RowFormat(WorkshopTimeSerializer, {})
+_product_detail_sync = delegate(views.ProductRetrieveUpdateDestroyView.as_view())
+_product_detail_allow = allow_header(views.ProductRetrieveUpdateDestroyView)
+
+
+@csrf_exempt
+async def product_detail(request, pk: int):
+    if not is_plain_json_get(request):
+        return await _product_detail_sync(request, pk=pk)
+
+    async def handler():
+        # Маршрут выбирается тем же запросом без сортировки, что и
+        # prefetch_related в синхронном представлении, и в том же порядке.
+        products, steps = await asyncio.gather(
+            read_pool.values_list(
+                views._base_queryset().filter(pk=pk), *_product_row.lookups
+            ),
+            read_pool.values_list(
+                ProductWorkshop.objects.filter(product_id=pk), *_workshop_row.lookups
+            ),
+        )
+        if not products:
+            detail = {"detail": str(NotFound.default_detail)}
+            return json_response(detail, status=404)
+        data = _product_row.to_dict(products[0])
+        data["workshops"] = [_workshop_row.to_dict(step) for step in steps]
+        return json_response(data)
+
+    response = await aconditional_get(
+        request, views.ProductRetrieveUpdateDestroyView.version_tables, handler
+    )
+    response["Allow"] = _product_detail_allow
+    return response
+
+
+_calculate_sync = delegate(views.raw_material_calculate)
+_calculate_batch_sync = delegate(views.raw_material_calculate_batch)
+# У функций с @api_view DRF-представление лежит в атрибуте cls.
+_calculate_allow = allow_header(views.raw_material_calculate.cls)
+
+
+@csrf_exempt
+async def raw_material_calculate(request):
+    data = json_body(request) if request.method == "POST" else None
+    if data is None:
+        return await _calculate_sync(request)
+    data = data if isinstance(data, dict) else {}
+    # Справочники читаются из SQLite, поэтому расчет идет в потоке пула.
+    amount = await read_pool.run(
+        calculate_raw_material_amount,
+        data.get("product_type_id"),
+        data.get("material_type_id"),
+        data.get("product_quantity"),
+        data.get("parameter_one"),
+        data.get("parameter_two"),
+        settings.DATABASES["default"]["NAME"],
+    )
+    response = json_response({"raw_material_amount": amount})
+    response["Allow"] = _calculate_allow
+    return response
+
+
+@csrf_exempt
+async def raw_material_calculate_batch(request):
+    data = json_body(request) if request.method == "POST" else None
+    lines = data.get("lines") if isinstance(data, dict) else data
+    if not isinstance(lines, list):
+        # В том числе ошибка формата: ее ответ формирует DRF.
+        return await _calculate_batch_sync(request)
+    amounts = await read_pool.run(
+        calculate_raw_material_amounts, lines, settings.DATABASES["default"]["NAME"]
+    )
+    response = json_response({"raw_material_amounts": amounts})
+    response["Allow"] = _calculate_allow
+    return response
@@ -0,0 +1,192 @@
+"""
+Пакетное создание, изменение и удаление продукции (POST /api/products/bulk).
+
+Позиции проверяются сериализатором без обращений к БД (типы берутся из
+reference_cache), существование id и уникальность наименований — одним
+запросом на весь пакет. Если хотя бы одна позиция с ошибкой, ничего не
+записывается, а ответ содержит ошибки по позициям; иначе удаление,
+изменение и создание выполняются в одной транзакции.
+"""
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.fields import empty
+from rest_framework.settings import api_settings
+
+from config.filters import MAX_INT
+
+from .models import Product, ProductWorkshop
+from .serializers import (
+    ProductBulkItemSerializer,
+    is_foreign_key_error,
+    product_reference_errors,
+)
+
+OPERATIONS = ("create", "update", "delete")
+
+DUPLICATE_NAME = (
+    "Продукт с таким наименованием уже существует. Введите другое наименование."
+)
+REFERENCE_CONFLICT = "Связанные данные изменились во время записи. Повторите запрос."
+REPEATED_NAME = "Наименование повторяется в пакете."
+REPEATED_ID = "Продукция указана в пакете несколько раз."
+NOT_FOUND = "Продукция не найдена."
+
+_id_field = serializers.IntegerField(min_value=1, max_value=MAX_INT)
+
+
+def _validate_id(value):
+    """Пара (id, None) или (None, ошибки проверки)."""
+
+    try:
+        return _id_field.run_validation(value), None
+    except ValidationError as exc:
+        return None, exc.detail
+
+
+def _parse(data) -> dict[str, list]:
+    if not isinstance(data, dict):
+        message = "Ожидается объект с ключами create, update, delete."
+        raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]})
+    parsed = {}
+    for operation in OPERATIONS:
+        items = data.get(operation, [])
+        if not isinstance(items, list):
+            raise ValidationError({operation: ["Ожидается список."]})
+        parsed[operation] = items
+
+    limit = settings.PRODUCT_BULK_MAX_ITEMS
+    if sum(len(items) for items in parsed.values()) > limit:
+        message = f"В пакете может быть не больше {limit} позиций."
+        raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]})
+    return parsed
+
+
+def apply_product_bulk(data) -> dict[str, list[int]]:
+    """
+    Выполнить пакет {"create": [...], "update": [...], "delete": [id, ...]}.
+
+    В create — те же поля, что у POST /api/products, в update — id и
+    изменяемые поля (как у PATCH). Возвращает id созданной, измененной и
+    удаленной продукции в порядке позиций; при ошибках бросает
+    ValidationError со списками ошибок по позициям ({} — позиция без ошибок).
+    """
+
+    parsed = _parse(data)
+    errors = {operation: [{} for _ in parsed[operation]] for operation in OPERATIONS}
+
+    # Проверка каждой позиции отдельно, без запросов к БД.
+    creates = []  # (номер позиции, validated_data)
+    for index, item in enumerate(parsed["create"]):
+        serializer = ProductBulkItemSerializer(data=item)
+        if serializer.is_valid():
+            creates.append((index, serializer.validated_data))
+        else:
+            errors["create"][index] = dict(serializer.errors)
+
+    updates = []  # (номер позиции, id, validated_data)
+    for index, item in enumerate(parsed["update"]):
+        serializer = ProductBulkItemSerializer(data=item, partial=True)
+        item_errors = {} if serializer.is_valid() else dict(serializer.errors)
+        pk, id_errors = _validate_id(item.get("id", empty) if isinstance(item, dict) else empty)
+        if id_errors:
+            item_errors["id"] = id_errors
+        if item_errors:
+            errors["update"][index] = item_errors
+        else:
+            updates.append((index, pk, serializer.validated_data))
+
+    deletes = []  # (номер позиции, id)
+    for index, value in enumerate(parsed["delete"]):
+        pk, id_errors = _validate_id(value)
+        if id_errors:
+            errors["delete"][index] = {"id": id_errors}
+        else:
+            deletes.append((index, pk))
+
+    # Один id — не больше одной позиции среди изменений и удалений.
+    targets = [
+        *(("update", index, pk) for index, pk, _ in updates),
+        *(("delete", index, pk) for index, pk in deletes),
+    ]
+    existing_ids = set(
+        Product.objects.filter(id__in={pk for *_, pk in targets}).values_list("id", flat=True)
+    )
+    seen_ids = set()
+    for operation, index, pk in targets:
+        if pk in seen_ids:
+            errors[operation][index].setdefault("id", []).append(REPEATED_ID)
+        elif pk not in existing_ids:
+            errors[operation][index].setdefault("id", []).append(NOT_FOUND)
+        seen_ids.add(pk)
+
+    # Наименования: без повторов внутри пакета и не занятые другой продукцией.
+    # Наименование удаляемой в этом же пакете продукции можно использовать.
+    delete_ids = {pk for _, pk in deletes}
+    named = [
+        *(("create", index, None, values["name"]) for index, values in creates),
+        *(
+            ("update", index, pk, values["name"])
+            for index, pk, values in updates
+            if "name" in values
+        ),
+    ]
+    owners = dict(
+        Product.objects.filter(name__in={name for *_, name in named}).values_list("name", "id")
+    )
+    seen_names = set()
+    for operation, index, pk, name in named:
+        owner = owners.get(name)
+        if name in seen_names:
+            errors[operation][index].setdefault("name", []).append(REPEATED_NAME)
+        elif owner is not None and owner != pk and owner not in delete_ids:
+            errors[operation][index].setdefault("name", []).append(DUPLICATE_NAME)
+        seen_names.add(name)
+
+    if any(any(item_errors) for item_errors in errors.values()):
+        raise ValidationError(
+            {operation: errors[operation] for operation in OPERATIONS if any(errors[operation])}
+        )
+
+    # Изменения группируются по набору полей: bulk_update пишет одни и те же
+    # поля для всех объектов, а непереданные поля должны остаться прежними.
+    update_groups: dict[tuple[str, ...], list[Product]] = {}
+    for _, pk, values in updates:
+        fields = tuple(sorted(values))
+        update_groups.setdefault(fields, []).append(Product(id=pk, **values))
+    created = [Product(**values) for _, values in creates]
+
+    try:
+        with transaction.atomic():
+            if delete_ids:
+                ProductWorkshop.objects.filter(product_id__in=delete_ids).delete()
+                Product.objects.filter(id__in=delete_ids).delete()
+            for fields, objects in update_groups.items():
+                if fields:
+                    Product.objects.bulk_update(objects, fields)
+            Product.objects.bulk_create(created)
+    except IntegrityError as exc:
+        if not is_foreign_key_error(exc):
+            # Наименование заняли параллельным запросом после проверки.
+            raise ValidationError({"name": DUPLICATE_NAME})
+        # Тип продукции или материала удалили после проверки по кэшу.
+        positions = [("create", index, values) for index, values in creates] + [
+            ("update", index, values) for index, _, values in updates
+        ]
+        reference_errors = product_reference_errors([values for *_, values in positions])
+        errors = {operation: [{} for _ in parsed[operation]] for operation in OPERATIONS}
+        for (operation, index, _), item_errors in zip(positions, reference_errors):
+            errors[operation][index] = item_errors
+        if not any(any(item_errors) for item_errors in errors.values()):
+            raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [REFERENCE_CONFLICT]})
+        raise ValidationError(
+            {operation: errors[operation] for operation in OPERATIONS if any(errors[operation])}
+        )
+
+    return {
+        "created": [product.id for product in created],
+        "updated": [pk for _, pk, _ in updates],
+        "deleted": [pk for _, pk in deletes],
+    }
@@ -0,0 +1,101 @@
+from collections.abc import Iterator
+
+from django.conf import settings
+from django.db.models import F, FloatField, Value
+from django.db.models.functions import Coalesce
+
+from config.exports import ExportColumn
+
+from .models import Product, ProductWorkshop
+from .serializers import rounded_hours
+
+
+def format_route(route: list[dict]) -> str:
+    """Маршрут одной строкой: "Цех: часы; Цех: часы"."""
+
+    parts = []
+    for step in route:
+        hours = step["manufacture_hours"]
+        parts.append(f"{step['workshop']}: {'' if hours is None else hours}")
+    return "; ".join(parts)
+
+
+# Первые пять колонок повторяют Products_import.xlsx, поэтому выгрузку
+# можно снова загрузить через import.py.
+PRODUCT_EXPORT_COLUMNS = [
+    ExportColumn("Тип продукции", "product_type"),
+    ExportColumn("Наименование продукции", "name"),
+    ExportColumn("Артикул", "article"),
+    ExportColumn("Минимальная стоимость для партнера", "min_partner_price"),
+    ExportColumn("Основной материал", "material_type"),
+    ExportColumn("Время изготовления, ч", "manufacture_time_hours"),
+    ExportColumn("Маршрут", "workshops", format_route),
+]
+
+
+def iter_product_records() -> Iterator[dict]:
+    """
+    Продукция с итогом часов и маршрутом по цехам, по одной записи.
+
+    Продукция и маршруты читаются двумя курсорами, упорядоченными по id
+    продукции, и сливаются на лету, поэтому в памяти одновременно только
+    текущие пачки строк (settings.EXPORT_CHUNK_SIZE), сколько бы их ни было.
+    """
+
+    chunk_size = settings.EXPORT_CHUNK_SIZE
+    products = (
+        Product.objects.order_by("id")
+        .annotate(
+            total_hours=Coalesce(
+                F("summary__total_hours"),
+                Value(0.0),
+                output_field=FloatField(),
+            )
+        )
+        .values_list(
+            "id",
+            "product_type__name",
+            "name",
+            "article",
+            "min_partner_price",
+            "material_type__name",
+            "total_hours",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+    steps = (
+        ProductWorkshop.objects.order_by("product_id", "workshop__name")
+        .values_list(
+            "product_id",
+            "workshop__name",
+            "workshop__workers_count",
+            "manufacture_hours",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+
+    step = next(steps, None)
+    for product_id, product_type, name, article, price, material_type, hours in products:
+        # Маршруты несуществующей продукции пропускаются.
+        while step is not None and step[0] < product_id:
+            step = next(steps, None)
+        route = []
+        while step is not None and step[0] == product_id:
+            route.append(
+                {
+                    "workshop": step[1],
+                    "workers_count": step[2],
+                    "manufacture_hours": step[3],
+                }
+            )
+            step = next(steps, None)
+        yield {
+            "id": product_id,
+            "product_type": product_type,
+            "name": name,
+            "article": article,
+            "min_partner_price": price,
+            "material_type": material_type,
+            "manufacture_time_hours": rounded_hours(hours),
+            "workshops": route,
+        }
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client, override_settings
+
+from config.testing import query_budget
+from products.models import Product
+
+
+class Command(BaseCommand):
+    help = (
+        "Запросить GET-эндпоинты из settings.QUERY_BUDGETS и проверить число "
+        "запросов к БД и отсутствие повторяющихся запросов (N+1)."
+    )
+
+    # Кэш ответов выключен: иначе повторный запрос не дошел бы до ORM.
+    @override_settings(RESPONSE_CACHE_TIMEOUT=0)
+    def handle(self, *args, **options):
+        product = Product.objects.order_by("id").first()
+        client = Client()
+        failures = []
+        for path, max_queries in settings.QUERY_BUDGETS.items():
+            if "{product_id}" in path:
+                if product is None:
+                    self.stdout.write(f"{path}: пропуск, нет продукции")
+                    continue
+                path = path.format(product_id=product.id)
+            # Бюджет считается для повторного запроса, когда кэши процесса
+            # (справочники и т.п.) уже прогреты первым.
+            client.get(path)
+            try:
+                with query_budget(max_queries, max_repeats=1) as recorder:
+                    response = client.get(path)
+            except AssertionError as exc:
+                failures.append(path)
+                self.stderr.write(f"{path}: {exc}")
+                continue
+            if response.status_code != 200:
+                failures.append(path)
+                self.stderr.write(f"{path}: HTTP {response.status_code}")
+                continue
+            self.stdout.write(f"{path}: {recorder.count}/{max_queries}")
+
+        if failures:
+            raise CommandError(f"Превышен бюджет запросов: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("Все эндпоинты укладываются в бюджет."))
@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import resolve
+from rest_framework.test import APIRequestFactory
+
+from products.models import ProductWorkshop
+
+
+def query_plan(queryset) -> list[str]:
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def filtered_queryset(path: str):
+    """Запрос, который list-представление выполнит для path (с фильтрами)."""
+
+    request = APIRequestFactory().get(path)
+    match = resolve(request.path_info)
+    view = match.func.view_class(**getattr(match.func, "initkwargs", {}))
+    view.setup(request, *match.args, **match.kwargs)
+    view.request = view.initialize_request(request)
+    view.format_kwarg = None
+    return view.filter_queryset(view.get_queryset())
+
+
+class Command(BaseCommand):
+    help = (
+        "Проверить по EXPLAIN QUERY PLAN, что фильтры списков из "
+        "settings.QUERY_PLAN_CHECKS используют ожидаемые индексы."
+    )
+
+    def handle(self, *args, **options):
+        checks = [
+            (path, index, filtered_queryset(path))
+            for path, index in settings.QUERY_PLAN_CHECKS.items()
+        ]
+        # Удаление цеха (WorkshopRetrieveUpdateDestroyView.perform_destroy)
+        # удаляет его строки product_workshop по workshop_id.
+        checks.append(
+            (
+                "DELETE /api/workshops/<id>",
+                "product_workshop_workshop_idx",
+                ProductWorkshop.objects.filter(workshop_id=1),
+            )
+        )
+
+        failures = []
+        for label, index, queryset in checks:
+            plan = query_plan(queryset)
+            if any(f"INDEX {index}" in step for step in plan):
+                self.stdout.write(f"{label}: {index}")
+                continue
+            failures.append(label)
+            self.stderr.write(
+                f"{label}: не используется {index}\n  " + "\n  ".join(plan)
+            )
+
+        if failures:
+            raise CommandError(f"Индексы не используются: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("Все фильтры используют индексы."))
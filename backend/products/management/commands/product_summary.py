@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from products.summary import find_product_summary_drift, rebuild_product_summary
+
+
+class Command(BaseCommand):
+    help = "Пересчитать итоги времени изготовления (product_summary) или проверить расхождения."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="только проверить расхождения, не пересчитывая",
+        )
+
+    def handle(self, *args, **options):
+        if options["check"]:
+            drift = find_product_summary_drift()
+            for product_id, hours, count, expected_hours, expected_count in drift:
+                self.stdout.write(
+                    f"product_id={product_id}: сохранено ({hours}, {count}), "
+                    f"ожидается ({expected_hours}, {expected_count})"
+                )
+            if drift:
+                raise CommandError(f"Найдено расхождений: {len(drift)}.")
+            self.stdout.write(self.style.SUCCESS("Расхождений нет."))
+            return
+
+        with transaction.atomic():
+            rebuild_product_summary()
+        self.stdout.write(self.style.SUCCESS("Итоги пересчитаны."))
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MaterialType',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('loss_percent', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'material_type',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Product',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('article', models.CharField(blank=True, max_length=255, null=True)),
+                ('min_partner_price', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'product',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductType',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('coefficient', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'product_type',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductWorkshop',
+            fields=[
+                ('id', models.BigAutoField(db_column='rowid', primary_key=True, serialize=False)),
+                ('manufacture_hours', models.FloatField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'product_workshop',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Workshop',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('workshop_type', models.CharField(blank=True, max_length=255, null=True)),
+                ('workers_count', models.IntegerField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'workshop',
+                'managed': False,
+            },
+        ),
+    ]
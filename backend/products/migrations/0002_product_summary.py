@@ -0,0 +1,99 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:48
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Та же схема создается в import.py (create_tables); таблицы продукции
+# не управляются Django, поэтому итоги ведут триггеры SQLite.
+SUMMARY_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS product_summary (
+        product_id      INTEGER PRIMARY KEY,
+        total_hours     REAL NOT NULL DEFAULT 0,
+        workshop_count  INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS product_summary_product_insert
+    AFTER INSERT ON product
+    BEGIN
+        INSERT OR IGNORE INTO product_summary (product_id) VALUES (new.id);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS product_summary_product_delete
+    AFTER DELETE ON product
+    BEGIN
+        DELETE FROM product_summary WHERE product_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS product_summary_link_insert
+    AFTER INSERT ON product_workshop
+    BEGIN
+        INSERT OR REPLACE INTO product_summary (product_id, total_hours, workshop_count)
+        SELECT new.product_id, COALESCE(SUM(manufacture_hours), 0), COUNT(*)
+        FROM product_workshop WHERE product_id = new.product_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS product_summary_link_update
+    AFTER UPDATE OF product_id, manufacture_hours ON product_workshop
+    BEGIN
+        INSERT OR REPLACE INTO product_summary (product_id, total_hours, workshop_count)
+        SELECT old.product_id, COALESCE(SUM(manufacture_hours), 0), COUNT(*)
+        FROM product_workshop WHERE product_id = old.product_id;
+        INSERT OR REPLACE INTO product_summary (product_id, total_hours, workshop_count)
+        SELECT new.product_id, COALESCE(SUM(manufacture_hours), 0), COUNT(*)
+        FROM product_workshop WHERE product_id = new.product_id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS product_summary_link_delete
+    AFTER DELETE ON product_workshop
+    BEGIN
+        INSERT OR REPLACE INTO product_summary (product_id, total_hours, workshop_count)
+        SELECT old.product_id, COALESCE(SUM(manufacture_hours), 0), COUNT(*)
+        FROM product_workshop WHERE product_id = old.product_id;
+    END
+    """,
+    "DELETE FROM product_summary",
+    """
+    INSERT INTO product_summary (product_id, total_hours, workshop_count)
+    SELECT p.id, COALESCE(SUM(pw.manufacture_hours), 0), COUNT(pw.product_id)
+    FROM product p LEFT JOIN product_workshop pw ON pw.product_id = p.id
+    GROUP BY p.id
+    """,
+]
+
+DROP_SUMMARY_SQL = [
+    "DROP TRIGGER IF EXISTS product_summary_link_delete",
+    "DROP TRIGGER IF EXISTS product_summary_link_update",
+    "DROP TRIGGER IF EXISTS product_summary_link_insert",
+    "DROP TRIGGER IF EXISTS product_summary_product_delete",
+    "DROP TRIGGER IF EXISTS product_summary_product_insert",
+    "DROP TABLE IF EXISTS product_summary",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProductSummary',
+            fields=[
+                ('product', models.OneToOneField(db_column='product_id', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='summary', serialize=False, to='products.product')),
+                ('total_hours', models.FloatField(default=0)),
+                ('workshop_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'product_summary',
+                'managed': False,
+            },
+        ),
+        migrations.RunSQL(SUMMARY_SQL, DROP_SUMMARY_SQL),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:51
+
+from django.db import migrations
+
+# Та же схема создается в import.py (create_tables): триггеры увеличивают
+# версию таблицы на каждое изменение, кэши приложения сверяются с ней.
+VERSIONED_TABLES = ("product_type", "material_type", "workshop")
+EVENTS = ("insert", "update", "delete")
+
+TABLE_VERSION_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS table_version (
+        table_name      TEXT PRIMARY KEY,
+        version         INTEGER NOT NULL DEFAULT 0,
+        updated_at      INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+    ) WITHOUT ROWID
+    """,
+]
+for _table in VERSIONED_TABLES:
+    TABLE_VERSION_SQL.append(
+        f"INSERT OR IGNORE INTO table_version (table_name) VALUES ('{_table}')"
+    )
+    for _event in EVENTS:
+        TABLE_VERSION_SQL.append(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS table_version_{_table}_{_event}
+            AFTER {_event.upper()} ON {_table}
+            BEGIN
+                UPDATE table_version
+                SET version = version + 1,
+                    updated_at = CAST(strftime('%s', 'now') AS INTEGER)
+                WHERE table_name = '{_table}';
+            END
+            """
+        )
+
+DROP_TABLE_VERSION_SQL = [
+    f"DROP TRIGGER IF EXISTS table_version_{table}_{event}"
+    for table in VERSIONED_TABLES
+    for event in EVENTS
+] + ["DROP TABLE IF EXISTS table_version"]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_product_summary'),
+    ]
+
+    operations = [
+        migrations.RunSQL(TABLE_VERSION_SQL, DROP_TABLE_VERSION_SQL),
+    ]
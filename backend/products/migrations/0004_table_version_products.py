@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 05:20
+
+from django.db import migrations
+
+# Версии продукции и маршрутов нужны для ETag списка продукции; та же
+# схема создается в import.py (create_tables).
+VERSIONED_TABLES = ("product", "product_workshop")
+EVENTS = ("insert", "update", "delete")
+
+TABLE_VERSION_SQL = []
+for _table in VERSIONED_TABLES:
+    TABLE_VERSION_SQL.append(
+        f"INSERT OR IGNORE INTO table_version (table_name) VALUES ('{_table}')"
+    )
+    for _event in EVENTS:
+        TABLE_VERSION_SQL.append(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS table_version_{_table}_{_event}
+            AFTER {_event.upper()} ON {_table}
+            BEGIN
+                UPDATE table_version
+                SET version = version + 1,
+                    updated_at = CAST(strftime('%s', 'now') AS INTEGER)
+                WHERE table_name = '{_table}';
+            END
+            """
+        )
+
+DROP_TABLE_VERSION_SQL = [
+    f"DROP TRIGGER IF EXISTS table_version_{table}_{event}"
+    for table in VERSIONED_TABLES
+    for event in EVENTS
+] + [
+    "DELETE FROM table_version WHERE table_name IN ('product', 'product_workshop')",
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0003_table_version'),
+    ]
+
+    operations = [
+        migrations.RunSQL(TABLE_VERSION_SQL, DROP_TABLE_VERSION_SQL),
+    ]
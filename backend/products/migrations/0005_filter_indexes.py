@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:40
+
+from django.db import migrations
+
+# Те же индексы создает import.py (INDEX_STATEMENTS); таблицы продукции не
+# управляются Django, поэтому индексы создаются SQL.
+INDEXES = (
+    ("product_type_name_idx", "product", "product_type_id, name"),
+    ("product_material_type_name_idx", "product", "material_type_id, name"),
+    ("product_min_partner_price_idx", "product", "min_partner_price"),
+    ("product_workshop_workshop_idx", "product_workshop", "workshop_id"),
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_table_version_products'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            [
+                f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"
+                for name, table, columns in INDEXES
+            ],
+            [f"DROP INDEX IF EXISTS {name}" for name, _, _ in INDEXES],
+        ),
+    ]
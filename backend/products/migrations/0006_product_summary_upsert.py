@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:10
+
+from django.db import migrations
+
+# Те же триггеры создает import.py (PRODUCT_SUMMARY_STATEMENTS). Внутри
+# триггера действует политика конфликтов внешней команды: под
+# INSERT ... ON CONFLICT DO UPDATE инкрементального импорта INSERT OR REPLACE
+# из 0002 падал на UNIQUE product_summary.product_id, поэтому итоги
+# пересчитываются upsert'ом.
+SUMMARY_UPSERT = """
+        INSERT INTO product_summary (product_id, total_hours, workshop_count)
+        SELECT {row}.product_id, COALESCE(SUM(manufacture_hours), 0), COUNT(*)
+        FROM product_workshop WHERE product_id = {row}.product_id
+        ON CONFLICT (product_id) DO UPDATE SET
+            total_hours = excluded.total_hours,
+            workshop_count = excluded.workshop_count;
+"""
+
+TRIGGERS = (
+    "product_summary_product_insert",
+    "product_summary_link_insert",
+    "product_summary_link_update",
+    "product_summary_link_delete",
+)
+
+SUMMARY_TRIGGERS_SQL = [f"DROP TRIGGER IF EXISTS {name}" for name in TRIGGERS] + [
+    """
+    CREATE TRIGGER product_summary_product_insert
+    AFTER INSERT ON product
+    BEGIN
+        INSERT INTO product_summary (product_id) VALUES (new.id)
+        ON CONFLICT (product_id) DO NOTHING;
+    END
+    """,
+    f"""
+    CREATE TRIGGER product_summary_link_insert
+    AFTER INSERT ON product_workshop
+    BEGIN{SUMMARY_UPSERT.format(row="new")}    END
+    """,
+    f"""
+    CREATE TRIGGER product_summary_link_update
+    AFTER UPDATE OF product_id, manufacture_hours ON product_workshop
+    BEGIN{SUMMARY_UPSERT.format(row="old")}{SUMMARY_UPSERT.format(row="new")}    END
+    """,
+    f"""
+    CREATE TRIGGER product_summary_link_delete
+    AFTER DELETE ON product_workshop
+    BEGIN{SUMMARY_UPSERT.format(row="old")}    END
+    """,
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_filter_indexes'),
+    ]
+
+    operations = [
+        # Откат не нужен: новые триггеры совместимы со схемой 0002, а откат
+        # 0002 удаляет их по имени.
+        migrations.RunSQL(SUMMARY_TRIGGERS_SQL, migrations.RunSQL.noop),
+    ]
@@ -91,3 +91,24 @@ class ProductWorkshop(models.Model):
 
     def __str__(self) -> str:
         return f"{self.product} — {self.workshop}"
+
+
+class ProductSummary(models.Model):
+    """Итоги по продукции, которые поддерживают триггеры на product_workshop."""
+
+    product = models.OneToOneField(
+        Product,
+        on_delete=models.DO_NOTHING,
+        primary_key=True,
+        db_column="product_id",
+        related_name="summary",
+    )
+    total_hours = models.FloatField(default=0)
+    workshop_count = models.IntegerField(default=0)
+
+    class Meta:
+        managed = False
+        db_table = "product_summary"
+
+    def __str__(self) -> str:
+        return f"{self.product_id}: {self.total_hours}"
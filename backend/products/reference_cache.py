@@ -0,0 +1,90 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import models
+
+from config.table_versions import last_seen_version, read_table_versions
+
+from .models import MaterialType, ProductType, Workshop
+
+REFERENCE_MODELS: dict[str, type[models.Model]] = {
+    "product_type": ProductType,
+    "material_type": MaterialType,
+    "workshop": Workshop,
+}
+
+
+class ReferenceCache:
+    """
+    Кэш маленьких справочников (типы продукции, типы материалов, цеха) на процесс.
+
+    Каждая таблица загружается целиком и хранится вместе с версией из
+    table_version. Версии перечитываются не чаще раза в check_interval
+    секунд, поэтому изменения из import.py и других процессов видны с
+    такой задержкой; записи через API этого процесса сбрасывают кэш сразу
+    (invalidate). Объекты общие для всех запросов — менять их нельзя.
+    """
+
+    def __init__(self, check_interval: float | None = None) -> None:
+        self._check_interval = check_interval
+        self._lock = threading.Lock()
+        self._tables: dict[str, tuple[int, dict[int, models.Model]]] = {}
+        self._versions: dict[str, int] = {}
+        self._checked_at: float | None = None
+
+    @property
+    def check_interval(self) -> float:
+        if self._check_interval is not None:
+            return self._check_interval
+        return settings.REFERENCE_CACHE_CHECK_SECONDS
+
+    def _current_versions(self) -> dict[str, int]:
+        now = time.monotonic()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return self._versions
+        versions = {
+            table: current.version
+            for table, current in read_table_versions(REFERENCE_MODELS).items()
+        }
+        with self._lock:
+            self._versions = versions
+            self._checked_at = now
+        return versions
+
+    def rows(self, table: str) -> dict[int, models.Model]:
+        """Все строки справочника: {id: объект}."""
+
+        # Версия, уже прочитанная другим кодом (например, для ETag ответа),
+        # не должна оказаться новее данных в кэше.
+        version = max(self._current_versions().get(table, 0), last_seen_version(table))
+        with self._lock:
+            entry = self._tables.get(table)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+
+        # Версия прочитана до загрузки, поэтому данные не старее версии;
+        # при гонке с записью кэш просто перечитается еще раз.
+        loaded = {obj.pk: obj for obj in REFERENCE_MODELS[table].objects.all()}
+        with self._lock:
+            self._tables[table] = (version, loaded)
+        return loaded
+
+    def get(self, table: str, pk) -> models.Model | None:
+        return self.rows(table).get(pk)
+
+    def name(self, table: str, pk, default: str = "—") -> str:
+        obj = self.get(table, pk)
+        return obj.name if obj is not None else default
+
+    def invalidate(self, *tables: str) -> None:
+        """Сбросить справочники (все, если таблицы не указаны) после записи."""
+
+        with self._lock:
+            for table in tables or list(self._tables):
+                self._tables.pop(table, None)
+            self._checked_at = None
+
+
+reference_cache = ReferenceCache()
@@ -0,0 +1,94 @@
+"""
+Замена маршрутов продукции (PUT /api/products/<id>/workshops и
+PUT /api/products/workshops).
+
+Новый набор цехов сравнивается с текущими строками product_workshop, и
+в одной транзакции выполняются только нужные вставки, изменения часов и
+удаления — каждое одним executemany. Итоги в product_summary и версии
+таблиц для ETag обновляют триггеры SQLite.
+"""
+
+from django.db import connection, transaction
+from rest_framework.exceptions import ValidationError
+
+from .models import Product, ProductWorkshop
+from .serializers import ProductRouteSerializer
+
+INSERT_SQL = (
+    "INSERT INTO product_workshop (product_id, workshop_id, manufacture_hours) "
+    "VALUES (%s, %s, %s)"
+)
+UPDATE_SQL = (
+    "UPDATE product_workshop SET manufacture_hours = %s "
+    "WHERE product_id = %s AND workshop_id = %s"
+)
+DELETE_SQL = "DELETE FROM product_workshop WHERE product_id = %s AND workshop_id = %s"
+
+
+def validate_routes(data) -> dict[int, list[tuple[int, float]]]:
+    """
+    Проверить список [{"product_id": ..., "workshops": [...]}, ...].
+
+    Возвращает {product_id: [(workshop_id, manufacture_hours), ...]};
+    ошибки — по позициям списка, как у сериализатора с many=True.
+    """
+
+    serializer = ProductRouteSerializer(data=data, many=True)
+    serializer.is_valid(raise_exception=True)
+
+    product_ids = [item["product_id"] for item in serializer.validated_data]
+    existing_ids = set(
+        Product.objects.filter(id__in=product_ids).values_list("id", flat=True)
+    )
+    errors = [{} for _ in product_ids]
+    seen_ids = set()
+    for index, product_id in enumerate(product_ids):
+        if product_id in seen_ids:
+            errors[index] = {"product_id": ["Продукция указана несколько раз."]}
+        elif product_id not in existing_ids:
+            errors[index] = {"product_id": ["Продукция не найдена."]}
+        seen_ids.add(product_id)
+    if any(errors):
+        raise ValidationError(errors)
+
+    return {
+        item["product_id"]: [
+            (step["workshop_id"].id, step["manufacture_hours"]) for step in item["workshops"]
+        ]
+        for item in serializer.validated_data
+    }
+
+
+def replace_routes(routes: dict[int, list[tuple[int, float]]]) -> dict[str, int]:
+    """Заменить маршруты продукции целиком; возвращает число затронутых строк."""
+
+    with transaction.atomic():
+        current = {
+            (product_id, workshop_id): hours
+            for product_id, workshop_id, hours in ProductWorkshop.objects.filter(
+                product_id__in=list(routes)
+            ).values_list("product_id", "workshop_id", "manufacture_hours")
+        }
+        new = {
+            (product_id, workshop_id): hours
+            for product_id, steps in routes.items()
+            for workshop_id, hours in steps
+        }
+        inserts = [(*key, hours) for key, hours in new.items() if key not in current]
+        updates = [
+            (hours, *key)
+            for key, hours in new.items()
+            if key in current and current[key] != hours
+        ]
+        deletes = [key for key in current if key not in new]
+
+        with connection.cursor() as cursor:
+            for sql, rows in (
+                (DELETE_SQL, deletes),
+                (UPDATE_SQL, updates),
+                (INSERT_SQL, inserts),
+            ):
+                if rows:
+                    cursor.executemany(sql, rows)
+
+    return {"inserted": len(inserts), "updated": len(updates), "deleted": len(deletes)}
@@ -0,0 +1,184 @@
+"""
+Оценка загрузки цехов по заказам (POST /api/production/schedule).
+
+Заказ — список строк (продукция, количество). Матрица часов продукция × цех
+строится один раз из product_workshop, нагрузка цехов считается умножением
+на вектор количеств. Срок выполнения каждого цеха оценивается списочным
+планированием LPT: строки заказа (часы на строку = часы продукции в цехе ×
+количество) по убыванию длительности раздаются рабочим цеха, каждая — тому,
+кто освободится раньше (куча времен окончания). Цеха работают параллельно,
+поэтому общий срок — наибольший из сроков цехов, а цех с этим сроком —
+узкое место. Цех без указанного числа рабочих считается цехом с одним
+рабочим.
+"""
+
+import heapq
+from collections.abc import Sequence
+
+import numpy as np
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.settings import api_settings
+
+from config.db_routing import read_connection, read_only_database
+
+from .reference_cache import reference_cache
+
+# Больше id в IN (...) не передается (ограничение SQLite на число параметров).
+ID_IN_LIMIT = 500
+
+# Наибольшее значение id и количества: столько вмещают INTEGER SQLite и
+# массивы int64, а во float64 оно переводится без переполнения.
+MAX_INT = 2**63 - 1
+
+
+def _positive_int(value) -> int | None:
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        return None
+    try:
+        number = int(value)
+    except ValueError:
+        return None
+    return number if 0 < number <= MAX_INT else None
+
+
+def parse_orders(lines: Sequence) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Массивы id продукции и количеств из [{"product_id": ..., "quantity": ...}].
+
+    Проверка без сериализатора DRF (строк бывают десятки тысяч), ошибки —
+    в том же виде, что у сериализатора с many=True.
+    """
+
+    if not isinstance(lines, list):
+        raise ValidationError({"orders": ["Ожидается список."]})
+    limit = settings.SCHEDULE_MAX_LINES
+    if len(lines) > limit:
+        message = f"В заказе может быть не больше {limit} строк."
+        raise ValidationError({api_settings.NON_FIELD_ERRORS_KEY: [message]})
+
+    product_ids = np.zeros(len(lines), dtype=np.int64)
+    quantities = np.zeros(len(lines), dtype=np.float64)
+    errors: list[dict] = [{} for _ in lines]
+    for index, line in enumerate(lines):
+        if not isinstance(line, dict):
+            errors[index] = {api_settings.NON_FIELD_ERRORS_KEY: ["Ожидается объект."]}
+            continue
+        product_id = _positive_int(line.get("product_id"))
+        quantity = _positive_int(line.get("quantity"))
+        if product_id is None:
+            errors[index]["product_id"] = ["Ожидается id продукции."]
+        if quantity is None:
+            errors[index]["quantity"] = [f"Ожидается целое число от 1 до {MAX_INT}."]
+        if product_id is not None and quantity is not None:
+            product_ids[index] = product_id
+            quantities[index] = quantity
+    if any(errors):
+        raise ValidationError(errors)
+    return product_ids, quantities
+
+
+def _select_for_products(sql: str, column: str, product_ids: np.ndarray) -> list[tuple]:
+    """
+    Строки запроса sql для продукции product_ids. Если продукции много,
+    таблица читается целиком (одно сканирование вместо сотен IN-запросов),
+    лишние строки отбрасывает вызывающий код.
+    """
+
+    if len(product_ids) == 0:
+        return []
+    with read_connection().cursor() as cursor:
+        if len(product_ids) > ID_IN_LIMIT:
+            cursor.execute(sql)
+        else:
+            placeholders = ", ".join(["%s"] * len(product_ids))
+            cursor.execute(f"{sql} WHERE {column} IN ({placeholders})", product_ids.tolist())
+        return cursor.fetchall()
+
+
+def lpt_makespan(durations: np.ndarray, workers: int) -> float:
+    """Срок выполнения работ durations на workers рабочих по правилу LPT."""
+
+    if len(durations) == 0:
+        return 0.0
+    if workers == 1:
+        return float(durations.sum())
+    if len(durations) <= workers:
+        return float(durations.max())
+    ordered = np.sort(durations)[::-1].tolist()
+    finish_times = ordered[:workers]
+    heapq.heapify(finish_times)
+    for duration in ordered[workers:]:
+        heapq.heapreplace(finish_times, finish_times[0] + duration)
+    return max(finish_times)
+
+
+def schedule_orders(product_ids: np.ndarray, quantities: np.ndarray) -> dict:
+    """Нагрузка и срок по цехам, узкое место и общий срок для строк заказа."""
+
+    unique_ids, line_products = np.unique(product_ids, return_inverse=True)
+    with read_only_database():
+        found = np.array(
+            _select_for_products("SELECT id FROM product", "id", unique_ids), dtype=np.int64
+        ).reshape(-1)
+        steps = np.array(
+            _select_for_products(
+                "SELECT product_id, workshop_id, manufacture_hours FROM product_workshop",
+                "product_id",
+                unique_ids,
+            ),
+            dtype=np.float64,
+        ).reshape(-1, 3)
+        workshops = reference_cache.rows("workshop")
+
+    missing = ~np.isin(product_ids, found)
+    if missing.any():
+        errors: list[dict] = [{} for _ in range(len(product_ids))]
+        for index in np.flatnonzero(missing).tolist():
+            errors[index] = {"product_id": ["Продукция не найдена."]}
+        raise ValidationError(errors)
+
+    # Матрица часов: строка — продукция из unique_ids, столбец — цех.
+    workshop_ids = sorted(workshops, key=lambda pk: workshops[pk].name)
+    step_products = steps[:, 0].astype(np.int64)
+    step_workshops = steps[:, 1].astype(np.int64)
+    known = np.isin(step_products, unique_ids) & np.isin(step_workshops, workshop_ids)
+    columns = np.full(max(workshop_ids, default=0) + 1, -1, dtype=np.int64)
+    columns[workshop_ids] = np.arange(len(workshop_ids))
+    hours_matrix = np.zeros((len(unique_ids), len(workshop_ids)), dtype=np.float64)
+    hours_matrix[
+        np.searchsorted(unique_ids, step_products[known]),
+        columns[step_workshops[known]],
+    ] = np.nan_to_num(steps[known, 2])  # часы NULL — 0
+
+    # Часы каждой строки заказа в каждом цехе: строки × цеха.
+    line_hours = hours_matrix[line_products] * quantities[:, np.newaxis]
+    loads = line_hours.sum(axis=0)
+
+    result = []
+    for index, workshop_id in enumerate(workshop_ids):
+        workshop = workshops[workshop_id]
+        workers = max(workshop.workers_count or 0, 1)
+        durations = line_hours[:, index]
+        result.append(
+            {
+                "workshop_id": workshop_id,
+                "workshop": workshop.name,
+                "workers_count": workshop.workers_count,
+                "load_hours": round(float(loads[index]), 2),
+                "makespan_hours": round(lpt_makespan(durations[durations > 0], workers), 2),
+            }
+        )
+
+    busiest = max(result, key=lambda item: item["makespan_hours"], default=None)
+    bottleneck = None
+    makespan = 0.0
+    if busiest is not None and busiest["makespan_hours"] > 0:
+        bottleneck = {"workshop_id": busiest["workshop_id"], "workshop": busiest["workshop"]}
+        makespan = busiest["makespan_hours"]
+    return {
+        "workshops": result,
+        "bottleneck": bottleneck,
+        "makespan_hours": makespan,
+        "total_hours": round(float(loads.sum()), 2),
+    }
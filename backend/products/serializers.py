@@ -1,9 +1,14 @@
 import math
+from collections.abc import Sequence
 from decimal import Decimal
 
+from django.db import IntegrityError
 from rest_framework import serializers
 
+from config.filters import MAX_INT
+
 from .models import MaterialType, Product, ProductType, ProductWorkshop, Workshop
+from .reference_cache import reference_cache
 
 
 def rounded_hours(raw_value: float | None) -> int:
@@ -13,6 +18,26 @@ def rounded_hours(raw_value: float | None) -> int:
     return int(math.ceil(total))
 
 
+class ReferencePrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """PrimaryKeyRelatedField, который ищет объект в кэше справочников, а не в БД."""
+
+    def __init__(self, table: str, **kwargs):
+        self.table = table
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        instance = reference_cache.get(self.table, pk)
+        if instance is None:
+            self.fail("does_not_exist", pk_value=data)
+        return instance
+
+
 class ProductListSerializer(serializers.ModelSerializer):
     product_type = serializers.CharField(source="product_type.name")
     product_type_id = serializers.IntegerField(source="product_type.id")
@@ -71,11 +96,11 @@ class MaterialTypeSerializer(serializers.ModelSerializer):
 
 
 class ProductWriteSerializer(serializers.ModelSerializer):
-    product_type_id = serializers.PrimaryKeyRelatedField(
-        queryset=ProductType.objects.all(), source="product_type"
+    product_type_id = ReferencePrimaryKeyRelatedField(
+        "product_type", queryset=ProductType.objects.all(), source="product_type"
     )
-    material_type_id = serializers.PrimaryKeyRelatedField(
-        queryset=MaterialType.objects.all(), source="material_type"
+    material_type_id = ReferencePrimaryKeyRelatedField(
+        "material_type", queryset=MaterialType.objects.all(), source="material_type"
     )
     min_partner_price = serializers.DecimalField(
         max_digits=12,
@@ -99,6 +124,72 @@ class ProductWriteSerializer(serializers.ModelSerializer):
         return float(rounded_value)
 
 
+# Поле сериализатора -> (ключ validated_data, таблица reference_cache, модель).
+PRODUCT_REFERENCES = {
+    "product_type_id": ("product_type", "product_type", ProductType),
+    "material_type_id": ("material_type", "material_type", MaterialType),
+}
+
+
+def is_foreign_key_error(exc: IntegrityError) -> bool:
+    # SQLite не называет нарушенную ссылку: "FOREIGN KEY constraint failed".
+    return "FOREIGN KEY" in str(exc)
+
+
+def product_reference_errors(items: Sequence[dict]) -> list[dict]:
+    """
+    Ошибки полей *_type_id для validated_data ProductWriteSerializer,
+    ссылающихся на типы, которых уже нет в БД.
+
+    ReferencePrimaryKeyRelatedField проверяет id по reference_cache, а тип,
+    удаленный другим процессом, кэш видит с задержкой — такую запись
+    отклоняет FOREIGN KEY. Тогда кэш сбрасывается, а id сверяются с БД
+    (по запросу на справочник).
+    """
+
+    reference_cache.invalidate(*(table for _, table, _ in PRODUCT_REFERENCES.values()))
+    message = ReferencePrimaryKeyRelatedField.default_error_messages["does_not_exist"]
+    errors: list[dict] = [{} for _ in items]
+    for field, (key, _, model) in PRODUCT_REFERENCES.items():
+        ids = {values[key].pk for values in items if key in values}
+        existing = set(model.objects.filter(pk__in=ids).values_list("pk", flat=True))
+        for index, values in enumerate(items):
+            if key in values and values[key].pk not in existing:
+                errors[index][field] = [message.format(pk_value=values[key].pk)]
+    return errors
+
+
+class ProductBulkItemSerializer(ProductWriteSerializer):
+    """Позиция пакета: уникальность наименования проверяет products.bulk для всего пакета."""
+
+    name = serializers.CharField(max_length=255)
+
+
+def finite_number(value: float) -> None:
+    # FloatField принимает "inf" и "nan": SQLite сохранит Inf (его потом не
+    # отдать в JSON) или NULL.
+    if not math.isfinite(value):
+        raise serializers.ValidationError("Ожидается конечное число.")
+
+
+class RouteStepSerializer(serializers.Serializer):
+    workshop_id = ReferencePrimaryKeyRelatedField("workshop", queryset=Workshop.objects.all())
+    manufacture_hours = serializers.FloatField(min_value=0, validators=[finite_number])
+
+
+class ProductRouteSerializer(serializers.Serializer):
+    """Новый маршрут продукции целиком: список цехов с часами."""
+
+    product_id = serializers.IntegerField(min_value=1, max_value=MAX_INT)
+    workshops = RouteStepSerializer(many=True)
+
+    def validate_workshops(self, steps: list[dict]) -> list[dict]:
+        workshop_ids = [step["workshop_id"].id for step in steps]
+        if len(set(workshop_ids)) != len(workshop_ids):
+            raise serializers.ValidationError("Цех указан в маршруте несколько раз.")
+        return steps
+
+
 class WorkshopSerializer(serializers.ModelSerializer):
     workers_count = serializers.IntegerField(min_value=0, required=False, allow_null=True)
 
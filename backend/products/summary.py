@@ -0,0 +1,48 @@
+from django.db import connection
+
+# Пересчет итогов по всей продукции с нуля (те же формулы, что в триггерах).
+REBUILD_SQL = (
+    "DELETE FROM product_summary",
+    """
+    INSERT INTO product_summary (product_id, total_hours, workshop_count)
+    SELECT p.id, COALESCE(SUM(pw.manufacture_hours), 0), COUNT(pw.product_id)
+    FROM product p LEFT JOIN product_workshop pw ON pw.product_id = p.id
+    GROUP BY p.id
+    """,
+)
+
+# Расхождения итогов с product_workshop: отсутствующие, неверные и лишние строки.
+DRIFT_SQL = """
+    SELECT p.id, s.total_hours, s.workshop_count,
+           COALESCE(SUM(pw.manufacture_hours), 0), COUNT(pw.product_id)
+    FROM product p
+    LEFT JOIN product_workshop pw ON pw.product_id = p.id
+    LEFT JOIN product_summary s ON s.product_id = p.id
+    GROUP BY p.id
+    HAVING s.product_id IS NULL
+        OR ABS(s.total_hours - COALESCE(SUM(pw.manufacture_hours), 0)) > 1e-9
+        OR s.workshop_count != COUNT(pw.product_id)
+    UNION ALL
+    SELECT s.product_id, s.total_hours, s.workshop_count, NULL, NULL
+    FROM product_summary s
+    WHERE NOT EXISTS (SELECT 1 FROM product p WHERE p.id = s.product_id)
+"""
+
+
+def rebuild_product_summary() -> None:
+    with connection.cursor() as cursor:
+        for statement in REBUILD_SQL:
+            cursor.execute(statement)
+
+
+def find_product_summary_drift() -> list[tuple]:
+    """
+    Строки (product_id, total_hours, workshop_count, expected_hours, expected_count).
+
+    Для лишних строк итогов (продукции уже нет) ожидаемые значения равны None,
+    для отсутствующих строк итогов None — сохраненные значения.
+    """
+
+    with connection.cursor() as cursor:
+        cursor.execute(DRIFT_SQL)
+        return cursor.fetchall()
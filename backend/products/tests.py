@@ -0,0 +1,208 @@
+import importlib.util
+import shutil
+import sqlite3
+import tempfile
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+import unittest
+from unittest import mock
+
+import pandas as pd
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIRequestFactory
+
+from config.filters import parse_filter_params
+from products.models import Workshop
+from products.views import ProductListCreateView, product_routes
+
+IMPORT_SCRIPT = Path(__file__).resolve().parents[2] / "import.py"
+
+
+def load_import_script():
+    spec = importlib.util.spec_from_file_location("furniture_import", IMPORT_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class IncrementalImportTests(SimpleTestCase):
+    """import.py: полный импорт, затем --incremental по копиям *_import.xlsx."""
+
+    def setUp(self):
+        self.importer = load_import_script()
+        self.data_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        for stage in self.importer.IMPORT_STAGES:
+            shutil.copy(stage.path, self.data_dir / stage.path.name)
+        stages = tuple(
+            stage._replace(path=self.data_dir / stage.path.name)
+            for stage in self.importer.IMPORT_STAGES
+        )
+        self.db_path = self.data_dir / "furniture.db"
+        patcher = mock.patch.multiple(
+            self.importer, IMPORT_STAGES=stages, DB_PATH=self.db_path
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_import(self, *args):
+        with redirect_stdout(StringIO()):
+            self.importer.main(["--workers", "1", *args])
+
+    def query(self, sql, params=()):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def test_incremental_after_full_updates_product_summary(self):
+        self.run_import()
+        # Сразу после полного импорта сверяются все строки: каждая
+        # product_workshop проходит через upsert, и триггеры итогов тоже.
+        self.run_import("--incremental")
+
+        before = dict(self.query("SELECT product_id, total_hours FROM product_summary"))
+
+        path = self.data_dir / "Product_workshops_import.xlsx"
+        frame = pd.read_excel(path)
+        frame.iloc[0, 2] += 10
+        frame.to_excel(path, index=False)
+        self.run_import("--incremental")
+
+        after = dict(self.query("SELECT product_id, total_hours FROM product_summary"))
+        self.assertEqual(after.keys(), before.keys())
+        changed = {pk: after[pk] - before[pk] for pk in after if after[pk] != before[pk]}
+        self.assertEqual(len(changed), 1)
+        self.assertAlmostEqual(next(iter(changed.values())), 10)
+        mismatched = self.query(
+            """
+            SELECT s.product_id
+            FROM product_summary s
+            LEFT JOIN (
+                SELECT product_id, SUM(manufacture_hours) AS hours, COUNT(*) AS links
+                FROM product_workshop GROUP BY product_id
+            ) pw ON pw.product_id = s.product_id
+            WHERE abs(s.total_hours - COALESCE(pw.hours, 0)) > 1e-9
+               OR s.workshop_count != COALESCE(pw.links, 0)
+            """
+        )
+        self.assertEqual(mismatched, [])
+
+    def test_restored_product_gets_its_routes_back(self):
+        self.run_import()
+        self.run_import("--incremental")
+        path = self.data_dir / "Products_import.xlsx"
+        original = path.read_bytes()
+        frame = pd.read_excel(path)
+        name = frame.iloc[0, 1]
+        routes_sql = (
+            "SELECT COUNT(*) FROM product_workshop pw"
+            " JOIN product p ON p.id = pw.product_id WHERE p.name = ?"
+        )
+        ((expected,),) = self.query(routes_sql, (name,))
+        self.assertGreater(expected, 0)
+
+        frame.drop(index=0).to_excel(path, index=False)
+        self.run_import("--incremental")
+        self.assertEqual(self.query(routes_sql, (name,)), [(0,)])
+
+        # Файл product_workshop не менялся, но id продукции новый:
+        # его строки должны сверяться заново.
+        path.write_bytes(original)
+        self.run_import("--incremental")
+        self.assertEqual(self.query(routes_sql, (name,)), [(expected,)])
+
+
+class ProductFilterParamsTests(SimpleTestCase):
+    def test_out_of_range_ids_are_rejected(self):
+        params = {"product_type_id": str(2**63), "workshop_id": str(-(2**63) - 1)}
+        with self.assertRaises(ValidationError) as caught:
+            parse_filter_params(params, ProductListCreateView.filter_params)
+        self.assertEqual(
+            set(caught.exception.detail), {"product_type_id", "workshop_id"}
+        )
+
+    def test_max_sqlite_integer_is_accepted(self):
+        lookups = parse_filter_params(
+            {"material_type_id": str(2**63 - 1)}, ProductListCreateView.filter_params
+        )
+        self.assertEqual(lookups, {"material_type_id": 2**63 - 1})
+
+
+class ProductRoutesValidationTests(SimpleTestCase):
+    def put_route(self, body: str):
+        request = APIRequestFactory().put(
+            "/api/products/workshops", body, content_type="application/json"
+        )
+        # Цех берется из кэша справочников; до записи в БД запрос не доходит.
+        with mock.patch("products.serializers.reference_cache") as cache:
+            cache.get.return_value = Workshop(id=1)
+            return product_routes(request)
+
+    def test_non_finite_hours_are_rejected(self):
+        for hours in ('"inf"', '"-inf"', '"nan"', "1e999"):
+            with self.subTest(hours=hours):
+                response = self.put_route(
+                    '[{"product_id": 1, "workshops": '
+                    f'[{{"workshop_id": 1, "manufacture_hours": {hours}}}]}}]'
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("manufacture_hours", response.data[0]["workshops"][0])
+
+    def test_out_of_range_product_id_is_rejected(self):
+        response = self.put_route(f'[{{"product_id": {2**63}, "workshops": []}}]')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("product_id", response.data[0])
+
+
+class QueryChecksTests(unittest.TestCase):
+    """
+    check_query_budgets и check_query_plans на базе из *_import.xlsx.
+
+    Тестовую базу Django не создать одними миграциями: таблицы продукции
+    создает import.py. Поэтому база собирается им во временной папке,
+    мигрируется, и на время тестов на нее переключаются соединения Django.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.data_dir = Path(tempfile.mkdtemp())
+        db_path = cls.data_dir / "furniture.db"
+        importer = load_import_script()
+        with mock.patch.object(importer, "DB_PATH", db_path), redirect_stdout(StringIO()):
+            importer.main(["--workers", "1"])
+
+        names = {"default": str(db_path), "readonly": f"{db_path.as_uri()}?mode=ro"}
+        cls.saved_names = {}
+        for connection in connections.all():
+            connection.close()
+            cls.saved_names[connection.alias] = connection.settings_dict["NAME"]
+            connection.settings_dict["NAME"] = names[connection.alias]
+        call_command("migrate", verbosity=0, stdout=StringIO())
+
+    @classmethod
+    def tearDownClass(cls):
+        for connection in connections.all():
+            connection.close()
+            connection.settings_dict["NAME"] = cls.saved_names[connection.alias]
+        shutil.rmtree(cls.data_dir)
+        super().tearDownClass()
+
+    def run_check(self, command: str):
+        stderr = StringIO()
+        try:
+            call_command(command, stdout=StringIO(), stderr=stderr)
+        except CommandError as exc:
+            self.fail(f"{exc}\n{stderr.getvalue()}")
+
+    def test_query_budgets(self):
+        self.run_check("check_query_budgets")
+
+    def test_query_plans(self):
+        self.run_check("check_query_plans")
@@ -4,10 +4,20 @@ from . import views
 
 urlpatterns = [
     path("api/health", views.health, name="health"),
+    path("api/cache-stats", views.cache_stats, name="cache-stats"),
     path("api/raw-material/calculate", views.raw_material_calculate, name="raw-material-calc"),
+    path(
+        "api/raw-material/calculate/batch",
+        views.raw_material_calculate_batch,
+        name="raw-material-calc-batch",
+    ),
+    path("api/production/schedule", views.production_schedule, name="production-schedule"),
     path("api/product-types", views.ProductTypeListView.as_view(), name="product-type-list"),
     path("api/material-types", views.MaterialTypeListView.as_view(), name="material-type-list"),
     path("api/products", views.ProductListCreateView.as_view(), name="product-list"),
+    path("api/products/export", views.product_export, name="product-export"),
+    path("api/products/bulk", views.product_bulk, name="product-bulk"),
+    path("api/products/workshops", views.product_routes, name="product-routes"),
     path("api/products/<int:pk>", views.ProductRetrieveUpdateDestroyView.as_view(), name="product-detail"),
     path("api/products/<int:pk>/workshops", views.ProductWorkshopsView.as_view(), name="product-workshops"),
     path("api/workshops", views.WorkshopListCreateView.as_view(), name="workshop-list"),
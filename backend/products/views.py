@@ -1,15 +1,30 @@
 from django.conf import settings
 from django.db import IntegrityError, transaction
-from django.db.models import FloatField, Sum, Value
+from django.db.models import F, FloatField, Value
 from django.db.models.functions import Coalesce
+from django.views.decorators.http import require_GET
 from rest_framework import generics
 from rest_framework.decorators import api_view
-from rest_framework.exceptions import ValidationError
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
-from raw_material_calculation import calculate_raw_material_amount
+from config.conditional import ConditionalGetMixin
+from config.exports import export_response
+from config.fast_list import FastListMixin
+from config.filters import InSubquery, sqlite_int
+from config.response_cache import response_cache
+from raw_material_calculation import (
+    calculate_raw_material_amount,
+    calculate_raw_material_amounts,
+)
 
+from .bulk import DUPLICATE_NAME, REFERENCE_CONFLICT, apply_product_bulk
+from .exports import PRODUCT_EXPORT_COLUMNS, iter_product_records
 from .models import MaterialType, Product, ProductType, ProductWorkshop, Workshop
+from .reference_cache import reference_cache
+from .routes import replace_routes, validate_routes
+from .scheduling import parse_orders, schedule_orders
 from .serializers import (
     MaterialTypeSerializer,
     ProductDetailSerializer,
@@ -18,25 +33,47 @@ from .serializers import (
     ProductWriteSerializer,
     WorkshopSerializer,
     WorkshopTimeSerializer,
+    is_foreign_key_error,
+    product_reference_errors,
+    rounded_hours,
 )
 
 
 def _base_queryset():
-    return (
-        Product.objects.select_related("product_type", "material_type")
-        .prefetch_related("product_workshops__workshop")
-        .annotate(
-            total_hours=Coalesce(
-                Sum("product_workshops__manufacture_hours"),
-                Value(0.0),
-                output_field=FloatField(),
-            )
+    # Сумма часов берется из product_summary, которую ведут триггеры SQLite.
+    return Product.objects.select_related("product_type", "material_type").annotate(
+        total_hours=Coalesce(
+            F("summary__total_hours"),
+            Value(0.0),
+            output_field=FloatField(),
         )
     )
 
 
-class ProductListCreateView(generics.ListCreateAPIView):
+def _product_integrity_error(exc: IntegrityError, values: dict) -> dict:
+    """Ответ 400 на IntegrityError при записи продукции."""
+
+    if is_foreign_key_error(exc):
+        return product_reference_errors([values])[0] or {
+            api_settings.NON_FIELD_ERRORS_KEY: [REFERENCE_CONFLICT]
+        }
+    return {"name": DUPLICATE_NAME}
+
+
+class ProductListCreateView(ConditionalGetMixin, FastListMixin, generics.ListCreateAPIView):
     queryset = _base_queryset().order_by("name")
+    version_tables = ("product", "product_type", "material_type", "product_workshop")
+    fast_list_overrides = {"manufacture_time_hours": ("total_hours", rounded_hours)}
+    filter_params = {
+        "product_type_id": ("product_type_id", sqlite_int),
+        "material_type_id": ("material_type_id", sqlite_int),
+        "min_price": ("min_partner_price__gte", float),
+        "max_price": ("min_partner_price__lte", float),
+        "workshop_id": (
+            "id__in",
+            InSubquery(ProductWorkshop.objects, "workshop_id", "product_id"),
+        ),
+    }
 
     def get_serializer_class(self):
         if self.request.method == "POST":
@@ -47,19 +84,19 @@ class ProductListCreateView(generics.ListCreateAPIView):
         try:
             with transaction.atomic():
                 serializer.save()
-        except IntegrityError:
-            raise ValidationError(
-                {
-                    "name": (
-                        "Продукт с таким наименованием уже существует. "
-                        "Введите другое наименование."
-                    )
-                }
-            )
+        except IntegrityError as exc:
+            raise ValidationError(_product_integrity_error(exc, serializer.validated_data))
 
 
-class ProductRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = _base_queryset()
+class ProductRetrieveUpdateDestroyView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
+    queryset = _base_queryset().prefetch_related("product_workshops__workshop")
+    version_tables = (
+        "product",
+        "product_type",
+        "material_type",
+        "product_workshop",
+        "workshop",
+    )
 
     def get_serializer_class(self):
         if self.request.method in {"PUT", "PATCH"}:
@@ -70,15 +107,8 @@ class ProductRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
         try:
             with transaction.atomic():
                 serializer.save()
-        except IntegrityError:
-            raise ValidationError(
-                {
-                    "name": (
-                        "Продукт с таким наименованием уже существует. "
-                        "Введите другое наименование."
-                    )
-                }
-            )
+        except IntegrityError as exc:
+            raise ValidationError(_product_integrity_error(exc, serializer.validated_data))
 
     def perform_destroy(self, instance: Product):
         with transaction.atomic():
@@ -86,18 +116,21 @@ class ProductRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
             instance.delete()
 
 
-class ProductTypeListView(generics.ListAPIView):
+class ProductTypeListView(ConditionalGetMixin, FastListMixin, generics.ListAPIView):
     serializer_class = ProductTypeSerializer
     queryset = ProductType.objects.order_by("name")
+    version_tables = ("product_type",)
 
 
-class MaterialTypeListView(generics.ListAPIView):
+class MaterialTypeListView(ConditionalGetMixin, FastListMixin, generics.ListAPIView):
     serializer_class = MaterialTypeSerializer
     queryset = MaterialType.objects.order_by("name")
+    version_tables = ("material_type",)
 
 
-class ProductWorkshopsView(generics.ListAPIView):
+class ProductWorkshopsView(ConditionalGetMixin, generics.ListAPIView):
     serializer_class = WorkshopTimeSerializer
+    version_tables = ("product_workshop", "workshop")
 
     def get_queryset(self):
         product_id = self.kwargs.get("pk")
@@ -107,10 +140,24 @@ class ProductWorkshopsView(generics.ListAPIView):
             .order_by("workshop__name")
         )
 
+    def put(self, request, *args, **kwargs):
+        product_id = self.kwargs["pk"]
+        if not Product.objects.filter(pk=product_id).exists():
+            raise NotFound()
+        data = request.data
+        steps = data.get("workshops") if isinstance(data, dict) else data
+        try:
+            routes = validate_routes([{"product_id": product_id, "workshops": steps}])
+        except ValidationError as exc:
+            raise ValidationError(exc.detail[0])
+        replace_routes(routes)
+        return Response(self.get_serializer(self.get_queryset(), many=True).data)
 
-class WorkshopListCreateView(generics.ListCreateAPIView):
+
+class WorkshopListCreateView(ConditionalGetMixin, FastListMixin, generics.ListCreateAPIView):
     serializer_class = WorkshopSerializer
     queryset = Workshop.objects.order_by("name")
+    version_tables = ("workshop",)
 
     def perform_create(self, serializer):
         try:
@@ -125,11 +172,13 @@ class WorkshopListCreateView(generics.ListCreateAPIView):
                     )
                 }
             )
+        reference_cache.invalidate("workshop")
 
 
-class WorkshopRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+class WorkshopRetrieveUpdateDestroyView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     serializer_class = WorkshopSerializer
     queryset = Workshop.objects.all()
+    version_tables = ("workshop",)
 
     def perform_update(self, serializer):
         try:
@@ -144,17 +193,52 @@ class WorkshopRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
                     )
                 }
             )
+        reference_cache.invalidate("workshop")
 
     def perform_destroy(self, instance: Workshop):
         with transaction.atomic():
             ProductWorkshop.objects.filter(workshop_id=instance.id).delete()
             instance.delete()
+        reference_cache.invalidate("workshop")
+
+
+@api_view(["POST"])
+def product_bulk(request):
+    return Response(apply_product_bulk(request.data))
+
+
+@api_view(["PUT"])
+def product_routes(request):
+    data = request.data
+    items = data.get("products") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        raise ValidationError({"products": ["Ожидается список."]})
+    return Response(replace_routes(validate_routes(items)))
+
+
+@api_view(["POST"])
+def production_schedule(request):
+    data = request.data
+    lines = data.get("orders") if isinstance(data, dict) else data
+    return Response(schedule_orders(*parse_orders(lines)))
+
 
 @api_view(["GET"])
 def health(request):
     return Response({"status": "ok"})
 
 
+# Обычное представление Django: у DRF параметр ?format= занят выбором рендерера.
+@require_GET
+def product_export(request):
+    return export_response(request, "products", PRODUCT_EXPORT_COLUMNS, iter_product_records())
+
+
+@api_view(["GET"])
+def cache_stats(request):
+    return Response({"responses": response_cache.stats()})
+
+
 @api_view(["POST"])
 def raw_material_calculate(request):
     data = request.data if isinstance(request.data, dict) else {}
@@ -167,3 +251,16 @@ def raw_material_calculate(request):
         db_path=settings.DATABASES["default"]["NAME"],
     )
     return Response({"raw_material_amount": amount})
+
+
+@api_view(["POST"])
+def raw_material_calculate_batch(request):
+    data = request.data
+    lines = data.get("lines") if isinstance(data, dict) else data
+    if not isinstance(lines, list):
+        raise ValidationError({"lines": "Ожидается список строк для расчета."})
+    amounts = calculate_raw_material_amounts(
+        lines,
+        db_path=settings.DATABASES["default"]["NAME"],
+    )
+    return Response({"raw_material_amounts": amounts})
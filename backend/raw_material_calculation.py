@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import functools
 import math
 import sqlite3
+import threading
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 
 def _as_int(value: Any) -> int | None:
     if value is None:
@@ -13,7 +19,7 @@ def _as_int(value: Any) -> int | None:
         return None
     try:
         return int(value)
-    except (TypeError, ValueError):
+    except (TypeError, ValueError, OverflowError):
         return None
 
 
@@ -31,6 +37,208 @@ def _as_positive_float(value: Any) -> float | None:
     return number
 
 
+@functools.lru_cache(maxsize=32)
+def _database_uri(db_path: str | Path | None) -> str:
+    """URI файла БД в режиме только для чтения (вычисляется один раз на путь)."""
+
+    if db_path is not None:
+        resolved = Path(db_path).expanduser().resolve()
+    else:
+        resolved = Path(__file__).resolve().parent.parent / "furniture.db"
+    return f"{resolved.as_uri()}?mode=ro"
+
+
+def _as_reference_value(value: Any) -> float | None:
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(number):
+        return None
+    return number
+
+
+def _load_reference_values(
+    conn: sqlite3.Connection,
+) -> tuple[dict[int, float | None], dict[int, float | None]]:
+    """
+    Загрузить коэффициенты типов продукции и процент потерь типов материалов
+    одним запросом.
+
+    Возврат: (coefficient по id типа продукции, loss_percent по id типа материала).
+    Справочники маленькие, поэтому читаются целиком.
+    """
+
+    rows = conn.execute(
+        """
+        SELECT 0, id, coefficient FROM product_type
+        UNION ALL
+        SELECT 1, id, loss_percent FROM material_type
+        """
+    ).fetchall()
+    coefficients: dict[int, float | None] = {}
+    losses: dict[int, float | None] = {}
+    for kind, row_id, value in rows:
+        target = coefficients if kind == 0 else losses
+        target[row_id] = _as_reference_value(value)
+    return coefficients, losses
+
+
+class _PooledConnection:
+    __slots__ = ("conn", "data_version", "write_counter")
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        # Последнее значение PRAGMA data_version, проверенное этим соединением.
+        self.data_version: int | None = None
+        self.write_counter = -1
+
+
+class _ConnectionPool:
+    """
+    Пул соединений только для чтения, отдельный для каждого файла БД.
+
+    Соединения открываются в режиме mode=ro и переиспользуются между потоками
+    WSGI, поэтому кэш подготовленных выражений sqlite3 живет дольше запроса.
+    """
+
+    def __init__(self, max_idle: int = 8) -> None:
+        self._lock = threading.Lock()
+        self._idle: dict[str, list[_PooledConnection]] = {}
+        self._max_idle = max_idle
+
+    @contextmanager
+    def connection(self, uri: str) -> Iterator[_PooledConnection]:
+        with self._lock:
+            idle = self._idle.get(uri)
+            pooled = idle.pop() if idle else None
+        if pooled is None:
+            pooled = _PooledConnection(
+                sqlite3.connect(uri, uri=True, check_same_thread=False)
+            )
+
+        try:
+            yield pooled
+        except BaseException:
+            # Ошибка SQLite, исключение вызывающего кода, GeneratorExit:
+            # состояние соединения неизвестно, в пул оно не возвращается.
+            pooled.conn.close()
+            raise
+
+        with self._lock:
+            idle = self._idle.setdefault(uri, [])
+            if len(idle) < self._max_idle:
+                idle.append(pooled)
+                return
+        pooled.conn.close()
+
+    def close_all(self) -> None:
+        with self._lock:
+            idle_lists = list(self._idle.values())
+            self._idle.clear()
+        for idle in idle_lists:
+            for pooled in idle:
+                pooled.conn.close()
+
+
+class _ReferenceSnapshot:
+    __slots__ = ("sequence", "coefficients", "losses")
+
+    def __init__(
+        self,
+        sequence: int,
+        coefficients: dict[int, float | None],
+        losses: dict[int, float | None],
+    ) -> None:
+        self.sequence = sequence
+        self.coefficients = coefficients
+        self.losses = losses
+
+
+class _ReferenceCache:
+    """
+    Кэш коэффициентов и процентов потерь в памяти процесса.
+
+    Каждое соединение пула проверяет PRAGMA data_version: значение меняется,
+    когда другое соединение (Django, import.py) фиксирует изменения в файле.
+    Если изменений с прошлой проверки не было, справочники берутся из памяти.
+    Снимок заменяется только более поздней загрузкой (по порядковому номеру),
+    поэтому параллельные промахи не откатывают кэш к старым данным.
+    Дополнительно кэш сбрасывается счетчиком записей invalidate().
+    """
+
+    def __init__(self, pool: _ConnectionPool) -> None:
+        self._pool = pool
+        self._lock = threading.Lock()
+        self._snapshots: dict[str, _ReferenceSnapshot] = {}
+        self._sequence = 0
+        self._write_counter = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(
+        self, uri: str
+    ) -> tuple[dict[int, float | None], dict[int, float | None]]:
+        with self._pool.connection(uri) as pooled:
+            data_version = pooled.conn.execute("PRAGMA data_version").fetchone()[0]
+            with self._lock:
+                snapshot = self._snapshots.get(uri)
+                if (
+                    snapshot is not None
+                    and data_version == pooled.data_version
+                    and pooled.write_counter == self._write_counter
+                ):
+                    self.hits += 1
+                    return snapshot.coefficients, snapshot.losses
+                self.misses += 1
+                self._sequence += 1
+                sequence = self._sequence
+                write_counter = self._write_counter
+
+            coefficients, losses = _load_reference_values(pooled.conn)
+            pooled.data_version = data_version
+            pooled.write_counter = write_counter
+            with self._lock:
+                current = self._snapshots.get(uri)
+                if current is None or current.sequence < sequence:
+                    self._snapshots[uri] = _ReferenceSnapshot(
+                        sequence, coefficients, losses
+                    )
+            return coefficients, losses
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._write_counter += 1
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+_connection_pool = _ConnectionPool()
+_reference_cache = _ReferenceCache(_connection_pool)
+
+
+def invalidate_reference_cache() -> None:
+    """Сбросить кэш справочников (вызывать после записи в product_type/material_type)."""
+
+    _reference_cache.invalidate()
+
+
+def reference_cache_stats() -> dict[str, int]:
+    """Счетчики попаданий и промахов кэша справочников."""
+
+    return _reference_cache.stats()
+
+
+def close_connections() -> None:
+    """Закрыть простаивающие соединения пула (например, перед заменой файла БД)."""
+
+    _connection_pool.close_all()
+
+
 def calculate_raw_material_amount(
     product_type_id: Any,
     material_type_id: Any,
@@ -76,61 +284,119 @@ def calculate_raw_material_amount(
     if parameter_one_float is None or parameter_two_float is None:
         return -1
 
-    resolved_db_path = (
-        Path(db_path).expanduser().resolve()
-        if db_path is not None
-        else Path(__file__).resolve().parent.parent / "furniture.db"
-    )
-    if not resolved_db_path.exists():
-        return -1
-
     try:
-        conn = sqlite3.connect(str(resolved_db_path))
+        coefficients, losses = _reference_cache.get(_database_uri(db_path))
     except sqlite3.Error:
         return -1
 
-    try:
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT coefficient FROM product_type WHERE id = ?",
-            (product_type_id_int,),
-        )
-        row = cursor.fetchone()
-        if not row:
-            return -1
-        coefficient = row[0]
-        if coefficient is None:
-            return -1
-        coefficient_float = float(coefficient)
-        if not math.isfinite(coefficient_float) or coefficient_float <= 0:
-            return -1
-
-        cursor.execute(
-            "SELECT loss_percent FROM material_type WHERE id = ?",
-            (material_type_id_int,),
-        )
-        row = cursor.fetchone()
-        if not row:
-            return -1
-        loss_percent = row[0]
-        if loss_percent is None:
-            return -1
-        loss_value = float(loss_percent)
-        if not math.isfinite(loss_value) or loss_value < 0:
-            return -1
-
-        # Если в БД потери хранятся как "проценты" (например 10), переводим в долю.
-        loss_ratio = loss_value / 100.0 if loss_value > 1 else loss_value
+    coefficient_float = coefficients.get(product_type_id_int)
+    if coefficient_float is None or coefficient_float <= 0:
+        return -1
+    loss_value = losses.get(material_type_id_int)
+    if loss_value is None or loss_value < 0:
+        return -1
 
+    # Если в БД потери хранятся как "проценты" (например 10), переводим в долю.
+    loss_ratio = loss_value / 100.0 if loss_value > 1 else loss_value
+
+    try:
         per_unit_raw = parameter_one_float * parameter_two_float * coefficient_float
         total_raw = per_unit_raw * product_quantity_int
         total_with_losses = total_raw * (1 + loss_ratio)
+    except OverflowError:
+        return -1
 
-        if not math.isfinite(total_with_losses) or total_with_losses < 0:
-            return -1
-
-        return int(math.ceil(total_with_losses))
-    except (sqlite3.Error, ValueError, OverflowError):
+    if not math.isfinite(total_with_losses) or total_with_losses < 0:
         return -1
-    finally:
-        conn.close()
+
+    return int(math.ceil(total_with_losses))
+
+
+def calculate_raw_material_amounts(
+    lines: Sequence[Any],
+    db_path: str | Path | None = None,
+) -> list[int]:
+    """
+    Пакетный вариант calculate_raw_material_amount.
+
+    Вход:
+      - lines: последовательность словарей с ключами product_type_id,
+        material_type_id, product_quantity, parameter_one, parameter_two
+      - db_path: путь к furniture.db (по умолчанию рядом с этим файлом)
+
+    Справочники берутся из кэша (один запрос на промах), расчет выполняется
+    над массивами NumPy. Для каждой строки результат совпадает с
+    calculate_raw_material_amount: целое количество сырья (>= 0) или -1.
+    """
+
+    count = len(lines)
+    if count == 0:
+        return []
+
+    product_type_ids: list[int | None] = [None] * count
+    material_type_ids: list[int | None] = [None] * count
+    quantities = np.zeros(count, dtype=np.float64)
+    parameters_one = np.zeros(count, dtype=np.float64)
+    parameters_two = np.zeros(count, dtype=np.float64)
+    valid = np.zeros(count, dtype=bool)
+
+    for index, line in enumerate(lines):
+        if not isinstance(line, Mapping):
+            continue
+        product_type_id = _as_int(line.get("product_type_id"))
+        material_type_id = _as_int(line.get("material_type_id"))
+        product_quantity = _as_int(line.get("product_quantity"))
+        if product_type_id is None or product_type_id <= 0:
+            continue
+        if material_type_id is None or material_type_id <= 0:
+            continue
+        if product_quantity is None or product_quantity <= 0:
+            continue
+        parameter_one = _as_positive_float(line.get("parameter_one"))
+        parameter_two = _as_positive_float(line.get("parameter_two"))
+        if parameter_one is None or parameter_two is None:
+            continue
+        try:
+            quantities[index] = float(product_quantity)
+        except OverflowError:
+            continue
+        product_type_ids[index] = product_type_id
+        material_type_ids[index] = material_type_id
+        parameters_one[index] = parameter_one
+        parameters_two[index] = parameter_two
+        valid[index] = True
+
+    result = [-1] * count
+    if not valid.any():
+        return result
+
+    try:
+        coefficients, losses = _reference_cache.get(_database_uri(db_path))
+    except sqlite3.Error:
+        return result
+
+    coefficient_values = np.array(
+        [coefficients.get(type_id, math.nan) for type_id in product_type_ids],
+        dtype=np.float64,
+    )
+    loss_values = np.array(
+        [losses.get(type_id, math.nan) for type_id in material_type_ids],
+        dtype=np.float64,
+    )
+    # None в справочнике превращается в nan и отсекается проверками ниже.
+    valid &= np.isfinite(coefficient_values) & (coefficient_values > 0)
+    valid &= np.isfinite(loss_values) & (loss_values >= 0)
+
+    loss_ratios = np.where(loss_values > 1, loss_values / 100.0, loss_values)
+
+    # Порядок операций повторяет скалярную функцию, чтобы округление совпадало.
+    with np.errstate(over="ignore", invalid="ignore"):
+        per_unit_raw = parameters_one * parameters_two * coefficient_values
+        total_raw = per_unit_raw * quantities
+        totals = total_raw * (1 + loss_ratios)
+    valid &= np.isfinite(totals) & (totals >= 0)
+
+    amounts = np.ceil(np.where(valid, totals, 0.0))
+    for index in np.flatnonzero(valid).tolist():
+        result[index] = int(amounts[index])
+    return result
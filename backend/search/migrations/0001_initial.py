@@ -0,0 +1,71 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:10
+
+from django.db import migrations
+
+# Полнотекстовые индексы FTS5 с внешним содержимым: текст хранится только
+# в исходных таблицах, индексы держат актуальными триггеры.
+# (индекс, таблица, индексируемые колонки)
+SOURCES = (
+    ("product_fts", "product", ("name", "article")),
+    ("material_fts", "material", ("name", "description")),
+    ("partner_fts", "partner", ("company_name", "inn")),
+    ("supplier_fts", "supplier", ("name", "inn")),
+)
+
+SEARCH_SQL = []
+DROP_SEARCH_SQL = []
+for _index, _table, _columns in SOURCES:
+    _names = ", ".join(_columns)
+    _new = ", ".join(f"new.{column}" for column in _columns)
+    _old = ", ".join(f"old.{column}" for column in _columns)
+    SEARCH_SQL += [
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {_index} USING fts5(
+            {_names}, content='{_table}', content_rowid='id',
+            tokenize='unicode61', prefix='2 3'
+        )
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {_index}_insert AFTER INSERT ON {_table}
+        BEGIN
+            INSERT INTO {_index} (rowid, {_names}) VALUES (new.id, {_new});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {_index}_delete AFTER DELETE ON {_table}
+        BEGIN
+            INSERT INTO {_index} ({_index}, rowid, {_names})
+            VALUES ('delete', old.id, {_old});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {_index}_update AFTER UPDATE OF id, {_names} ON {_table}
+        BEGIN
+            INSERT INTO {_index} ({_index}, rowid, {_names})
+            VALUES ('delete', old.id, {_old});
+            INSERT INTO {_index} (rowid, {_names}) VALUES (new.id, {_new});
+        END
+        """,
+        f"INSERT INTO {_index} ({_index}) VALUES ('rebuild')",
+    ]
+    DROP_SEARCH_SQL += [
+        f"DROP TRIGGER IF EXISTS {_index}_update",
+        f"DROP TRIGGER IF EXISTS {_index}_delete",
+        f"DROP TRIGGER IF EXISTS {_index}_insert",
+        f"DROP TABLE IF EXISTS {_index}",
+    ]
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('products', '0001_initial'),
+        ('company_partners', '0001_initial'),
+        ('company_warehouse', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunSQL(SEARCH_SQL, DROP_SEARCH_SQL),
+    ]
@@ -0,0 +1,66 @@
+import re
+from typing import NamedTuple
+
+from config.db_routing import read_connection
+
+
+MAX_TERMS = 8
+# Префиксы короче двух символов не индексированы (prefix='2 3' в миграции)
+# и совпадают с большей частью таблицы, поэтому такие слова ищутся целиком.
+MIN_PREFIX_LENGTH = 2
+_TERM = re.compile(r"\w+")
+
+
+class SearchSource(NamedTuple):
+    index: str  # таблица FTS5 (миграция search.0001_initial)
+    table: str
+    fields: tuple[str, ...]  # поля в ответе, кроме id
+    weights: tuple[float, ...]  # веса индексируемых колонок для bm25
+
+
+SEARCH_SOURCES = {
+    "products": SearchSource("product_fts", "product", ("name", "article"), (10.0, 5.0)),
+    "materials": SearchSource("material_fts", "material", ("name",), (10.0, 1.0)),
+    "partners": SearchSource("partner_fts", "partner", ("company_name", "inn"), (10.0, 5.0)),
+    "suppliers": SearchSource("supplier_fts", "supplier", ("name", "inn"), (10.0, 5.0)),
+}
+
+
+def build_match(query: str) -> str | None:
+    """
+    Строка для MATCH: каждое слово запроса ищется как префикс, все слова
+    должны встретиться ("шкаф бел" найдет "Шкаф белый").
+    """
+
+    terms = _TERM.findall(query)[:MAX_TERMS]
+    if not terms:
+        return None
+    return " ".join(
+        f'"{term}"*' if len(term) >= MIN_PREFIX_LENGTH else f'"{term}"' for term in terms
+    )
+
+
+def search_source(source: SearchSource, match: str, limit: int) -> list[dict]:
+    columns = ", ".join(f"t.{field}" for field in ("id",) + source.fields)
+    weights = ", ".join(str(weight) for weight in source.weights)
+    # Сначала лучшие rowid из индекса, и только они соединяются с таблицей.
+    sql = (
+        f"SELECT {columns} FROM ("
+        f"SELECT rowid, bm25({source.index}, {weights}) AS score FROM {source.index} "
+        f"WHERE {source.index} MATCH %s ORDER BY score LIMIT %s"
+        f") f JOIN {source.table} t ON t.id = f.rowid ORDER BY f.score"
+    )
+    with read_connection().cursor() as cursor:
+        cursor.execute(sql, [match, limit])
+        names = ("id",) + source.fields
+        return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+def search(query: str, kinds, limit: int) -> dict[str, list[dict]]:
+    """Лучшие по bm25 совпадения в каждом источнике (результаты по типам)."""
+
+    match = build_match(query)
+    results = {}
+    for kind in kinds:
+        results[kind] = search_source(SEARCH_SOURCES[kind], match, limit) if match else []
+    return results
@@ -0,0 +1,32 @@
+from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from .queries import SEARCH_SOURCES, search
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+@api_view(["GET"])
+def search_view(request):
+    query = request.query_params.get("q", "").strip()
+    if not query:
+        raise ValidationError({"q": "Введите строку поиска."})
+
+    kinds = request.query_params.get("types")
+    kinds = [kind.strip() for kind in kinds.split(",")] if kinds else list(SEARCH_SOURCES)
+    unknown = [kind for kind in kinds if kind not in SEARCH_SOURCES]
+    if unknown:
+        raise ValidationError(
+            {"types": f"Неизвестные типы: {', '.join(unknown)}. "
+             f"Доступны: {', '.join(SEARCH_SOURCES)}."}
+        )
+
+    try:
+        limit = int(request.query_params.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        raise ValidationError({"limit": "Ожидается целое число."})
+    limit = min(max(limit, 1), MAX_LIMIT)
+
+    return Response(search(query, kinds, limit))
@@ -1,6 +1,12 @@
+import argparse
+import hashlib
 import os
 import sqlite3
+import time
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 
 import pandas as pd
 
@@ -26,6 +32,132 @@ FILE_MATERIAL_TYPES = DATA_DIR / "Material_type_import.xlsx"
 FILE_WORKSHOPS = DATA_DIR / "Workshops_import.xlsx"
 FILE_PRODUCT_WORKSHOPS = DATA_DIR / "Product_workshops_import.xlsx"
 
+# Размер пачки для executemany.
+CHUNK_SIZE = 10_000
+
+# Настройки соединения на время импорта: данные пишутся одной транзакцией,
+# промежуточные fsync и временные файлы на диске не нужны.
+IMPORT_PRAGMAS = (
+    "PRAGMA synchronous = OFF",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA cache_size = -65536",
+)
+
+# Вторичные индексы создаются после загрузки данных, чтобы не перестраивать
+# их на каждой вставке. Те же индексы создает миграция
+# products.0005_filter_indexes (фильтры /api/products и удаление цеха).
+INDEX_STATEMENTS: tuple[str, ...] = (
+    "CREATE INDEX IF NOT EXISTS product_type_name_idx ON product (product_type_id, name)",
+    "CREATE INDEX IF NOT EXISTS product_material_type_name_idx ON product (material_type_id, name)",
+    "CREATE INDEX IF NOT EXISTS product_min_partner_price_idx ON product (min_partner_price)",
+    "CREATE INDEX IF NOT EXISTS product_workshop_workshop_idx ON product_workshop (workshop_id)",
+)
+
+
+# Итоги пересчитываются upsert'ом, а не INSERT OR REPLACE: внутри триггера
+# действует политика конфликтов внешней команды, и под INSERT ... ON CONFLICT
+# DO UPDATE инкрементального импорта REPLACE превращается в ABORT.
+SUMMARY_UPSERT = """
+        INSERT INTO product_summary (product_id, total_hours, workshop_count)
+        SELECT {row}.product_id, COALESCE(SUM(manufacture_hours), 0), COUNT(*)
+        FROM product_workshop WHERE product_id = {row}.product_id
+        ON CONFLICT (product_id) DO UPDATE SET
+            total_hours = excluded.total_hours,
+            workshop_count = excluded.workshop_count;
+"""
+
+PRODUCT_SUMMARY_TRIGGERS = (
+    "product_summary_product_insert",
+    "product_summary_product_delete",
+    "product_summary_link_insert",
+    "product_summary_link_update",
+    "product_summary_link_delete",
+)
+
+# Триггеры пересоздаются при каждом запуске, чтобы база, созданная старой
+# версией скрипта, получила исправленные тела.
+PRODUCT_SUMMARY_STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS product_summary (
+        product_id      INTEGER PRIMARY KEY,
+        total_hours     REAL NOT NULL DEFAULT 0,
+        workshop_count  INTEGER NOT NULL DEFAULT 0
+    );
+    """,
+    *(f"DROP TRIGGER IF EXISTS {name};" for name in PRODUCT_SUMMARY_TRIGGERS),
+    """
+    CREATE TRIGGER product_summary_product_insert
+    AFTER INSERT ON product
+    BEGIN
+        INSERT INTO product_summary (product_id) VALUES (new.id)
+        ON CONFLICT (product_id) DO NOTHING;
+    END;
+    """,
+    """
+    CREATE TRIGGER product_summary_product_delete
+    AFTER DELETE ON product
+    BEGIN
+        DELETE FROM product_summary WHERE product_id = old.id;
+    END;
+    """,
+    f"""
+    CREATE TRIGGER product_summary_link_insert
+    AFTER INSERT ON product_workshop
+    BEGIN{SUMMARY_UPSERT.format(row="new")}    END;
+    """,
+    f"""
+    CREATE TRIGGER product_summary_link_update
+    AFTER UPDATE OF product_id, manufacture_hours ON product_workshop
+    BEGIN{SUMMARY_UPSERT.format(row="old")}{SUMMARY_UPSERT.format(row="new")}    END;
+    """,
+    f"""
+    CREATE TRIGGER product_summary_link_delete
+    AFTER DELETE ON product_workshop
+    BEGIN{SUMMARY_UPSERT.format(row="old")}    END;
+    """,
+)
+
+# Таблицы, для которых триггеры ведут счетчик версий в table_version:
+# по нему процессы приложения узнают, что данные изменились (кэш
+# справочников, ETag списков).
+VERSIONED_TABLES = (
+    "product_type",
+    "material_type",
+    "workshop",
+    "product",
+    "product_workshop",
+)
+
+
+def table_version_statements() -> list[str]:
+    statements = [
+        """
+        CREATE TABLE IF NOT EXISTS table_version (
+            table_name      TEXT PRIMARY KEY,
+            version         INTEGER NOT NULL DEFAULT 0,
+            updated_at      INTEGER NOT NULL DEFAULT (CAST(strftime('%s', 'now') AS INTEGER))
+        ) WITHOUT ROWID;
+        """
+    ]
+    for table in VERSIONED_TABLES:
+        statements.append(
+            f"INSERT OR IGNORE INTO table_version (table_name) VALUES ('{table}');"
+        )
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            statements.append(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS table_version_{table}_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE table_version
+                    SET version = version + 1,
+                        updated_at = CAST(strftime('%s', 'now') AS INTEGER)
+                    WHERE table_name = '{table}';
+                END;
+                """
+            )
+    return statements
+
 
 def create_tables(conn: sqlite3.Connection) -> None:
     conn.execute("PRAGMA foreign_keys = ON")
@@ -96,65 +228,200 @@ def create_tables(conn: sqlite3.Connection) -> None:
         """
     )
 
-    conn.commit()
+    # Итоги по продукции (сумма часов и число цехов), их ведут триггеры
+    for statement in PRODUCT_SUMMARY_STATEMENTS:
+        cur.execute(statement)
 
+    # Версии таблиц для кэшей приложения, их ведут триггеры
+    for statement in table_version_statements():
+        cur.execute(statement)
 
-def load_product_types(conn: sqlite3.Connection) -> None:
-    df = pd.read_excel(FILE_PRODUCT_TYPES)
-    df.columns = [c.strip() for c in df.columns]
+    # Состояние инкрементального импорта: хэши файлов и строк
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS import_file_state (
+            file_name       TEXT PRIMARY KEY,
+            content_hash    TEXT NOT NULL,
+            imported_at     TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+        );
+        """
+    )
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS import_row_state (
+            table_name      TEXT NOT NULL,
+            row_key         TEXT NOT NULL,
+            row_hash        TEXT NOT NULL,
+            PRIMARY KEY (table_name, row_key)
+        ) WITHOUT ROWID;
+        """
+    )
 
-    cur = conn.cursor()
-    for _, row in df.iterrows():
-        name = str(row["Тип продукции"]).strip()
-        coef = float(row["Коэффициент типа продукции"])
-        cur.execute(
-            """
-            INSERT OR IGNORE INTO product_type (name, coefficient)
-            VALUES (?, ?)
-            """,
-            (name, coef),
-        )
     conn.commit()
 
 
-def load_material_types(conn: sqlite3.Connection) -> None:
-    df = pd.read_excel(FILE_MATERIAL_TYPES)
-    df.columns = [c.strip() for c in df.columns]
+def rebuild_product_summary(conn: sqlite3.Connection) -> None:
+    # Пересчет с нуля: база могла быть создана до появления product_summary.
+    conn.execute("DELETE FROM product_summary")
+    conn.execute(
+        """
+        INSERT INTO product_summary (product_id, total_hours, workshop_count)
+        SELECT p.id, COALESCE(SUM(pw.manufacture_hours), 0), COUNT(pw.product_id)
+        FROM product p LEFT JOIN product_workshop pw ON pw.product_id = p.id
+        GROUP BY p.id
+        """
+    )
+
 
+def create_indexes(conn: sqlite3.Connection) -> None:
     cur = conn.cursor()
-    for _, row in df.iterrows():
-        name = str(row["Тип материала"]).strip()
-        loss = float(row["Процент потерь сырья"])
-        cur.execute(
-            """
-            INSERT OR IGNORE INTO material_type (name, loss_percent)
-            VALUES (?, ?)
-            """,
-            (name, loss),
-        )
-    conn.commit()
+    for statement in INDEX_STATEMENTS:
+        cur.execute(statement)
+    cur.execute("PRAGMA optimize")
 
 
-def load_workshops(conn: sqlite3.Connection) -> None:
-    df = pd.read_excel(FILE_WORKSHOPS)
+def read_sheet(path: Path) -> pd.DataFrame:
+    df = pd.read_excel(path)
     # убираем лишние пробелы в названиях колонок
     df.columns = [c.strip() for c in df.columns]
+    return df
+
+
+def text_column(series: pd.Series) -> list[str]:
+    return series.astype(str).str.strip().tolist()
+
+
+def optional_text_column(series: pd.Series) -> list[str | None]:
+    values = series.astype(str).str.strip().tolist()
+    return [None if missing else value for value, missing in zip(values, series.isna())]
+
+
+def float_column(series: pd.Series) -> list[float]:
+    return series.astype(float).tolist()
 
+
+def optional_float_column(series: pd.Series) -> list[float | None]:
+    values = series.astype(float).tolist()
+    return [None if missing else value for value, missing in zip(values, series.isna())]
+
+
+def optional_int_column(series: pd.Series) -> list[int | None]:
+    return [None if pd.isna(value) else int(value) for value in series.tolist()]
+
+
+def execute_chunked(
+    conn: sqlite3.Connection, sql: str, rows: Sequence[tuple]
+) -> None:
     cur = conn.cursor()
-    for _, row in df.iterrows():
-        name = str(row["Название цеха"]).strip()
-        wtype = str(row["Тип цеха"]).strip() if not pd.isna(row["Тип цеха"]) else None
-        workers_raw = row["Количество человек для производства"]
-        workers = int(workers_raw) if not pd.isna(workers_raw) else None
+    for start in range(0, len(rows), CHUNK_SIZE):
+        cur.executemany(sql, rows[start : start + CHUNK_SIZE])
 
-        cur.execute(
-            """
-            INSERT OR IGNORE INTO workshop (name, workshop_type, workers_count)
-            VALUES (?, ?, ?)
-            """,
-            (name, wtype, workers),
+
+def read_product_types(path: Path = FILE_PRODUCT_TYPES) -> list[tuple]:
+    df = read_sheet(path)
+    return list(
+        zip(
+            text_column(df["Тип продукции"]),
+            float_column(df["Коэффициент типа продукции"]),
         )
-    conn.commit()
+    )
+
+
+def read_material_types(path: Path = FILE_MATERIAL_TYPES) -> list[tuple]:
+    df = read_sheet(path)
+    return list(
+        zip(
+            text_column(df["Тип материала"]),
+            float_column(df["Процент потерь сырья"]),
+        )
+    )
+
+
+def read_workshops(path: Path = FILE_WORKSHOPS) -> list[tuple]:
+    df = read_sheet(path)
+    return list(
+        zip(
+            text_column(df["Название цеха"]),
+            optional_text_column(df["Тип цеха"]),
+            optional_int_column(df["Количество человек для производства"]),
+        )
+    )
+
+
+def read_products(path: Path = FILE_PRODUCTS) -> list[tuple]:
+    """Строки (наименование, артикул, цена, тип продукции, материал) по именам."""
+
+    df = read_sheet(path)
+    return list(
+        zip(
+            text_column(df["Наименование продукции"]),
+            text_column(df["Артикул"]),
+            float_column(df["Минимальная стоимость для партнера"]),
+            text_column(df["Тип продукции"]),
+            text_column(df["Основной материал"]),
+        )
+    )
+
+
+def read_product_workshops(path: Path = FILE_PRODUCT_WORKSHOPS) -> list[tuple]:
+    """Строки (продукция, цех, время изготовления) по именам."""
+
+    df = read_sheet(path)
+    return list(
+        zip(
+            text_column(df["Наименование продукции"]),
+            text_column(df["Название цеха"]),
+            optional_float_column(df["Время изготовления, ч"]),
+        )
+    )
+
+
+def load_product_types(
+    conn: sqlite3.Connection, rows: Sequence[tuple] | None = None
+) -> int:
+    if rows is None:
+        rows = read_product_types()
+    execute_chunked(
+        conn,
+        """
+        INSERT OR IGNORE INTO product_type (name, coefficient)
+        VALUES (?, ?)
+        """,
+        rows,
+    )
+    return len(rows)
+
+
+def load_material_types(
+    conn: sqlite3.Connection, rows: Sequence[tuple] | None = None
+) -> int:
+    if rows is None:
+        rows = read_material_types()
+    execute_chunked(
+        conn,
+        """
+        INSERT OR IGNORE INTO material_type (name, loss_percent)
+        VALUES (?, ?)
+        """,
+        rows,
+    )
+    return len(rows)
+
+
+def load_workshops(
+    conn: sqlite3.Connection, rows: Sequence[tuple] | None = None
+) -> int:
+    if rows is None:
+        rows = read_workshops()
+    execute_chunked(
+        conn,
+        """
+        INSERT OR IGNORE INTO workshop (name, workshop_type, workers_count)
+        VALUES (?, ?, ?)
+        """,
+        rows,
+    )
+    return len(rows)
 
 
 def build_lookup(conn: sqlite3.Connection, table: str, name_column: str = "name") -> dict:
@@ -163,19 +430,17 @@ def build_lookup(conn: sqlite3.Connection, table: str, name_column: str = "name"
     return {row[1]: row[0] for row in cur.fetchall()}
 
 
-def load_products(conn: sqlite3.Connection) -> None:
-    df = pd.read_excel(FILE_PRODUCTS)
-    df.columns = [c.strip() for c in df.columns]
+def resolve_products(
+    conn: sqlite3.Connection, rows: Iterable[tuple]
+) -> list[tuple]:
+    """Заменить имена типа продукции и материала на id из справочников."""
 
     # словари "значение -> id" из справочников
     product_type_map = build_lookup(conn, "product_type")
     material_type_map = build_lookup(conn, "material_type")
 
-    cur = conn.cursor()
-    for _, row in df.iterrows():
-        p_type_name = str(row["Тип продукции"]).strip()
-        material_name = str(row["Основной материал"]).strip()
-
+    resolved = []
+    for name, article, min_price, p_type_name, material_name in rows:
         product_type_id = product_type_map.get(p_type_name)
         material_type_id = material_type_map.get(material_name)
 
@@ -184,35 +449,20 @@ def load_products(conn: sqlite3.Connection) -> None:
         if material_type_id is None:
             raise ValueError(f"Не найден тип материала: {material_name}")
 
-        name = str(row["Наименование продукции"]).strip()
-        article = str(row["Артикул"]).strip()
-        min_price = float(row["Минимальная стоимость для партнера"])
+        resolved.append((name, article, min_price, product_type_id, material_type_id))
+    return resolved
 
-        cur.execute(
-            """
-            INSERT OR IGNORE INTO product
-                (name, article, min_partner_price, product_type_id, material_type_id)
-            VALUES (?, ?, ?, ?, ?)
-            """,
-            (name, article, min_price, product_type_id, material_type_id),
-        )
-    conn.commit()
 
-
-def load_product_workshops(conn: sqlite3.Connection) -> None:
-    df = pd.read_excel(FILE_PRODUCT_WORKSHOPS)
-    df.columns = [c.strip() for c in df.columns]
+def resolve_product_workshops(
+    conn: sqlite3.Connection, rows: Iterable[tuple]
+) -> list[tuple]:
+    """Заменить наименования продукции и цехов на id."""
 
     product_map = build_lookup(conn, "product")
     workshop_map = build_lookup(conn, "workshop")
 
-    cur = conn.cursor()
-    for _, row in df.iterrows():
-        product_name = str(row["Наименование продукции"]).strip()
-        workshop_name = str(row["Название цеха"]).strip()
-        hours_raw = row["Время изготовления, ч"]
-        hours = float(hours_raw) if not pd.isna(hours_raw) else None
-
+    resolved = []
+    for product_name, workshop_name, hours in rows:
         product_id = product_map.get(product_name)
         workshop_id = workshop_map.get(workshop_name)
 
@@ -221,27 +471,452 @@ def load_product_workshops(conn: sqlite3.Connection) -> None:
         if workshop_id is None:
             raise ValueError(f"Не найден цех: {workshop_name}")
 
-        cur.execute(
+        resolved.append((product_id, workshop_id, hours))
+    return resolved
+
+
+def load_products(
+    conn: sqlite3.Connection, rows: Sequence[tuple] | None = None
+) -> int:
+    if rows is None:
+        rows = read_products()
+    execute_chunked(
+        conn,
+        """
+        INSERT OR IGNORE INTO product
+            (name, article, min_partner_price, product_type_id, material_type_id)
+        VALUES (?, ?, ?, ?, ?)
+        """,
+        resolve_products(conn, rows),
+    )
+    return len(rows)
+
+
+def load_product_workshops(
+    conn: sqlite3.Connection, rows: Sequence[tuple] | None = None
+) -> int:
+    if rows is None:
+        rows = read_product_workshops()
+    execute_chunked(
+        conn,
+        """
+        INSERT OR REPLACE INTO product_workshop
+            (product_id, workshop_id, manufacture_hours)
+        VALUES (?, ?, ?)
+        """,
+        resolve_product_workshops(conn, rows),
+    )
+    return len(rows)
+
+
+class ImportStage(NamedTuple):
+    table: str
+    path: Path
+    read: Callable[[Path], list[tuple]]
+    # Полный импорт: запись строк из read(); возвращает количество строк.
+    load: Callable[[sqlite3.Connection, Sequence[tuple]], int]
+    # Перевод имен в id; хэшируются уже разрешенные строки, поэтому смена
+    # ссылки (например, переименование типа) тоже считается изменением.
+    resolve: Callable[[sqlite3.Connection, Iterable[tuple]], list[tuple]] | None
+    key: Callable[[tuple], str]
+    # Для дубликатов ключа: True — первая строка (как INSERT OR IGNORE),
+    # False — последняя (как INSERT OR REPLACE).
+    keep_first: bool
+    upsert_sql: str
+    # Выполняются по порядку с параметрами delete_params(ключ).
+    delete_sql: tuple[str, ...]
+    delete_params: Callable[[str], tuple]
+    # Таблицы, в id которых resolve переводит имена: если их файл изменился,
+    # строки этого этапа сверяются заново, даже когда его файл тот же.
+    depends_on: tuple[str, ...] = ()
+
+
+def _by_name(row: tuple) -> str:
+    return row[0]
+
+
+def _name_param(key: str) -> tuple:
+    return (key,)
+
+
+def _product_workshop_key(row: tuple) -> str:
+    return f"{row[0]}:{row[1]}"
+
+
+def _product_workshop_params(key: str) -> tuple:
+    product_id, workshop_id = key.split(":")
+    return (int(product_id), int(workshop_id))
+
+
+IMPORT_STAGES = (
+    ImportStage(
+        table="product_type",
+        path=FILE_PRODUCT_TYPES,
+        read=read_product_types,
+        load=load_product_types,
+        resolve=None,
+        key=_by_name,
+        keep_first=True,
+        upsert_sql="""
+            INSERT INTO product_type (name, coefficient) VALUES (?, ?)
+            ON CONFLICT (name) DO UPDATE SET coefficient = excluded.coefficient
+        """,
+        delete_sql=("DELETE FROM product_type WHERE name = ?",),
+        delete_params=_name_param,
+    ),
+    ImportStage(
+        table="material_type",
+        path=FILE_MATERIAL_TYPES,
+        read=read_material_types,
+        load=load_material_types,
+        resolve=None,
+        key=_by_name,
+        keep_first=True,
+        upsert_sql="""
+            INSERT INTO material_type (name, loss_percent) VALUES (?, ?)
+            ON CONFLICT (name) DO UPDATE SET loss_percent = excluded.loss_percent
+        """,
+        delete_sql=("DELETE FROM material_type WHERE name = ?",),
+        delete_params=_name_param,
+    ),
+    ImportStage(
+        table="workshop",
+        path=FILE_WORKSHOPS,
+        read=read_workshops,
+        load=load_workshops,
+        resolve=None,
+        key=_by_name,
+        keep_first=True,
+        upsert_sql="""
+            INSERT INTO workshop (name, workshop_type, workers_count) VALUES (?, ?, ?)
+            ON CONFLICT (name) DO UPDATE SET
+                workshop_type = excluded.workshop_type,
+                workers_count = excluded.workers_count
+        """,
+        # вместе с цехом удаляются его строки product_workshop
+        delete_sql=(
             """
-            INSERT OR REPLACE INTO product_workshop
-                (product_id, workshop_id, manufacture_hours)
-            VALUES (?, ?, ?)
+            DELETE FROM import_row_state
+            WHERE table_name = 'product_workshop' AND row_key IN (
+                SELECT product_id || ':' || workshop_id FROM product_workshop
+                WHERE workshop_id IN (SELECT id FROM workshop WHERE name = ?)
+            )
+            """,
+            """
+            DELETE FROM product_workshop
+            WHERE workshop_id IN (SELECT id FROM workshop WHERE name = ?)
+            """,
+            "DELETE FROM workshop WHERE name = ?",
+        ),
+        delete_params=_name_param,
+    ),
+    ImportStage(
+        table="product",
+        path=FILE_PRODUCTS,
+        read=read_products,
+        load=load_products,
+        resolve=resolve_products,
+        key=_by_name,
+        keep_first=True,
+        upsert_sql="""
+            INSERT INTO product
+                (name, article, min_partner_price, product_type_id, material_type_id)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (name) DO UPDATE SET
+                article = excluded.article,
+                min_partner_price = excluded.min_partner_price,
+                product_type_id = excluded.product_type_id,
+                material_type_id = excluded.material_type_id
+        """,
+        # вместе с продукцией удаляются ее строки product_workshop
+        delete_sql=(
+            """
+            DELETE FROM import_row_state
+            WHERE table_name = 'product_workshop' AND row_key IN (
+                SELECT product_id || ':' || workshop_id FROM product_workshop
+                WHERE product_id IN (SELECT id FROM product WHERE name = ?)
+            )
+            """,
+            """
+            DELETE FROM product_workshop
+            WHERE product_id IN (SELECT id FROM product WHERE name = ?)
             """,
-            (product_id, workshop_id, hours),
+            "DELETE FROM product WHERE name = ?",
+        ),
+        delete_params=_name_param,
+        depends_on=("product_type", "material_type"),
+    ),
+    ImportStage(
+        table="product_workshop",
+        path=FILE_PRODUCT_WORKSHOPS,
+        read=read_product_workshops,
+        load=load_product_workshops,
+        resolve=resolve_product_workshops,
+        key=_product_workshop_key,
+        keep_first=False,
+        upsert_sql="""
+            INSERT INTO product_workshop (product_id, workshop_id, manufacture_hours)
+            VALUES (?, ?, ?)
+            ON CONFLICT (product_id, workshop_id) DO UPDATE SET
+                manufacture_hours = excluded.manufacture_hours
+        """,
+        delete_sql=(
+            "DELETE FROM product_workshop WHERE product_id = ? AND workshop_id = ?",
+        ),
+        delete_params=_product_workshop_params,
+        depends_on=("product", "workshop"),
+    ),
+)
+
+
+def file_hash(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def row_hash(row: tuple) -> str:
+    return hashlib.blake2b(repr(row).encode("utf-8"), digest_size=16).hexdigest()
+
+
+def diff_stage(
+    conn: sqlite3.Connection, stage: ImportStage, rows: Iterable[tuple]
+) -> tuple[list[tuple], list[str], dict[str, str], int]:
+    """
+    Сравнить строки файла с сохраненными хэшами.
+
+    Возврат: (строки для upsert, ключи для удаления, новые хэши по ключу,
+    количество новых строк среди upsert).
+    """
+
+    current: dict[str, tuple] = {}
+    for row in rows:
+        key = stage.key(row)
+        if stage.keep_first:
+            current.setdefault(key, row)
+        else:
+            current[key] = row
+
+    stored = dict(
+        conn.execute(
+            "SELECT row_key, row_hash FROM import_row_state WHERE table_name = ?",
+            (stage.table,),
+        ).fetchall()
+    )
+
+    upserts: list[tuple] = []
+    hashes: dict[str, str] = {}
+    inserted = 0
+    for key, row in current.items():
+        digest = row_hash(row)
+        previous = stored.pop(key, None)
+        if previous == digest:
+            continue
+        if previous is None:
+            inserted += 1
+        upserts.append(row)
+        hashes[key] = digest
+    return upserts, list(stored), hashes, inserted
+
+
+def apply_upserts(
+    conn: sqlite3.Connection,
+    stage: ImportStage,
+    upserts: Sequence[tuple],
+    hashes: dict[str, str],
+) -> None:
+    execute_chunked(conn, stage.upsert_sql, upserts)
+    execute_chunked(
+        conn,
+        """
+        INSERT INTO import_row_state (table_name, row_key, row_hash) VALUES (?, ?, ?)
+        ON CONFLICT (table_name, row_key) DO UPDATE SET row_hash = excluded.row_hash
+        """,
+        [(stage.table, key, digest) for key, digest in hashes.items()],
+    )
+
+
+def apply_deletes(
+    conn: sqlite3.Connection, stage: ImportStage, keys: Sequence[str]
+) -> None:
+    cur = conn.cursor()
+    for key in keys:
+        params = stage.delete_params(key)
+        try:
+            for statement in stage.delete_sql:
+                cur.execute(statement, params)
+        except sqlite3.IntegrityError as exc:
+            raise ValueError(
+                f"Нельзя удалить запись {stage.table} «{key}»: она еще используется."
+            ) from exc
+    execute_chunked(
+        conn,
+        "DELETE FROM import_row_state WHERE table_name = ? AND row_key = ?",
+        [(stage.table, key) for key in keys],
+    )
+
+
+def read_timed(
+    read: Callable[[Path], list[tuple]], path: Path
+) -> tuple[list[tuple], float]:
+    started = time.perf_counter()
+    rows = read(path)
+    return rows, time.perf_counter() - started
+
+
+def start_parsing(
+    stages: Sequence[ImportStage], executor: ProcessPoolExecutor | None
+) -> dict[str, Future]:
+    """
+    Запустить разбор файлов стадий.
+
+    С пулом процессов все книги разбираются параллельно, а запись в базу
+    начинается, как только готов файл очередной стадии. Без пула файлы
+    разбираются последовательно в текущем процессе.
+    """
+
+    futures: dict[str, Future] = {}
+    for stage in stages:
+        if executor is not None:
+            futures[stage.table] = executor.submit(read_timed, stage.read, stage.path)
+        else:
+            future: Future = Future()
+            future.set_result(read_timed(stage.read, stage.path))
+            futures[stage.table] = future
+    return futures
+
+
+def run_full(
+    conn: sqlite3.Connection, executor: ProcessPoolExecutor | None
+) -> None:
+    futures = start_parsing(IMPORT_STAGES, executor)
+    for stage in IMPORT_STAGES:
+        rows, parse_seconds = futures[stage.table].result()
+        started = time.perf_counter()
+        stage.load(conn, rows)
+        report_stage(stage.table, len(rows), parse_seconds, time.perf_counter() - started)
+    rebuild_product_summary(conn)
+    reset_incremental_state(conn)
+
+
+def run_incremental(
+    conn: sqlite3.Connection, executor: ProcessPoolExecutor | None
+) -> None:
+    """
+    Инкрементальный импорт: неизменившиеся файлы пропускаются по хэшу,
+    из измененных применяются только новые, измененные и удаленные строки.
+
+    Вставки и обновления идут в порядке зависимостей (справочники, продукция,
+    product_workshop), удаления — в обратном, чтобы не нарушать внешние ключи.
+    """
+
+    stored_files = dict(
+        conn.execute("SELECT file_name, content_hash FROM import_file_state").fetchall()
+    )
+    changed: list[tuple[ImportStage, str]] = []
+    changed_tables: set[str] = set()
+    for stage in IMPORT_STAGES:
+        content_hash = file_hash(stage.path)
+        # Этапы идут в порядке зависимостей, поэтому изменения справочников
+        # доходят транзитивно: тип продукции -> продукция -> product_workshop.
+        upstream = changed_tables.intersection(stage.depends_on)
+        if stored_files.get(stage.path.name) == content_hash:
+            if not upstream:
+                print(f"{stage.table}: файл не изменился, пропуск")
+                continue
+            print(f"{stage.table}: изменились {', '.join(sorted(upstream))}, сверка строк")
+        changed.append((stage, content_hash))
+        changed_tables.add(stage.table)
+
+    futures = start_parsing([stage for stage, _ in changed], executor)
+    pending_deletes: list[tuple[ImportStage, list[str]]] = []
+    for stage, _ in changed:
+        rows, parse_seconds = futures[stage.table].result()
+        started = time.perf_counter()
+        if stage.resolve is not None:
+            rows = stage.resolve(conn, rows)
+        upserts, deletes, hashes, inserted = diff_stage(conn, stage, rows)
+        apply_upserts(conn, stage, upserts, hashes)
+        pending_deletes.append((stage, deletes))
+        write_seconds = time.perf_counter() - started
+        print(
+            f"{stage.table}: +{inserted} ~{len(upserts) - inserted} -{len(deletes)} "
+            f"из {len(rows)} строк, разбор {parse_seconds:.2f} с, "
+            f"запись {write_seconds:.2f} с"
         )
-    conn.commit()
+
+    for stage, deletes in reversed(pending_deletes):
+        apply_deletes(conn, stage, deletes)
+
+    execute_chunked(
+        conn,
+        """
+        INSERT INTO import_file_state (file_name, content_hash, imported_at)
+        VALUES (?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT (file_name) DO UPDATE SET
+            content_hash = excluded.content_hash,
+            imported_at = excluded.imported_at
+        """,
+        [(stage.path.name, content_hash) for stage, content_hash in changed],
+    )
+
+
+def reset_incremental_state(conn: sqlite3.Connection) -> None:
+    # Полный импорт не обновляет существующие строки (INSERT OR IGNORE),
+    # поэтому после него следующий инкрементальный запуск сверяет все строки.
+    conn.execute("DELETE FROM import_file_state")
+    conn.execute("DELETE FROM import_row_state")
+
+
+def report_stage(
+    stage: str, rows: int, parse_seconds: float, write_seconds: float
+) -> None:
+    parse_rate = rows / parse_seconds if parse_seconds > 0 else float("inf")
+    write_rate = rows / write_seconds if write_seconds > 0 else float("inf")
+    print(
+        f"{stage}: {rows} строк, разбор {parse_seconds:.2f} с ({parse_rate:,.0f} строк/с), "
+        f"запись {write_seconds:.2f} с ({write_rate:,.0f} строк/с)"
+    )
+
+
+def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Импорт *_import.xlsx в furniture.db")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="применить только изменения с прошлого инкрементального импорта",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=min(len(IMPORT_STAGES), os.cpu_count() or 1),
+        help="число процессов для разбора xlsx (1 — без параллельного разбора)",
+    )
+    return parser.parse_args(argv)
 
 
-def main():
+def main(argv: Sequence[str] | None = None):
+    args = parse_args(argv)
     conn = sqlite3.connect(str(DB_PATH))
+    executor = ProcessPoolExecutor(max_workers=args.workers) if args.workers > 1 else None
     try:
         try:
             create_tables(conn)
-            load_product_types(conn)
-            load_material_types(conn)
-            load_workshops(conn)
-            load_products(conn)
-            load_product_workshops(conn)
+            for statement in IMPORT_PRAGMAS:
+                conn.execute(statement)
+            # Все таблицы загружаются одной транзакцией: при ошибке база
+            # остается в исходном состоянии.
+            with conn:
+                if args.incremental:
+                    run_incremental(conn, executor)
+                else:
+                    run_full(conn, executor)
+            started = time.perf_counter()
+            create_indexes(conn)
+            conn.commit()
+            print(f"Индексы: {time.perf_counter() - started:.2f} с")
         except FileNotFoundError as exc:
             raise SystemExit(
                 f"Не найден файл импорта: {exc.filename}. "
@@ -253,6 +928,8 @@ def main():
                 "Установите зависимости командой: pip install -r backend/requirements.txt"
             ) from exc
     finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
         conn.close()
 
 